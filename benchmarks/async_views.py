@@ -0,0 +1,108 @@
+"""
+Compare the sync and async city search views against a slow fake upstream.
+
+Starts a local geocoding API stand-in that answers every request after
+--latency milliseconds, points GeocodingService at it (with the gazetteer
+disabled) and fires --requests city searches at each view:
+
+  * sync:  one request at a time, as a single WSGI worker thread serves them
+  * async: all requests at once on one event loop, as a single ASGI worker
+
+Usage:
+    python benchmarks/async_views.py [--requests 50] [--latency 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'travelmate.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import AsyncRequestFactory, RequestFactory  # noqa: E402
+
+from trips import async_views, views  # noqa: E402
+from trips.services import geocoding_service  # noqa: E402
+from trips.services.geocoding_service import GeocodingService  # noqa: E402
+
+
+class FakeUpstream(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # The default backlog of 5 would throttle the async run
+
+
+def make_handler(latency):
+    class SlowGeocoder(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            name = parse_qs(urlsplit(self.path).query).get('name', [''])[0]
+            body = json.dumps({'results': [{
+                'name': name, 'country': 'Nowhere', 'admin1': '', 'latitude': 1.0, 'longitude': 2.0,
+            }]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return SlowGeocoder
+
+
+def run_sync(queries):
+    factory = RequestFactory()
+    started = time.perf_counter()
+    for query in queries:
+        response = views.search_cities(factory.get('/api/cities/search/', {'q': query}))
+        assert response.status_code == 200, response.status_code
+    return time.perf_counter() - started
+
+
+async def run_async(queries):
+    factory = AsyncRequestFactory()
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(
+        async_views.search_cities(factory.get('/api/cities/search/', {'q': query}))
+        for query in queries
+    ))
+    assert all(response.status_code == 200 for response in responses)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--latency', type=int, default=200, help='Upstream latency in milliseconds')
+    args = parser.parse_args()
+
+    server = FakeUpstream(('127.0.0.1', 0), make_handler(args.latency / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    GeocodingService.BASE_URL = f"http://127.0.0.1:{server.server_port}/v1/search"
+    geocoding_service.get_gazetteer = lambda: None
+
+    # Distinct queries so that nothing is coalesced or cached
+    sync_elapsed = run_sync([f"sync city {i}" for i in range(args.requests)])
+    async_elapsed = asyncio.run(run_async([f"async city {i}" for i in range(args.requests)]))
+    server.shutdown()
+
+    ideal = args.requests * args.latency / 1000
+    print(f"{args.requests} searches, {args.latency} ms upstream latency")
+    for label, elapsed in (('sync', sync_elapsed), ('async', async_elapsed)):
+        print(f"  {label:<5} {elapsed:7.2f} s  {args.requests / elapsed:7.1f} req/s  "
+              f"effective concurrency {ideal / elapsed:5.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Micro-benchmark of WeatherService.get_clothing_recommendations over a
+365-day forecast, against the previous per-day branching implementation.
+
+Usage:
+    python benchmarks/clothing_recommendations.py [--days 365] [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'travelmate.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from trips.services.forecast import Forecast  # noqa: E402
+from trips.services.weather_service import WeatherService  # noqa: E402
+
+
+def legacy_clothing_recommendations(weather_data, is_business=False):
+    """The branch-per-day implementation replaced by trips.services.clothing_rules"""
+    recommendations = {}
+    daily = weather_data['daily']
+    is_fahrenheit = weather_data.get('daily_units', {}).get('temperature_2m_max', '').lower() == '°f'
+    for i, day in enumerate(daily['time']):
+        day_recommendations = []
+        max_temp = daily['temperature_2m_max'][i]
+        rain_probability = daily['precipitation_probability_max'][i]
+        if is_fahrenheit:
+            hot_threshold, mild_threshold, cool_threshold = 77, 59, 41
+        else:
+            hot_threshold, mild_threshold, cool_threshold = 25, 15, 5
+        if max_temp > hot_threshold:
+            if is_business:
+                day_recommendations.append("Light business suit or dress shirt with light trousers")
+                day_recommendations.append("Consider a lightweight blazer for meetings")
+            else:
+                day_recommendations.append("Light clothing like t-shirts and shorts")
+                day_recommendations.append("Breathable fabrics recommended")
+        elif max_temp > mild_threshold:
+            if is_business:
+                day_recommendations.append("Standard business suit or blouse with skirt/trousers")
+                day_recommendations.append("Light jacket may be needed for morning/evening")
+            else:
+                day_recommendations.append("Light jacket or sweater with pants")
+                day_recommendations.append("Layered clothing recommended")
+        elif max_temp > cool_threshold:
+            if is_business:
+                day_recommendations.append("Wool or heavier business suit")
+                day_recommendations.append("Consider a topcoat or trench coat")
+            else:
+                day_recommendations.append("Medium-weight jacket and layers")
+                day_recommendations.append("Long sleeves and pants recommended")
+        else:
+            if is_business:
+                day_recommendations.append("Heavier business suit with warm overcoat")
+                day_recommendations.append("Scarf and gloves may be necessary")
+            else:
+                day_recommendations.append("Heavy winter coat with layers")
+                day_recommendations.append("Hat, scarf, and gloves recommended")
+        if rain_probability > 60:
+            if is_business:
+                day_recommendations.append("Bring a formal umbrella and waterproof footwear")
+            else:
+                day_recommendations.append("Bring a raincoat, umbrella, and waterproof footwear")
+        elif rain_probability > 30:
+            if is_business:
+                day_recommendations.append("Consider bringing a compact umbrella")
+            else:
+                day_recommendations.append("Pack a light rain jacket or umbrella just in case")
+        recommendations[day] = day_recommendations
+    return recommendations
+
+
+def make_forecast(days, unit_symbol):
+    start = date(2025, 1, 1)
+    offset = 32 if unit_symbol == '°F' else 0
+    scale = 1.8 if unit_symbol == '°F' else 1
+    return {
+        'daily_units': {'temperature_2m_max': unit_symbol},
+        'daily': {
+            'time': [(start + timedelta(days=i)).isoformat() for i in range(days)],
+            # Sweeps every band, including the exact thresholds
+            'temperature_2m_max': [round(offset + scale * (i % 40 - 5), 1) for i in range(days)],
+            'precipitation_probability_max': [(i * 7) % 101 for i in range(days)],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    for unit_symbol in ('°C', '°F'):
+        raw = make_forecast(args.days, unit_symbol)
+        forecast = Forecast.from_api(raw)
+        for is_business in (False, True):
+            current = WeatherService.get_clothing_recommendations(forecast, is_business)
+            legacy = legacy_clothing_recommendations(raw, is_business)
+            assert {day: list(items) for day, items in current.items()} == legacy, 'Outputs differ'
+
+        legacy_time = min(timeit.repeat(
+            lambda: legacy_clothing_recommendations(raw), number=args.repeat, repeat=5
+        )) / args.repeat
+        current_time = min(timeit.repeat(
+            lambda: WeatherService.get_clothing_recommendations(forecast), number=args.repeat, repeat=5
+        )) / args.repeat
+        print(f"{args.days} days in {unit_symbol}: legacy {legacy_time * 1e6:8.1f} us, "
+              f"rule table {current_time * 1e6:8.1f} us ({legacy_time / current_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Time the cursor-paginated trip list against ?all=1 on a large table.
+Creates a throwaway test database with --rows trips for one user, then
+requests the first page, a page from the middle of the list (via a cursor
+pointing there) and the whole list with ?all=1.
+
+Usage:
+    python benchmarks/list_pagination.py [--rows 100000] [--page-size 50] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'travelmate.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.pagination import Cursor  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from trips.models import Trip  # noqa: E402
+from trips.pagination import ListCursorPagination  # noqa: E402
+
+
+def populate(user, rows):
+    start = date(2020, 1, 1)
+    Trip.objects.bulk_create(
+        (Trip(
+            user=user,
+            destination=f'City {i}, Country {i % 50}',
+            travel_start=start + timedelta(days=i // 3),
+            travel_end=start + timedelta(days=i // 3 + 4),
+            activities=['hiking', 'beach'],
+            packing_list=[{'id': f'item-{n}', 'name': f'Item {n}'} for n in range(10)],
+        ) for i in range(rows)),
+        batch_size=2000,
+    )
+
+
+def middle_cursor(url, position):
+    """Cursor query string pointing at position, as a client following next links would get"""
+    paginator = ListCursorPagination()
+    paginator.base_url = url
+    return paginator.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+
+def measure(client, url, repeat):
+    best, size = float('inf'), 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url)
+        best = min(best, time.perf_counter() - started)
+        assert response.status_code == 200, response.status_code
+        size = len(response.content)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user('benchmark', 'benchmark@example.com', 'benchmark')
+        started = time.perf_counter()
+        populate(user, args.rows)
+        print(f"Created {args.rows} trips in {time.perf_counter() - started:.1f}s")
+
+        client = APIClient()
+        client.force_authenticate(user)
+        middle_trip = Trip.objects.order_by('id')[args.rows // 2]
+        url = '/api/trips/'
+        cases = [
+            ('first page', f'{url}?page_size={args.page_size}'),
+            ('middle page', middle_cursor(f'http://testserver{url}?page_size={args.page_size}', str(middle_trip.id))),
+            ('?all=1', f'{url}?all=1'),
+        ]
+        for case, case_url in cases:
+            seconds, size = measure(client, case_url, args.repeat if case != '?all=1' else 1)
+            print(f"{case:12} {seconds * 1000:10.1f} ms {size / 1024:12.1f} KiB")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
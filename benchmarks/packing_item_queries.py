@@ -0,0 +1,86 @@
+"""
+Count the queries and time of listing packing items at growing row counts.
+Creates a throwaway test database with packing items that each require a few
+of a shared pool of activities, then lists them and fails if the number of
+queries grows with the number of items (an N+1 on the nested
+activity_requirements).
+
+Usage:
+    python benchmarks/packing_item_queries.py [--rows 10 100 1000] [--activities 20]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'travelmate.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from trips.models import Activity, PackingItem  # noqa: E402
+
+
+def populate(rows, activities):
+    PackingItem.objects.all().delete()
+    Activity.objects.all().delete()
+    pool = Activity.objects.bulk_create(
+        Activity(
+            name=f'Activity {i}',
+            description='Outdoor activity',
+            packing_requirements=['water bottle', 'sunscreen', 'hat'],
+            weather_considerations={'rain': ['rain jacket'], 'cold': ['fleece', 'gloves']},
+        ) for i in range(activities)
+    )
+    items = PackingItem.objects.bulk_create(
+        PackingItem(name=f'Item {i}', category='other', weather_conditions=['sunny', 'rainy'])
+        for i in range(rows)
+    )
+    Through = PackingItem.activity_requirements.through
+    Through.objects.bulk_create(
+        Through(packingitem_id=item.id, activity_id=pool[(i + n) % activities].id)
+        for i, item in enumerate(items) for n in range(3)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--activities', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user('benchmark', 'benchmark@example.com', 'benchmark')
+        client = APIClient()
+        client.force_authenticate(user)
+
+        counts = set()
+        for rows in args.rows:
+            populate(rows, args.activities)
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.get('/api/packing-items/')
+                seconds = time.perf_counter() - started
+            assert response.status_code == 200, response.status_code
+            assert len(response.json()) == rows
+            counts.add(len(queries))
+            print(f"{rows:6} items {len(queries):6} queries {seconds * 1000:10.1f} ms")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    if len(counts) > 1:
+        sys.exit('FAIL: the number of queries grows with the number of packing items')
+    print('OK: constant number of queries')
+
+
+if __name__ == '__main__':
+    main()
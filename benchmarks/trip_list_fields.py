@@ -0,0 +1,89 @@
+"""
+Compare the time and response size of the trip list with every field, with
+the dashboard's ?fields= and with ?summary=1. Creates a throwaway test
+database with --rows trips for one user, each with a generated packing list,
+meetings and recommendations, and lists them all with ?all=1.
+
+Usage:
+    python benchmarks/trip_list_fields.py [--rows 5000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'travelmate.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from trips.models import Trip  # noqa: E402
+
+DASHBOARD_FIELDS = 'id,destination,travel_start,travel_end,traveler_type,activities,meeting_schedule'
+
+
+def populate(user, rows):
+    start = date(2020, 1, 1)
+    Trip.objects.bulk_create(
+        (Trip(
+            user=user,
+            destination=f'City {i}, Country {i % 50}',
+            travel_start=start + timedelta(days=i),
+            travel_end=start + timedelta(days=i + 4),
+            activities=[1, 3],
+            packing_list=[{'id': f'item-{n}', 'name': f'Item {n}', 'category': 'clothing'} for n in range(40)],
+            meeting_schedule=[{'title': 'Kickoff', 'date': '2020-01-02', 'time': '09:00', 'location': 'Office'}],
+            recommendations={'clothing': [f'Layer {n}' for n in range(20)], 'activities': ['Museum', 'Walking tour']},
+            cultural_insights={'etiquette': ['Greet with a handshake'] * 10},
+            travel_tips={'safety': ['Keep copies of your documents'] * 10},
+        ) for i in range(rows)),
+        batch_size=2000,
+    )
+
+
+def measure(client, url, repeat):
+    best, size = float('inf'), 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url)
+        best = min(best, time.perf_counter() - started)
+        assert response.status_code == 200, response.status_code
+        size = len(response.content)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = User.objects.create_user('benchmark', 'benchmark@example.com', 'benchmark')
+        populate(user, args.rows)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        for name, url in [
+            ('all fields', '/api/trips/?all=1'),
+            ('dashboard fields', f'/api/trips/?all=1&fields={DASHBOARD_FIELDS}'),
+            ('summary', '/api/trips/?all=1&summary=1'),
+        ]:
+            seconds, size = measure(client, url, args.repeat)
+            print(f"{name:18} {seconds * 1000:10.1f} ms {size / 1024:12.1f} KiB")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -23,8 +23,7 @@ const EditTripForm = ({ open, onClose, trip, onSave }) => {
     destination: '',
     travel_start: '',
     travel_end: '',
-    activities: [],
-    meeting_schedule: ''
+    activities: []
   });
   const [selectedCity, setSelectedCity] = useState(null);
   const [loading, setLoading] = useState(false);
@@ -45,8 +44,7 @@ const EditTripForm = ({ open, onClose, trip, onSave }) => {
         destination: trip.destination || '',
         travel_start: trip.travel_start || '',
         travel_end: trip.travel_end || '',
-        activities: trip.activities || [],
-        meeting_schedule: trip.meeting_schedule || ''
+        activities: trip.activities || []
       });
       
       // Create a city object from the trip data
@@ -59,16 +57,7 @@ const EditTripForm = ({ open, onClose, trip, onSave }) => {
         });
       }
 
-      // Parse activities if they're stored as a string
-      try {
-        const parsedActivities = typeof trip.activities === 'string' 
-          ? JSON.parse(trip.activities)
-          : trip.activities;
-        setSelectedActivities(parsedActivities);
-      } catch (e) {
-        console.error('Error parsing activities:', e);
-        setSelectedActivities([]);
-      }
+      setSelectedActivities(Array.isArray(trip.activities) ? trip.activities : []);
     }
   }, [trip]);
 
@@ -125,7 +114,7 @@ const EditTripForm = ({ open, onClose, trip, onSave }) => {
         ...formData,
         latitude: selectedCity.latitude,
         longitude: selectedCity.longitude,
-        activities: JSON.stringify(selectedActivities)
+        activities: selectedActivities
       };
       
       // Make the API call to update the trip
@@ -213,20 +202,6 @@ const EditTripForm = ({ open, onClose, trip, onSave }) => {
             })}
           </Box>
         </Box>
-        
-        {localStorage.getItem('traveler_type') === 'business' && (
-          <TextField
-            label="Meeting Schedule"
-            name="meeting_schedule"
-            multiline
-            rows={2}
-            value={formData.meeting_schedule}
-            onChange={handleChange}
-            fullWidth
-            margin="normal"
-            helperText="Enter your meeting schedule for formal recommendations."
-          />
-        )}
       </DialogContent>
       <DialogActions>
         <Button onClick={onClose} color="secondary">
@@ -51,18 +51,8 @@ const MeetingsView = () => {
       const tripResponse = await api.get(`/api/trips/${tripId}/`);
       setTrip(tripResponse.data);
       
-      // Parse meeting schedule
-      if (tripResponse.data.meeting_schedule) {
-        try {
-          const meetingData = typeof tripResponse.data.meeting_schedule === 'string'
-            ? JSON.parse(tripResponse.data.meeting_schedule)
-            : tripResponse.data.meeting_schedule;
-          setMeetingSchedule(Array.isArray(meetingData) ? meetingData : []);
-        } catch (err) {
-          console.error('Error parsing meeting schedule:', err);
-          setMeetingSchedule([]);
-        }
-      }
+      const meetingData = tripResponse.data.meeting_schedule;
+      setMeetingSchedule(Array.isArray(meetingData) ? meetingData : []);
       
       setError(null);
     } catch (err) {
@@ -86,7 +76,7 @@ const MeetingsView = () => {
       
       // Update the trip with the new meeting schedule
       await api.patch(`/api/trips/${tripId}/`, {
-        meeting_schedule: JSON.stringify(updatedSchedule)
+        meeting_schedule: updatedSchedule
       });
       
       // Reset form and close dialog
@@ -113,7 +103,7 @@ const MeetingsView = () => {
       
       // Update the trip with the new meeting schedule
       await api.patch(`/api/trips/${tripId}/`, {
-        meeting_schedule: JSON.stringify(updatedSchedule)
+        meeting_schedule: updatedSchedule
       });
       
       // Update local state
@@ -63,16 +63,7 @@ const PackingList = () => {
           .then(res => {
             console.log('Fetched trip details:', res.data);
             setTrip(res.data);
-            // Extract activities
-            try {
-              const tripActivities = typeof res.data.activities === 'string' 
-                ? JSON.parse(res.data.activities) 
-                : res.data.activities || [];
-              setActivities(tripActivities);
-            } catch (e) {
-              console.error('Error parsing activities:', e);
-              setActivities([]);
-            }
+            setActivities(Array.isArray(res.data.activities) ? res.data.activities : []);
           })
           .catch(err => {
             console.error('Error fetching trip details:', err);
@@ -161,7 +152,7 @@ const PackingList = () => {
     try {
       console.log('Saving packing list:', items);
       await api.patch(`/api/trips/${tripId}/`, {
-        packing_list: JSON.stringify(items)
+        packing_list: items
       });
       console.log('Packing list saved successfully');
     } catch (e) {
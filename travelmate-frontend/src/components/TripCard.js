@@ -42,17 +42,7 @@ const TripCard = ({ trip, onTripUpdated, onDelete }) => {
     setIsBusinessTraveler(userTravelerType === 'business' || traveler_type === 'business');
     
     // Check if trip has meetings
-    if (trip.meeting_schedule) {
-      try {
-        const meetingData = typeof trip.meeting_schedule === 'string' 
-          ? JSON.parse(trip.meeting_schedule) 
-          : trip.meeting_schedule;
-        setHasMeetings(Array.isArray(meetingData) && meetingData.length > 0);
-      } catch (err) {
-        console.error('Error parsing meeting schedule:', err);
-        setHasMeetings(false);
-      }
-    }
+    setHasMeetings(Array.isArray(trip.meeting_schedule) && trip.meeting_schedule.length > 0);
   }, [trip, traveler_type]);
   
   useEffect(() => {
@@ -147,12 +137,7 @@ const TripCard = ({ trip, onTripUpdated, onDelete }) => {
             variant="contained"
             fullWidth
             onClick={() => {
-              let activityIds = [];
-              try {
-                if (trip.activities) {
-                  activityIds = typeof trip.activities === 'string' ? JSON.parse(trip.activities) : trip.activities;
-                }
-              } catch {};
+              const activityIds = Array.isArray(trip.activities) ? trip.activities : [];
 
               const available = [
                 {id:1,name:'Hiking'}, {id:2,name:'Beach'}, {id:3,name:'Sightseeing'},
@@ -39,7 +39,7 @@ import LocalActivityIcon from '@mui/icons-material/LocalActivity';
 import EventIcon from '@mui/icons-material/Event';
 import DeleteIcon from '@mui/icons-material/Delete';
 import BusinessIcon from '@mui/icons-material/Business';
-import api from '../services/api';
+import api, { getAllPages } from '../services/api';
 import CitySearch from './CitySearch';
 import TripCard from './TripCard';
 
@@ -154,9 +154,12 @@ export default function TripDashboard({ searchQuery: propSearchQuery }) {
   async function fetchTrips() {
     setLoading(true);
     try {
-      const res = await api.get('/api/trips/');
+      // Only what the cards and the edit dialog show; packing lists and tips are loaded per trip
+      const allTrips = await getAllPages('/api/trips/', {
+        params: { fields: 'id,destination,travel_start,travel_end,traveler_type,activities,meeting_schedule' }
+      });
       const seen = new Set();
-      const deduped = res.data.filter(trip => {
+      const deduped = allTrips.filter(trip => {
         const key = `${trip.destination}|${trip.travel_start}|${trip.travel_end}`;
         if (seen.has(key)) return false;
         seen.add(key);
@@ -200,20 +203,7 @@ export default function TripDashboard({ searchQuery: propSearchQuery }) {
         : [];
       setSelectedActivities(acts);
       
-      // Parse meeting schedule if it exists
-      if (trip.meeting_schedule) {
-        try {
-          const meetingData = typeof trip.meeting_schedule === 'string' 
-            ? JSON.parse(trip.meeting_schedule) 
-            : trip.meeting_schedule;
-          setMeetings(Array.isArray(meetingData) ? meetingData : []);
-        } catch (err) {
-          console.error('Error parsing meeting schedule:', err);
-          setMeetings([]);
-        }
-      } else {
-        setMeetings([]);
-      }
+      setMeetings(Array.isArray(trip.meeting_schedule) ? trip.meeting_schedule : []);
     } else {
       setSelectedTrip(null);
       setSelectedCity(null);
@@ -303,9 +293,9 @@ export default function TripDashboard({ searchQuery: propSearchQuery }) {
         destination: selectedCity.display_name,
         travel_start: formData.travel_start,
         travel_end: formData.travel_end,
-        activities: JSON.stringify(selectedActivities.map(a => a.id)),
+        activities: selectedActivities.map(a => a.id),
         // Only include meeting_schedule if user is a business traveler
-        ...(isBusinessTraveler && { meeting_schedule: JSON.stringify(meetings) })
+        ...(isBusinessTraveler && { meeting_schedule: meetings })
       };
 
       if (selectedTrip) {
@@ -87,31 +87,20 @@ const TripDetails = () => {
 
   const fetchTripDetails = async () => {
     try {
-      const [tripResponse, insightsResponse, tipsResponse, packingResponse, weatherResponse] = await Promise.all([
-        api.get(`/api/trips/${tripId}/`),
-        api.get(`/api/trips/${tripId}/cultural-insights/`),
-        api.get(`/api/trips/${tripId}/travel-tips/`),
-        api.get(`/api/trips/${tripId}/packing-list/`),
-        api.get(`/api/trips/${tripId}/weather/`)
-      ]);
+      // One request for the whole page; the server fetches the forecast once
+      const { data: bundle } = await api.get(`/api/trips/${tripId}/bundle/`, {
+        params: { include: 'trip,cultural_insights,travel_tips,packing_list,weather' }
+      });
 
-      setTrip(tripResponse.data);
-      setCulturalInsights(insightsResponse.data);
-      setTravelTips(tipsResponse.data);
-      setPackingList(packingResponse.data);
-      setWeather(weatherResponse.data);
+      setTrip(bundle.trip);
+      setCulturalInsights(bundle.cultural_insights);
+      setTravelTips(bundle.travel_tips);
+      setPackingList(bundle.packing_list || []);
+      setWeather(bundle.weather);
       
-      // Parse meeting schedule if it exists and user is a business traveler
-      if (tripResponse.data.meeting_schedule && tripResponse.data.traveler_type === 'business') {
-        try {
-          const meetingData = typeof tripResponse.data.meeting_schedule === 'string'
-            ? JSON.parse(tripResponse.data.meeting_schedule)
-            : tripResponse.data.meeting_schedule;
-          setMeetingSchedule(Array.isArray(meetingData) ? meetingData : []);
-        } catch (err) {
-          console.error('Error parsing meeting schedule:', err);
-          setMeetingSchedule([]);
-        }
+      // Show the meeting schedule to business travelers
+      if (Array.isArray(bundle.trip.meeting_schedule) && bundle.trip.traveler_type === 'business') {
+        setMeetingSchedule(bundle.trip.meeting_schedule);
       }
       
       setError(null);
@@ -154,7 +143,7 @@ const TripDetails = () => {
       
       // Update the trip with the new meeting schedule
       await api.patch(`/api/trips/${tripId}/`, {
-        meeting_schedule: JSON.stringify(updatedSchedule)
+        meeting_schedule: updatedSchedule
       });
       
       // Reset form and close dialog
@@ -181,7 +170,7 @@ const TripDetails = () => {
       
       // Update the trip with the new meeting schedule
       await api.patch(`/api/trips/${tripId}/`, {
-        meeting_schedule: JSON.stringify(updatedSchedule)
+        meeting_schedule: updatedSchedule
       });
       
       // Update local state
@@ -53,14 +53,16 @@ const WeatherDetails = () => {
   useEffect(() => {
     const fetchTripDetails = async () => {
       try {
-        const tripResponse = await api.get(`/api/trips/${tripId}/`);
-        setTrip(tripResponse.data);
-        
-        const weatherResponse = await api.get(`/api/trips/${tripId}/weather/`);
-        setWeatherData(weatherResponse.data);
-        
-        const recommendationsResponse = await api.get(`/api/trips/${tripId}/clothing-recommendations/`);
-        setRecommendations(recommendationsResponse.data);
+        // Trip, forecast and clothing recommendations in one request
+        const { data: bundle } = await api.get(`/api/trips/${tripId}/bundle/`, {
+          params: { include: 'trip,weather,clothing' }
+        });
+        if (!bundle.weather) {
+          throw new Error(bundle.errors?.weather || 'No weather data');
+        }
+        setTrip(bundle.trip);
+        setWeatherData(bundle.weather);
+        setRecommendations(bundle.clothing);
         
         setLoading(false);
       } catch (err) {
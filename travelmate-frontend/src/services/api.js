@@ -92,4 +92,18 @@ api.interceptors.response.use(
   }
 );
 
+// Fetch every page of a cursor-paginated list endpoint
+export async function getAllPages(url, config = {}) {
+  const results = [];
+  let next = url;
+  let params = config.params;
+  while (next) {
+    const { data } = await api.get(next, { ...config, params });
+    results.push(...data.results);
+    next = data.next;
+    params = undefined; // The next link already carries the query string
+  }
+  return results;
+}
+
 export default api;
\ No newline at end of file
@@ -3,8 +3,8 @@ from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter as
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 import logging
 import json
-import requests
 from trips.models import Profile
+from trips.services.http_client import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +73,7 @@ class GoogleOAuth2Adapter(BaseGoogleOAuth2Adapter):
                     userinfo_url = 'https://www.googleapis.com/oauth2/v3/userinfo'
                     headers = {'Authorization': f'Bearer {token["access_token"]}'}
                     
-                    user_info_resp = requests.get(userinfo_url, headers=headers)
+                    user_info_resp = get_client('google').get(userinfo_url, headers=headers)
                     user_info = user_info_resp.json()
                     
                     logger.info(f"Successfully retrieved user info: {str(user_info)[:100]}...")
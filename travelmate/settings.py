@@ -85,12 +85,80 @@ DATABASES = {
     }
 }
 
+# ─── Caches ──────────────────────────────────────────────────────────────────
+# Forecasts can be kept in local memory, on disk or in the database; the "db"
+# backend needs `python manage.py createcachetable` once.
+FORECAST_CACHE_BACKEND = os.getenv("FORECAST_CACHE_BACKEND", "locmem")
+FORECAST_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND":  "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "forecasts",
+        "OPTIONS":  {"MAX_ENTRIES": 5000},
+    },
+    "file": {
+        "BACKEND":  "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "forecasts",
+    },
+    "db": {
+        "BACKEND":  "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "forecast_cache",
+    },
+}
+CACHES = {
+    "default":   {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "forecasts": FORECAST_CACHE_BACKENDS[FORECAST_CACHE_BACKEND],
+}
+FORECAST_CACHE = {
+    "ALIAS":        "forecasts",
+    "GRID_DEGREES": float(os.getenv("FORECAST_CACHE_GRID_DEGREES", "0.1")),  # ~11 km cells
+    "TTL":          int(os.getenv("FORECAST_CACHE_TTL", str(60 * 60))),  # Model refresh interval, seconds
+    # Past TTL, entries are served as stale while refreshed in the background;
+    # requests only wait for the upstream API once entries are older than this
+    "HARD_TTL":     int(os.getenv("FORECAST_CACHE_HARD_TTL", str(6 * 60 * 60))),
+}
+
 # ─── Password Validators ─────────────────────────────────────────────────────
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
 ]
 
+# ─── Outbound HTTP ───────────────────────────────────────────────────────────
+# Per-service timeouts (seconds), retries and keep-alive pool sizes for calls
+# made through trips.services.http_client; services inherit from "default".
+# MAX_CONNECTIONS caps the concurrent connections of each async client.
+OUTBOUND_HTTP = {
+    "default":     {"CONNECT_TIMEOUT": 3.05, "READ_TIMEOUT": 10, "RETRIES": 2, "BACKOFF": 0.5, "POOL_SIZE": 10,
+                    "MAX_CONNECTIONS": 200},
+    "geocoding":   {"READ_TIMEOUT": 5},
+    "weather":     {"READ_TIMEOUT": 10},
+    "huggingface": {"READ_TIMEOUT": 20, "RETRIES": 0},
+    "google":      {"READ_TIMEOUT": 5},
+}
+
+# ─── Geocoding cache ─────────────────────────────────────────────────────────
+GEOCODING_CACHE = {
+    "MAX_ENTRIES":  int(os.getenv("GEOCODING_CACHE_MAX_ENTRIES", "1024")),  # In-process LRU size
+    "TTL":          int(os.getenv("GEOCODING_CACHE_TTL", str(60 * 60 * 24 * 30))),  # Seconds
+    "NEGATIVE_TTL": int(os.getenv("GEOCODING_CACHE_NEGATIVE_TTL", str(60 * 60 * 24))),  # Seconds
+}
+
+# ─── City search ─────────────────────────────────────────────────────────────
+# Built by `python manage.py load_gazetteer`; city search falls back to the
+# geocoding API when the file is missing or has no match.
+GAZETTEER_INDEX_PATH = os.getenv("GAZETTEER_INDEX_PATH", str(BASE_DIR / "data" / "gazetteer.idx"))
+
+# ─── Climatology ─────────────────────────────────────────────────────────────
+# Monthly normals built by `python manage.py load_climatology`; used for trips
+# that start beyond the 16-day live forecast.
+CLIMATOLOGY_PATH = os.getenv("CLIMATOLOGY_PATH", str(BASE_DIR / "data" / "climatology.npz"))
+
+# ─── Async views ─────────────────────────────────────────────────────────────
+# Serve the weather, city search and AI endpoints from trips.async_views. Only
+# worth enabling under an ASGI server (e.g. `uvicorn travelmate.asgi:application`);
+# under WSGI each async view runs in its own event loop.
+ASYNC_UPSTREAM_VIEWS = os.getenv("ASYNC_UPSTREAM_VIEWS", "False") == "True"
+
 # ─── Internationalization / Static ────────────────────────────────────────────
 LANGUAGE_CODE = "en-us"
 TIME_ZONE     = "UTC"
@@ -125,6 +193,10 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ),
 }
+# Page size of the cursor-paginated trip list (trips.pagination); clients may
+# ask for ?page_size= up to MAX_PAGE_SIZE, or for everything with ?all=1
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
 
 # dj-rest-auth settings
 REST_AUTH = {
@@ -4,8 +4,8 @@ from django.contrib.auth import login
 from django.contrib.auth.models import User
 import json
 import logging
-import requests
 from rest_framework_simplejwt.tokens import RefreshToken
+from trips.services.http_client import get_client
 from allauth.socialaccount.models import SocialApp
 
 logger = logging.getLogger(__name__)
@@ -23,7 +23,7 @@ def google_auth_token(request):
                 return JsonResponse({'error': 'No ID token provided'}, status=400)
                 
             # Verify the token with Google
-            response = requests.get(f'https://oauth2.googleapis.com/tokeninfo?id_token={id_token}')
+            response = get_client('google').get(f'https://oauth2.googleapis.com/tokeninfo?id_token={id_token}')
             
             if response.status_code != 200:
                 logger.error(f"Failed to verify token: {response.status_code}, {response.text}")
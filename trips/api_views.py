@@ -1,69 +1,114 @@
 # trips/api_views.py
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.db.models import BooleanField, Count, Max, Q
+from django.db.models.expressions import RawSQL
+from django.utils.decorators import method_decorator
 from .models import (
     Trip, Activity, PackingItem, CulturalInsight, 
     TravelTip, Profile, KeyFeature, UserStory
 )
 from .serializers import (
-    TripSerializer, ActivitySerializer, PackingItemSerializer,
+    TripSerializer, TripSummarySerializer, ActivitySerializer, PackingItemSerializer,
     CulturalInsightSerializer, TravelTipSerializer, ProfileSerializer,
     KeyFeatureSerializer, UserStorySerializer
 )
 from .services.weather_service import WeatherService
 from .services.geocoding_service import GeocodingService
-import json
-import requests
+from .services.countries import country_code_for_name
+from .services.singleflight import upstream_flight
+from .services.http_client import get_client, latency_stats
+from .conditional import conditional, make_etag
+from .pagination import ListCursorPagination
+from .views import forecast_days_for_trip, parse_temperature_unit, trip_forecast_json, trip_weather_versions
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
 import os
-from datetime import datetime
+from datetime import datetime, timezone as dt_timezone
+import numpy as np
+
+def trips_with_activity(queryset, activity):
+    """Trips whose activities include activity, given by name or by Activity id"""
+    values = [activity, int(activity)] if activity.isdigit() else [activity]
+    if connection.features.supports_json_field_contains:
+        # Served by the GIN index on activities on PostgreSQL
+        matches = Q()
+        for value in values:
+            matches |= Q(activities__contains=[value])
+        return queryset.filter(matches)
+    
+    # SQLite has no JSON containment lookup; search the array with json_each instead
+    placeholders = ', '.join(['%s'] * len(values))
+    has_activity = RawSQL(
+        f'EXISTS (SELECT 1 FROM json_each({Trip._meta.db_table}.activities) WHERE json_each.value IN ({placeholders}))',
+        values,
+        output_field=BooleanField()
+    )
+    return queryset.alias(has_activity=has_activity).filter(has_activity=True)
+
+def place_fields(place):
+    """Trip fields resolved from a geocoded place"""
+    return {field: getattr(place, field) for field in Trip.PLACE_FIELDS}
 
 class TripListCreateView(generics.ListCreateAPIView):
     serializer_class = TripSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ListCursorPagination
 
     def get_queryset(self):
-        return Trip.objects.filter(user=self.request.user)
+        activity = self.request.query_params.get('activity', '')
+        # Served by the (user, id) index
+        queryset = Trip.objects.filter(user=self.request.user).order_by('id')
+        
+        if activity:
+            queryset = trips_with_activity(queryset, activity)
+        if self.request.method == 'GET':
+            # Skip loading the JSON columns the response leaves out; the cursor reads the ordering
+            queryset = queryset.only(*self.get_serializer().model_fields(), *self.pagination_class.ordering)
+            
+        return queryset
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and self.request.query_params.get('summary') in ('1', 'true'):
+            return TripSummarySerializer
+        return TripSerializer
 
     def perform_create(self, serializer):
-        # Check if coordinates are provided
+        # Resolve the destination's city and country, and its coordinates unless provided
+        place = GeocodingService.get_place(serializer.validated_data.get('destination'))
         latitude = serializer.validated_data.get('latitude')
         longitude = serializer.validated_data.get('longitude')
         
         if latitude is None or longitude is None:
-            # Try to geocode the destination
-            destination = serializer.validated_data.get('destination')
-            latitude, longitude = GeocodingService.get_coordinates(destination)
+            latitude, longitude = place.latitude, place.longitude
             
-        # Calculate number of days for the trip
         travel_start = serializer.validated_data.get('travel_start')
         travel_end = serializer.validated_data.get('travel_end')
         
-        # Calculate number of days for the trip
-        trip_days = (travel_end - travel_start).days + 1
-        
+        # Forecast the trip's dates as the weather pages will, from climatology beyond the horizon
         weather_data = WeatherService.get_weather_forecast(
             latitude=latitude,
             longitude=longitude,
-            days=trip_days,
-            temperature_unit="fahrenheit"
+            days=forecast_days_for_trip(Trip(travel_start=travel_start, travel_end=travel_end)),
+            start_date=travel_start
         )
         
-        # Generate packing list based on activities and weather
+        # Generate packing list based on activities and the weather during the trip
         activities = serializer.validated_data.get('activities', [])
         traveler_type = serializer.validated_data.get('traveler_type', 'casual')
-        packing_list = self.generate_packing_list(activities, weather_data, traveler_type)
-        
-        # Convert packing list to JSON string
-        packing_list_json = json.dumps(packing_list)
+        packing_list = self.generate_packing_list(
+            activities, trip_weather(weather_data, travel_start, travel_end), traveler_type
+        )
         
         serializer.save(
             user=self.request.user,
             latitude=latitude,
             longitude=longitude,
-            packing_list=packing_list_json
+            packing_list=packing_list,
+            **place_fields(place)
         )
 
     def generate_packing_list(self, activities, weather_data, traveler_type):
@@ -146,18 +191,18 @@ class TripListCreateView(generics.ListCreateAPIView):
                 ])
         
         # Add weather-specific items
-        if weather_data and 'daily' in weather_data:
+        if weather_data:
             try:
                 # Calculate average temperature from the daily max temperatures
-                max_temps = weather_data['daily']['temperature_2m_max']
-                avg_temp = sum(max_temps) / len(max_temps) if max_temps else None
+                max_temps = weather_data.column('temperature_2m_max')
+                avg_temp = float(np.nanmean(max_temps)) if not np.isnan(max_temps).all() else None
                 
                 # Check if there's high precipitation probability on any day
-                precip_probs = weather_data['daily'].get('precipitation_probability_max', [])
-                has_high_precipitation = any(prob > 50 for prob in precip_probs) if precip_probs else False
+                precip_probs = weather_data.column('precipitation_probability_max')
+                has_high_precipitation = bool((precip_probs > 50).any())
                 
                 if avg_temp is not None:
-                    if avg_temp < 50:  # Cold weather (below 50°F)
+                    if avg_temp < 10:  # Cold weather (below 10°C)
                         packing_list.update([
                             'Winter coat',
                             'Warm gloves',
@@ -165,13 +210,13 @@ class TripListCreateView(generics.ListCreateAPIView):
                             'Thermal underwear',
                             'Warm socks'
                         ])
-                    elif avg_temp < 65:  # Cool weather (50-65°F)
+                    elif avg_temp < 18:  # Cool weather (10-18°C)
                         packing_list.update([
                             'Light jacket',
                             'Sweaters',
                             'Long pants'
                         ])
-                    elif avg_temp > 80:  # Hot weather (above 80°F)
+                    elif avg_temp > 27:  # Hot weather (above 27°C)
                         packing_list.update([
                             'Light clothing',
                             'Sunscreen',
@@ -185,7 +230,7 @@ class TripListCreateView(generics.ListCreateAPIView):
                         'Umbrella',
                         'Waterproof shoes'
                     ])
-            except (KeyError, TypeError) as e:
+            except ValueError as e:
                 print(f"Error processing weather data: {e}")
                 # Continue without weather-specific items if there's an error
                 pass
@@ -204,32 +249,48 @@ class TripListCreateView(generics.ListCreateAPIView):
         
         return list(packing_list)
 
+def trip_versions(request, pk):
+    """ETag and Last-Modified of a trip, from its version"""
+    updated_at = Trip.objects.filter(pk=pk, user=request.user).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return None
+    return make_etag('trip', pk, updated_at.timestamp()), updated_at
+
 class TripDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TripSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Trip.objects.filter(user=self.request.user)
+        queryset = Trip.objects.filter(user=self.request.user)
+        if self.request.method == 'GET':
+            queryset = queryset.only(*self.get_serializer().model_fields())
+        return queryset
+
+    @method_decorator(conditional(trip_versions))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_update(self, serializer):
         # Check if destination has changed
         if 'destination' in serializer.validated_data:
-            destination = serializer.validated_data.get('destination')
-            latitude, longitude = GeocodingService.get_coordinates(destination)
-            serializer.save(latitude=latitude, longitude=longitude)
+            place = GeocodingService.get_place(serializer.validated_data.get('destination'))
+            serializer.save(latitude=place.latitude, longitude=place.longitude, **place_fields(place))
         else:
             serializer.save()
 
 class ActivityListCreateView(generics.ListCreateAPIView):
-    queryset = Activity.objects.all()
+    queryset = Activity.objects.order_by('id')
     serializer_class = ActivitySerializer
     permission_classes = [IsAuthenticated]
 
 class PackingItemListCreateView(generics.ListCreateAPIView):
-    queryset = PackingItem.objects.all()
+    queryset = PackingItem.objects.prefetch_related('activity_requirements').order_by('id')
     serializer_class = PackingItemSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'activity_representations': {}}
+
 class CulturalInsightListView(generics.ListAPIView):
     serializer_class = CulturalInsightSerializer
     permission_classes = [IsAuthenticated]
@@ -237,7 +298,7 @@ class CulturalInsightListView(generics.ListAPIView):
     def get_queryset(self):
         destination = self.request.query_params.get('destination', '')
         traveler_type = self.request.query_params.get('traveler_type', '')
-        queryset = CulturalInsight.objects.all()
+        queryset = CulturalInsight.objects.order_by('id')
         
         if destination:
             queryset = queryset.filter(destination=destination)
@@ -254,10 +315,10 @@ class TravelTipListView(generics.ListAPIView):
         destination = self.request.query_params.get('destination', '')
         traveler_type = self.request.query_params.get('traveler_type', '')
         category = self.request.query_params.get('category', '')
-        queryset = TravelTip.objects.all()
+        queryset = TravelTip.objects.order_by('id')
         
         if destination:
-            queryset = queryset.filter(destination=destination)
+            queryset = queryset.filter(destination_normalized=TravelTip.normalize_destination(destination))
         if traveler_type:
             queryset = queryset.filter(traveler_type=traveler_type)
         if category:
@@ -272,6 +333,17 @@ class ProfileRetrieveUpdateView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return get_object_or_404(Profile, user=self.request.user)
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def upstream_metrics(request):
+    """Report cache and request-coalescing counters for upstream API calls"""
+    return Response({
+        'coalescing': upstream_flight.stats(),
+        'geocoding_cache': GeocodingService.cache.stats(),
+        'forecast_cache': WeatherService.cache.stats(),
+        'http_latency': latency_stats(),
+    })
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def trip_recommendations(request, trip_id):
@@ -281,7 +353,8 @@ def trip_recommendations(request, trip_id):
     # Get weather data
     weather_data = WeatherService.get_weather_forecast(
         latitude=trip.latitude,
-        longitude=trip.longitude
+        longitude=trip.longitude,
+        start_date=trip.travel_start
     )
     
     # Get user's profile
@@ -298,106 +371,151 @@ def trip_recommendations(request, trip_id):
         'packing': []  # Add packing recommendations
     }
     
-    # Update trip with recommendations
-    trip.recommendations = recommendations
-    trip.save()
+    # Update trip with recommendations, if they changed
+    trip.save_recommendations(recommendations)
     
     return Response(recommendations)
 
+def reference_data_versions(request, trip_id, model, kind, destination):
+    """
+    ETag and Last-Modified of a trip's cultural insights or travel tips, from
+    the trip's version, the traveler type and the matching reference rows
+    """
+    trip = Trip.objects.filter(pk=trip_id, user=request.user).only('destination', 'country_code', 'updated_at').first()
+    if trip is None:
+        return None
+    traveler_type = request.user.profile.traveler_type
+    rows = model.objects.filter(
+        traveler_type=traveler_type, **destination(trip)
+    ).aggregate(count=Count('id'), updated_at=Max('updated_at'))
+    etag = make_etag(
+        kind, trip.pk, trip.updated_at.timestamp(), traveler_type,
+        rows['count'], rows['updated_at'].timestamp() if rows['updated_at'] else None
+    )
+    return etag, max(filter(None, [trip.updated_at, rows['updated_at']]))
+
+def trip_cultural_insights_versions(request, trip_id):
+    return reference_data_versions(
+        request, trip_id, CulturalInsight, 'cultural-insights', cultural_insights_lookup
+    )
+
+def trip_travel_tips_versions(request, trip_id):
+    return reference_data_versions(
+        request, trip_id, TravelTip, 'travel-tips', travel_tips_lookup
+    )
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(trip_cultural_insights_versions)
 def trip_cultural_insights(request, trip_id):
     """Get cultural insights for a specific trip"""
     trip = get_object_or_404(Trip, id=trip_id, user=request.user)
+    return Response(cultural_insights_for_trip(trip, request.user.profile.traveler_type))
 
+# Hard‑coded dress codes for popular destinations, by ISO country code
+FALLBACK_DRESS_CODES = {
+    "IN": {
+        "title":       "India – Traditional Attire",
+        "description": (
+            "Women often wear saris or salwar kameez; "
+            "men commonly wear kurta‑pajama or formal suits."
+        )
+    },
+    "FR": {
+        "title":       "France – Chic European Style",
+        "description": (
+            "Smart‑casual clothing: tailored trousers or skirts, "
+            "light jackets, and scarves are typical."
+        )
+    },
+    "JP": {
+        "title":       "Japan – Respectful Dress",
+        "description": (
+            "For ceremonies, traditional kimono; daily wear is "
+            "neat, conservative western attire."
+        )
+    },
+    "CN": {
+        "title":       "China – Modern Meets Traditional",
+        "description": (
+            "You may see qipaos (cheongsams) at formal events; "
+            "for everyday wear, modern casual is common."
+        )
+    },
+    "MX": {
+        "title":       "Mexico – Vibrant Traditional Wear",
+        "description": (
+            "Embrace bright huipils or embroidered dresses; "
+            "men sometimes wear guayabera shirts."
+        )
+    },
+    "BR": {
+        "title":       "Brazil – Tropical Comfort",
+        "description": (
+            "Light fabrics and swimwear for the coast; "
+            "modest cover‑ups for religious sites."
+        )
+    },
+    "GB": {
+        "title":       "UK – Smart Reserved Style",
+        "description": (
+            "Neutral colors, trench coats or blazers; "
+            "formal hats at events like horse races."
+        )
+    },
+    "DE": {
+        "title":       "Germany – Functional Fashion",
+        "description": (
+            "Dirndls and lederhosen for festivals; "
+            "practical layers and comfortable shoes otherwise."
+        )
+    },
+    "IT": {
+        "title":       "Italy – Elegant European Fashion",
+        "description": (
+            "Well‑tailored suits, dresses, and leather accessories; "
+            "smart casual for cafes and galleries."
+        )
+    },
+    "ES": {
+        "title":       "Spain – Colourful & Festive",
+        "description": (
+            "Flowing dresses or flamenco‑style skirts for festivals; "
+            "casual chic in urban areas."
+        )
+    },
+}
+
+def trip_country_code(trip):
+    """ISO code of a trip's country, guessed from the destination text until the trip's place is resolved"""
+    return trip.country_code or country_code_for_name(trip.destination.split(',')[-1])
+
+def cultural_insights_lookup(trip):
+    """Filter selecting a trip's cultural insights"""
+    country_code = trip_country_code(trip)
+    return {'country_code': country_code} if country_code else {'destination': trip.destination}
+
+def travel_tips_lookup(trip):
+    """Filter selecting a trip's travel tips"""
+    country_code = trip_country_code(trip)
+    if country_code:
+        return {'country_code': country_code}
+    return {'destination_normalized': TravelTip.normalize_destination(trip.destination.split(',')[-1])}
+
+def cultural_insights_for_trip(trip, traveler_type):
+    """Cultural insights for a trip, always including a dress code"""
     # 1) Load any existing insights
     qs   = CulturalInsight.objects.filter(
-        destination=trip.destination,
-        traveler_type=request.user.profile.traveler_type
+        traveler_type=traveler_type,
+        **cultural_insights_lookup(trip)
     )
     data = CulturalInsightSerializer(qs, many=True).data
 
     # 2) If there's no dress_code, append one from our map
     if not any(item.get('category') == 'dress_code' for item in data):
-        # Extract country = last comma‑separated segment
-        parts   = [p.strip() for p in trip.destination.split(',')]
-        country = parts[-1].title() if parts else trip.destination.title()
-
-        # Hard‑coded dress codes for popular destinations
-        dress_map = {
-            "India": {
-                "title":       "India – Traditional Attire",
-                "description": (
-                    "Women often wear saris or salwar kameez; "
-                    "men commonly wear kurta‑pajama or formal suits."
-                )
-            },
-            "France": {
-                "title":       "France – Chic European Style",
-                "description": (
-                    "Smart‑casual clothing: tailored trousers or skirts, "
-                    "light jackets, and scarves are typical."
-                )
-            },
-            "Japan": {
-                "title":       "Japan – Respectful Dress",
-                "description": (
-                    "For ceremonies, traditional kimono; daily wear is "
-                    "neat, conservative western attire."
-                )
-            },
-            "China": {
-                "title":       "China – Modern Meets Traditional",
-                "description": (
-                    "You may see qipaos (cheongsams) at formal events; "
-                    "for everyday wear, modern casual is common."
-                )
-            },
-            "Mexico": {
-                "title":       "Mexico – Vibrant Traditional Wear",
-                "description": (
-                    "Embrace bright huipils or embroidered dresses; "
-                    "men sometimes wear guayabera shirts."
-                )
-            },
-            "Brazil": {
-                "title":       "Brazil – Tropical Comfort",
-                "description": (
-                    "Light fabrics and swimwear for the coast; "
-                    "modest cover‑ups for religious sites."
-                )
-            },
-            "United Kingdom": {
-                "title":       "UK – Smart Reserved Style",
-                "description": (
-                    "Neutral colors, trench coats or blazers; "
-                    "formal hats at events like horse races."
-                )
-            },
-            "Germany": {
-                "title":       "Germany – Functional Fashion",
-                "description": (
-                    "Dirndls and lederhosen for festivals; "
-                    "practical layers and comfortable shoes otherwise."
-                )
-            },
-            "Italy": {
-                "title":       "Italy – Elegant European Fashion",
-                "description": (
-                    "Well‑tailored suits, dresses, and leather accessories; "
-                    "smart casual for cafes and galleries."
-                )
-            },
-            "Spain": {
-                "title":       "Spain – Colourful & Festive",
-                "description": (
-                    "Flowing dresses or flamenco‑style skirts for festivals; "
-                    "casual chic in urban areas."
-                )
-            },
-        }
+        country = trip.country or trip.destination.split(',')[-1].strip().title()
 
-        entry = dress_map.get(country, {
+        entry = FALLBACK_DRESS_CODES.get(trip_country_code(trip), {
             "title":       f"{country} – Recommended Dress Code",
             "description": (
                 "Pack modest, climate‑appropriate attire—smart‑casual for city visits "
@@ -411,14 +529,14 @@ def trip_cultural_insights(request, trip_id):
             "category":      "dress_code",
             "title":         entry["title"],
             "description":   entry["description"],
-            "traveler_type": request.user.profile.traveler_type,
+            "traveler_type": traveler_type,
         })
 
-    return Response(data)
+    return data
 
-# ——— Country‑based customs & lifestyle tips ———
+# ——— Country‑based customs & lifestyle tips, by ISO country code ———
 FALLBACK_TRAVEL_TIPS = {
-    'India': [
+    'IN': [  # India
         {
             'title': 'Use Namaste Greeting',
             'description': 'Press your palms together and say “Namaste” instead of shaking hands.'
@@ -432,7 +550,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': 'PDA is generally frowned upon in most regions.'
         },
     ],
-    'United States': [
+    'US': [  # United States
         {
             'title': 'Tipping Culture',
             'description': 'It’s customary to tip service staff ~15–20% in restaurants and taxis.'
@@ -446,7 +564,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': 'Stand about an arm’s length apart when talking to people you don’t know well.'
         },
     ],
-    'United Kingdom': [
+    'GB': [  # United Kingdom
         {
             'title': 'Queueing Etiquette',
             'description': 'Always wait your turn in line and don’t push ahead of others.'
@@ -460,7 +578,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': 'Discussing the weather is a common ice-breaker.'
         },
     ],
-    'Japan': [
+    'JP': [  # Japan
         {
             'title': 'Bowing Etiquette',
             'description': 'A slight bow shows respect; deeper bows are for more formal occasions.'
@@ -474,7 +592,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': 'Tipping can confuse locals; excellent service is built in.'
         },
     ],
-    'France': [
+    'FR': [  # France
         {
             'title': 'La Bise Greeting',
             'description': 'Cheek‑kissing (2–4 times) is common among friends and family.'
@@ -488,7 +606,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': 'Meals are leisurely—expect to dine for at least 1–2 hours.'
         },
     ],
-    'Germany': [
+    'DE': [  # Germany
         {
             'title': 'Punctuality',
             'description': 'Arrive on time for meetings and social gatherings.'
@@ -502,7 +620,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': 'Keep voices down in trains, libraries, and residential areas after 10 pm.'
         },
     ],
-    'Italy': [
+    'IT': [  # Italy
         {
             'title': 'Greetings',
             'description': 'A handshake, direct eye contact, and a smile are standard when meeting.'
@@ -516,7 +634,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': 'Cover shoulders and knees when entering religious sites.'
         },
     ],
-    'Spain': [
+    'ES': [  # Spain
         {
             'title': 'Siesta Hours',
             'description': 'Many shops close around 2–5 pm; plan errands accordingly.'
@@ -530,7 +648,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': 'Dinner often starts after 9 pm, and nightlife goes on until dawn.'
         },
     ],
-    'China': [
+    'CN': [  # China
         {
             'title': 'Gift Giving Etiquette',
             'description': 'Offer and receive gifts with both hands; don’t open in front of the giver.'
@@ -544,7 +662,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': 'Elders dine first, and their opinions are highly respected.'
         },
     ],
-    'Brazil': [
+    'BR': [  # Brazil
         {
             'title': 'Warm Greetings',
             'description': 'Two quick air kisses on the cheek (starting with the right) are typical.'
@@ -558,7 +676,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': 'In most settings, casual, colorful attire is perfectly acceptable.'
         },
     ],
-    'Australia': [
+    'AU': [  # Australia
         {
             'title': 'Informal Culture',
             'description': 'First names are used quickly—even with managers or professors.'
@@ -572,7 +690,7 @@ FALLBACK_TRAVEL_TIPS = {
             'description': '“Barbie” (barbecue) is a social event—feel free to bring salads or drinks to share.'
         },
     ],
-    'Mexico': [
+    'MX': [  # Mexico
         {
             'title': 'Respectful Greetings',
             'description': 'A handshake and eye contact; close friends may hug and kiss once on the cheek.'
@@ -590,34 +708,58 @@ FALLBACK_TRAVEL_TIPS = {
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(trip_travel_tips_versions)
 def trip_travel_tips(request, trip_id):
     """Get travel tips for a specific trip"""
     trip = get_object_or_404(Trip, id=trip_id, user=request.user)
-    country = trip.destination.split(',')[-1].strip()
+    return Response(travel_tips_for_trip(trip, request.user.profile.traveler_type))
 
+def travel_tips_for_trip(trip, traveler_type):
+    """Travel tips for a trip's country, falling back to built-in tips"""
     # 1) DB‑driven tips
     qs = TravelTip.objects.filter(
-        destination__iexact=country,
-        traveler_type=request.user.profile.traveler_type
+        traveler_type=traveler_type,
+        **travel_tips_lookup(trip)
     )
     serializer = TravelTipSerializer(qs, many=True)
     if serializer.data:
-        return Response(serializer.data)
+        return serializer.data
 
     # 2) Country fallback
-    if country in FALLBACK_TRAVEL_TIPS:
-        return Response(FALLBACK_TRAVEL_TIPS[country])
+    country_code = trip_country_code(trip)
+    if country_code in FALLBACK_TRAVEL_TIPS:
+        return FALLBACK_TRAVEL_TIPS[country_code]
 
     # 3) Generic fallback
-    return Response([
+    return [
         {
             'title': 'Observe Local Customs',
             'description': 'Take time to research greetings, dining etiquette, and social norms before you travel.'
         }
-    ])
+    ]
+
+def trip_packing_list_versions(request, trip_id):
+    """
+    ETag and Last-Modified of a trip's packing list, from the trip's version
+    and, for a list generated on the fly, the forecast's fetch time
+    """
+    trip = Trip.objects.filter(pk=trip_id, user=request.user).only(
+        'packing_list', 'updated_at', 'latitude', 'longitude'
+    ).first()
+    if trip is None:
+        return None
+    if trip.packing_list:
+        return make_etag('packing-list', trip.pk, trip.updated_at.timestamp()), trip.updated_at
+    
+    fetched_at = WeatherService.forecast_fetched_at(trip.latitude, trip.longitude)
+    if fetched_at is None:
+        return None
+    etag = make_etag('packing-list', trip.pk, trip.updated_at.timestamp(), fetched_at)
+    return etag, max(trip.updated_at, datetime.fromtimestamp(fetched_at, dt_timezone.utc))
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@conditional(trip_packing_list_versions)
 def trip_packing_list(request, trip_id):
     """
     GET: Retrieve the packing list for a trip
@@ -629,40 +771,34 @@ def trip_packing_list(request, trip_id):
         return Response({'error': 'Trip not found'}, status=404)
 
     if request.method == 'GET':
-        try:
-            # Try to get the saved packing list
-            if trip.packing_list:
-                packing_list = json.loads(trip.packing_list)
-                return Response(packing_list)
-            
-            # If no packing list exists, generate a new one
-            activities = json.loads(trip.activities) if trip.activities else []
-            packing_list = generate_packing_list(trip, activities)
-            return Response(packing_list)
-            
-        except json.JSONDecodeError:
-            return Response({'error': 'Invalid packing list data'}, status=400)
+        # Try to get the saved packing list
+        if trip.packing_list:
+            return Response(trip.packing_list)
+        
+        # If no packing list exists, generate a new one
+        weather_data = WeatherService.get_weather_forecast(trip.latitude, trip.longitude)
+        packing_list = generate_packing_list(trip, trip.activities, weather_data)
+        return Response(packing_list)
 
     elif request.method == 'POST':
         try:
             # Get activities from request or trip
-            activities = request.data.get('activities', [])
-            if not activities and trip.activities:
-                activities = json.loads(trip.activities)
+            activities = request.data.get('activities', []) or trip.activities
 
-            packing_list = generate_packing_list(trip, activities)
+            weather_data = WeatherService.get_weather_forecast(trip.latitude, trip.longitude)
+            packing_list = generate_packing_list(trip, activities, weather_data)
             
             # Save the generated packing list
-            trip.packing_list = json.dumps(packing_list)
-            trip.save()
+            trip.packing_list = packing_list
+            trip.save(update_fields=['packing_list', 'updated_at'])
             
             return Response(packing_list)
             
         except Exception as e:
             return Response({'error': str(e)}, status=400)
 
-def generate_packing_list(trip, activities):
-    """Generate a packing list based on trip details and activities"""
+def generate_packing_list(trip, activities, weather_data):
+    """Generate a packing list based on trip details, activities and the trip's forecast"""
     packing_list = []
     
     # Add essential items
@@ -675,9 +811,10 @@ def generate_packing_list(trip, activities):
     
     # Add weather-specific items
     try:
-        weather_data = WeatherService.get_weather_forecast(trip.latitude, trip.longitude)
         if weather_data:
-            avg_temp = calculate_average_temperature(weather_data)
+            avg_temp = calculate_average_temperature(
+                trip_weather(weather_data, trip.travel_start, trip.travel_end)
+            )
             
             if avg_temp > 25:  # Hot weather
                 hot_weather_items = [
@@ -746,19 +883,155 @@ def generate_packing_list(trip, activities):
     
     return unique_packing_list
 
+def trip_weather(weather_data, travel_start, travel_end):
+    """The part of a forecast covering the trip, or the whole forecast if none of it does"""
+    if not weather_data:
+        return weather_data
+    during_trip = weather_data.slice(travel_start, travel_end)
+    return during_trip if len(during_trip) else weather_data
+
 def calculate_average_temperature(weather_data):
-    """Calculate average temperature from weather data"""
+    """Calculate average temperature (°C) from weather data"""
     try:
-        if weather_data and 'daily' in weather_data:
-            max_temps = weather_data['daily']['temperature_2m_max']
-            min_temps = weather_data['daily']['temperature_2m_min']
-            if max_temps and min_temps:
-                avg_temps = [(max_temp + min_temp) / 2 for max_temp, min_temp in zip(max_temps, min_temps)]
-                return sum(avg_temps) / len(avg_temps)
+        if weather_data:
+            avg_temps = (weather_data.column('temperature_2m_max') + weather_data.column('temperature_2m_min')) / 2
+            if not np.isnan(avg_temps).all():
+                return float(np.nanmean(avg_temps))
     except Exception as e:
         print(f"Error calculating average temperature: {e}")
     return 20  # Default temperature if calculation fails
 
+# ——— Trip bundle: everything a trip page needs in one request ———
+BUNDLE_SECTIONS = ('trip', 'weather', 'clothing', 'packing_list', 'travel_tips', 'cultural_insights')
+
+# Forecasts for bundles are fetched here while the request thread queries the database
+_bundle_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='trip-bundle')
+
+def parse_bundle_sections(request):
+    """Sections requested with ?include=weather,clothing,... (default: all); None if any is unknown"""
+    include = request.GET.get('include')
+    if not include:
+        return BUNDLE_SECTIONS
+    sections = tuple(section.strip() for section in include.split(',') if section.strip())
+    if not sections or any(section not in BUNDLE_SECTIONS for section in sections):
+        return None
+    return sections
+
+def bundle_needs_forecast(trip, sections):
+    """Whether any requested section is computed from the trip's forecast"""
+    if not trip.latitude or not trip.longitude:
+        return False
+    return 'weather' in sections or 'clothing' in sections or (
+        'packing_list' in sections and not trip.packing_list
+    )
+
+def fetch_bundle_forecast(trip):
+    """The forecast shared by a bundle's weather, clothing and packing sections"""
+    try:
+        return WeatherService.get_weather_forecast(
+            latitude=trip.latitude,
+            longitude=trip.longitude,
+            days=forecast_days_for_trip(trip),
+            start_date=trip.travel_start
+        )
+    finally:
+        # Runs on a worker thread, and the forecast cache may be database-backed
+        connection.close()
+
+def bundle_database_sections(trip, traveler_type, sections):
+    """Bundle sections that only need the database, plus any errors"""
+    bundle, errors = {}, {}
+    if 'trip' in sections:
+        bundle['trip'] = TripSerializer(trip).data
+    if 'packing_list' in sections and trip.packing_list:
+        bundle['packing_list'] = trip.packing_list
+    if 'travel_tips' in sections:
+        bundle['travel_tips'] = travel_tips_for_trip(trip, traveler_type)
+    if 'cultural_insights' in sections:
+        bundle['cultural_insights'] = cultural_insights_for_trip(trip, traveler_type)
+    return bundle, errors
+
+def bundle_forecast_sections(trip, traveler_type, sections, weather_data, temperature_unit):
+    """Bundle sections computed from the trip's forecast, plus any errors"""
+    bundle, errors = {}, {}
+    if weather_data is None and ('weather' in sections or 'clothing' in sections):
+        errors['weather'] = (
+            'Unable to fetch weather data at this time.' if trip.latitude and trip.longitude
+            else 'No location coordinates available for this destination.'
+        )
+    if 'weather' in sections:
+        bundle['weather'] = trip_forecast_json(weather_data.in_unit(temperature_unit), trip) if weather_data else None
+    if 'clothing' in sections:
+        is_business = traveler_type == 'business'
+        bundle['clothing'] = {
+            'traveler_type': 'business' if is_business else 'casual',
+            'recommendations': WeatherService.get_clothing_recommendations(weather_data, is_business)
+        }
+    if 'packing_list' in sections and not trip.packing_list:
+        bundle['packing_list'] = generate_packing_list(trip, trip.activities, weather_data)
+    return bundle, errors
+
+def build_trip_bundle(sections, database_part, forecast_part):
+    """Combine the two halves of a bundle, keeping the requested section order"""
+    parts = {**database_part[0], **forecast_part[0]}
+    bundle = {section: parts[section] for section in sections}
+    errors = {**database_part[1], **forecast_part[1]}
+    if errors:
+        bundle['errors'] = errors
+    return bundle
+
+def trip_bundle_versions(request, trip_id):
+    """ETag and Last-Modified of a bundle, combining those of its sections"""
+    sections = parse_bundle_sections(request)
+    if sections is None:
+        return None
+    validators = [trip_versions]
+    if {'weather', 'clothing', 'packing_list'} & set(sections):
+        validators.append(trip_weather_versions)
+    if 'travel_tips' in sections:
+        validators.append(trip_travel_tips_versions)
+    if 'cultural_insights' in sections:
+        validators.append(trip_cultural_insights_versions)
+    
+    versions = []
+    for validator in validators:
+        version = validator(request, trip_id)
+        if version is None:
+            return None
+        versions.append(version)
+    etag = make_etag('bundle', ','.join(sections), request.user.profile.traveler_type,
+                     *(etag for etag, _ in versions))
+    return etag, max(last_modified for _, last_modified in versions)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional(trip_bundle_versions)
+def trip_bundle(request, trip_id):
+    """
+    Get several sections of a trip page in one request
+
+    ?include= selects sections from BUNDLE_SECTIONS (default: all) and
+    ?unit= the temperature unit. The trip is loaded once and its forecast
+    fetched once, concurrently with the database queries; sections that
+    could not be computed are null and explained under "errors".
+    """
+    sections = parse_bundle_sections(request)
+    if sections is None:
+        return Response(
+            {"error": f"include must list sections from: {', '.join(BUNDLE_SECTIONS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    trip = get_object_or_404(Trip, id=trip_id, user=request.user)
+    traveler_type = request.user.profile.traveler_type
+    
+    forecast = _bundle_executor.submit(fetch_bundle_forecast, trip) if bundle_needs_forecast(trip, sections) else None
+    database_part = bundle_database_sections(trip, traveler_type, sections)
+    weather_data = forecast.result() if forecast else None
+    forecast_part = bundle_forecast_sections(
+        trip, traveler_type, sections, weather_data, parse_temperature_unit(request)
+    )
+    return Response(build_trip_bundle(sections, database_part, forecast_part))
+
 # Predefined activity recommendations based on destination types
 ACTIVITY_RECOMMENDATIONS = {
     'beach': {
@@ -1021,122 +1294,97 @@ ACTIVITY_BASED_RECOMMENDATIONS = {
     }
 }
 
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def ai_trip_recommendations(request):
-    """Get personalized AI-powered trip recommendations"""
-    try:
-        trip_data = request.data
-        destination = trip_data.get('destination')
-        traveler_type = trip_data.get('traveler_type', 'casual')
-        activities = trip_data.get('activities', [])
+# Hugging Face's free inference API, used for additional personalized suggestions
+AI_INFERENCE_URL = "https://api-inference.huggingface.co/models/gpt2"
+AI_INFERENCE_HEADERS = {"Authorization": "Bearer hf_public"}
 
-        # Get activity-specific recommendations
-        activity_recommendations = []
-        for activity in activities:
-            if activity in ACTIVITY_BASED_RECOMMENDATIONS:
-                activity_recommendations.extend(
-                    ACTIVITY_BASED_RECOMMENDATIONS[activity]['activities']
-                )
-
-        # Use Hugging Face's free inference API for additional personalized recommendations
-        API_URL = "https://api-inference.huggingface.co/models/gpt2"
-        headers = {"Authorization": "Bearer hf_public"}
-
-        prompt = f"""Based on these planned activities: {', '.join(activities)},
+# Prompt and fallback table for each kind of AI suggestion; the kinds match the
+# keys of ACTIVITY_BASED_RECOMMENDATIONS
+AI_SUGGESTIONS = {
+    'activities': {
+        'prompt': """Based on these planned activities: {activities},
         suggest 5 unique and personalized activities for a {traveler_type} traveler in {destination}.
         Consider the traveler type and make the suggestions specific to their interests.
-        Format as a numbered list."""
+        Format as a numbered list.""",
+        'fallback': ACTIVITY_RECOMMENDATIONS,
+    },
+    'packing': {
+        'prompt': """Based on these planned activities: {activities},
+        suggest 5 essential packing items for a {traveler_type} traveler going to {destination}.
+        Consider the specific activities and make the suggestions relevant to their needs.
+        Format as a numbered list.""",
+        'fallback': PACKING_SUGGESTIONS,
+    },
+    'tips': {
+        'prompt': """Based on these planned activities: {activities},
+        provide 5 helpful travel tips for a {traveler_type} traveler visiting {destination}.
+        Consider the specific activities and make the tips relevant to their needs.
+        Format as a numbered list.""",
+        'fallback': TRAVEL_TIPS,
+    },
+}
 
-        response = requests.post(API_URL, headers=headers, json={"inputs": prompt})
-        ai_recommendations = response.json()[0]['generated_text'].split('\n')[:5]
-        
-        # Combine activity-specific and AI-generated recommendations
-        all_recommendations = list(set(activity_recommendations + ai_recommendations))
-        return Response(all_recommendations[:5])
+def ai_suggestions_request(trip_data, kind):
+    """
+    Prepare an AI suggestion request
+    
+    Returns:
+        tuple: (activity-specific suggestions, JSON payload for the inference API)
+    """
+    traveler_type = trip_data.get('traveler_type', 'casual')
+    activities = trip_data.get('activities', [])
+    
+    # Get activity-specific suggestions
+    activity_suggestions = []
+    for activity in activities:
+        if activity in ACTIVITY_BASED_RECOMMENDATIONS:
+            activity_suggestions.extend(
+                ACTIVITY_BASED_RECOMMENDATIONS[activity][kind]
+            )
+    
+    prompt = AI_SUGGESTIONS[kind]['prompt'].format(
+        activities=', '.join(activities),
+        traveler_type=traveler_type,
+        destination=trip_data.get('destination')
+    )
+    return activity_suggestions, {"inputs": prompt}
+
+def combine_ai_suggestions(activity_suggestions, response_data):
+    """Combine activity-specific and AI-generated suggestions"""
+    ai_suggestions = response_data[0]['generated_text'].split('\n')[:5]
+    return list(set(activity_suggestions + ai_suggestions))[:5]
+
+def fallback_ai_suggestions(trip_data, kind):
+    """Predefined suggestions for when the inference API is unavailable"""
+    dest_type = get_destination_type(trip_data.get('destination'))
+    traveler_type = trip_data.get('traveler_type', 'casual')
+    return AI_SUGGESTIONS[kind]['fallback'].get(dest_type, {}).get(traveler_type, [])
 
+def get_ai_suggestions(trip_data, kind):
+    """Get personalized suggestions of one kind, falling back to the predefined tables"""
+    try:
+        activity_suggestions, payload = ai_suggestions_request(trip_data, kind)
+        response = get_client('huggingface').post(
+            AI_INFERENCE_URL, headers=AI_INFERENCE_HEADERS, json=payload
+        )
+        return combine_ai_suggestions(activity_suggestions, response.json())
     except Exception as e:
-        # Fallback to predefined recommendations
-        dest_type = get_destination_type(destination)
-        recommendations = ACTIVITY_RECOMMENDATIONS.get(dest_type, {}).get(traveler_type, [])
-        return Response(recommendations)
+        return fallback_ai_suggestions(trip_data, kind)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def ai_trip_recommendations(request):
+    """Get personalized AI-powered trip recommendations"""
+    return Response(get_ai_suggestions(request.data, 'activities'))
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def ai_packing_suggestions(request):
     """Get personalized AI-powered packing suggestions"""
-    try:
-        trip_data = request.data
-        destination = trip_data.get('destination')
-        traveler_type = trip_data.get('traveler_type', 'casual')
-        activities = trip_data.get('activities', [])
-
-        # Get activity-specific packing suggestions
-        activity_packing = []
-        for activity in activities:
-            if activity in ACTIVITY_BASED_RECOMMENDATIONS:
-                activity_packing.extend(
-                    ACTIVITY_BASED_RECOMMENDATIONS[activity]['packing']
-                )
-
-        # Use Hugging Face's free inference API for additional personalized suggestions
-        API_URL = "https://api-inference.huggingface.co/models/gpt2"
-        headers = {"Authorization": "Bearer hf_public"}
-
-        prompt = f"""Based on these planned activities: {', '.join(activities)},
-        suggest 5 essential packing items for a {traveler_type} traveler going to {destination}.
-        Consider the specific activities and make the suggestions relevant to their needs.
-        Format as a numbered list."""
-
-        response = requests.post(API_URL, headers=headers, json={"inputs": prompt})
-        ai_suggestions = response.json()[0]['generated_text'].split('\n')[:5]
-        
-        # Combine activity-specific and AI-generated suggestions
-        all_suggestions = list(set(activity_packing + ai_suggestions))
-        return Response(all_suggestions[:5])
-
-    except Exception as e:
-        # Fallback to predefined suggestions
-        dest_type = get_destination_type(destination)
-        suggestions = PACKING_SUGGESTIONS.get(dest_type, {}).get(traveler_type, [])
-        return Response(suggestions)
+    return Response(get_ai_suggestions(request.data, 'packing'))
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def ai_travel_tips(request):
     """Get personalized AI-powered travel tips"""
-    try:
-        trip_data = request.data
-        destination = trip_data.get('destination')
-        traveler_type = trip_data.get('traveler_type', 'casual')
-        activities = trip_data.get('activities', [])
-
-        # Get activity-specific tips
-        activity_tips = []
-        for activity in activities:
-            if activity in ACTIVITY_BASED_RECOMMENDATIONS:
-                activity_tips.extend(
-                    ACTIVITY_BASED_RECOMMENDATIONS[activity]['tips']
-                )
-
-        # Use Hugging Face's free inference API for additional personalized tips
-        API_URL = "https://api-inference.huggingface.co/models/gpt2"
-        headers = {"Authorization": "Bearer hf_public"}
-
-        prompt = f"""Based on these planned activities: {', '.join(activities)},
-        provide 5 helpful travel tips for a {traveler_type} traveler visiting {destination}.
-        Consider the specific activities and make the tips relevant to their needs.
-        Format as a numbered list."""
-
-        response = requests.post(API_URL, headers=headers, json={"inputs": prompt})
-        ai_tips = response.json()[0]['generated_text'].split('\n')[:5]
-        
-        # Combine activity-specific and AI-generated tips
-        all_tips = list(set(activity_tips + ai_tips))
-        return Response(all_tips[:5])
-
-    except Exception as e:
-        # Fallback to predefined tips
-        dest_type = get_destination_type(destination)
-        tips = TRAVEL_TIPS.get(dest_type, {}).get(traveler_type, [])
-        return Response(tips)
+    return Response(get_ai_suggestions(request.data, 'tips'))
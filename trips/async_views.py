@@ -0,0 +1,257 @@
+# trips/async_views.py
+"""
+Async versions of the endpoints that spend most of their time waiting on
+upstream APIs (weather, trip bundles, city search and the AI suggestions).
+
+They are routed instead of their synchronous counterparts when
+settings.ASYNC_UPSTREAM_VIEWS is enabled, so that under an ASGI server a
+single worker can keep many upstream requests in flight at once.
+"""
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .api_views import AI_INFERENCE_HEADERS, AI_INFERENCE_URL, BUNDLE_SECTIONS, ai_suggestions_request, \
+    bundle_database_sections, bundle_forecast_sections, bundle_needs_forecast, build_trip_bundle, \
+    combine_ai_suggestions, fallback_ai_suggestions, parse_bundle_sections, trip_bundle_versions
+from .conditional import conditional
+from .models import Profile, Trip
+from .services.geocoding_service import GeocodingService
+from .services.http_client import get_async_client
+from .services.weather_service import WeatherService
+from .views import forecast_days_for_trip, parse_search_limit, parse_temperature_unit, trip_forecast_json, \
+    trip_weather_versions
+
+
+def _error_response(exc, request):
+    response = JsonResponse({'detail': exc.detail}, status=exc.status_code)
+    if exc.status_code == status.HTTP_401_UNAUTHORIZED and request.authenticators:
+        # Same challenge header DRF sends for unauthenticated requests
+        response['WWW-Authenticate'] = request.authenticators[0].authenticate_header(request)
+    return response
+
+
+def _authenticate(request, require_auth):
+    """Run DRF authentication and body parsing, which may touch the database"""
+    if require_auth and not request.user.is_authenticated:
+        raise NotAuthenticated()
+    if request.method == 'POST':
+        request.data
+
+
+def async_api_view(methods, require_auth=True):
+    """
+    Async stand-in for @api_view and @permission_classes, which only support
+    synchronous views
+
+    Authenticates with REST_FRAMEWORK's DEFAULT_AUTHENTICATION_CLASSES and
+    passes the view a DRF Request; errors use DRF's {"detail": ...} shape.
+    """
+    def decorator(view):
+        @csrf_exempt
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return JsonResponse(
+                    {'detail': f'Method "{request.method}" not allowed.'},
+                    status=status.HTTP_405_METHOD_NOT_ALLOWED
+                )
+
+            drf_request = Request(
+                request,
+                parsers=[JSONParser(), FormParser(), MultiPartParser()],
+                authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+            )
+            try:
+                await sync_to_async(_authenticate)(drf_request, require_auth)
+            except APIException as e:
+                return _error_response(e, drf_request)
+
+            return await view(drf_request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def _get_trip(request, trip_id):
+    try:
+        return await Trip.objects.aget(pk=trip_id, user=request.user)
+    except Trip.DoesNotExist:
+        return None
+
+
+@async_api_view(['GET'])
+@conditional(trip_weather_versions)
+async def trip_weather_forecast(request, trip_id):
+    """Get weather forecast for a specific trip"""
+    trip = await _get_trip(request, trip_id)
+    if trip is None:
+        return JsonResponse({"error": "Trip not found or unauthorized."}, status=status.HTTP_404_NOT_FOUND)
+
+    # Check if we have lat/long for the destination
+    if not trip.latitude or not trip.longitude:
+        return JsonResponse(
+            {"error": "No location coordinates available for this destination."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Get weather data from Open-Meteo
+    weather_data = await WeatherService.aget_weather_forecast(
+        latitude=trip.latitude,
+        longitude=trip.longitude,
+        days=forecast_days_for_trip(trip),
+        start_date=trip.travel_start
+    )
+
+    if not weather_data:
+        return JsonResponse(
+            {"error": "Unable to fetch weather data at this time."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    # Return the weather data in the requested unit (Fahrenheit by default),
+    # highlighting which days are part of the trip
+    weather_data = weather_data.in_unit(parse_temperature_unit(request))
+    return JsonResponse(trip_forecast_json(weather_data, trip))
+
+
+@async_api_view(['GET'])
+async def trip_clothing_recommendations(request, trip_id):
+    """Get clothing recommendations based on weather and traveler type"""
+    trip = await _get_trip(request, trip_id)
+    if trip is None:
+        return JsonResponse({"error": "Trip not found or unauthorized."}, status=status.HTTP_404_NOT_FOUND)
+
+    # Check if we have lat/long for the destination
+    if not trip.latitude or not trip.longitude:
+        return JsonResponse(
+            {"error": "No location coordinates available for this destination."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Get user's traveler type, defaulting to casual traveler if no profile
+    profile = await Profile.objects.filter(user=request.user).afirst()
+    is_business = profile is not None and profile.traveler_type == 'business'
+
+    # Get weather data
+    weather_data = await WeatherService.aget_weather_forecast(
+        latitude=trip.latitude,
+        longitude=trip.longitude,
+        start_date=trip.travel_start
+    )
+
+    if not weather_data:
+        return JsonResponse(
+            {"error": "Unable to fetch weather data at this time."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    # Generate clothing recommendations
+    recommendations = WeatherService.get_clothing_recommendations(
+        weather_data=weather_data,
+        is_business=is_business
+    )
+
+    # Update the trip's stored clothing recommendations if they changed
+    await trip.asave_recommendations({**trip.recommendations_data(), 'clothing': recommendations})
+
+    return JsonResponse({
+        "traveler_type": "business" if is_business else "casual",
+        "recommendations": recommendations
+    })
+
+
+@async_api_view(['GET'], require_auth=False)  # Allow any user to search cities
+async def search_cities(request):
+    """
+    Search for cities using the local gazetteer index, falling back to the
+    Open-Meteo geocoding API
+    """
+    query = request.GET.get('q', '')
+    if not query or len(query) < 2:
+        return JsonResponse(
+            {"error": "Please provide a search query with at least 2 characters."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    cities = await GeocodingService.asearch_cities(query, parse_search_limit(request))
+
+    return JsonResponse({
+        "query": query,
+        "count": len(cities),
+        "cities": cities
+    })
+
+
+@async_api_view(['GET'])
+@conditional(trip_bundle_versions)
+async def trip_bundle(request, trip_id):
+    """Get several sections of a trip page in one request (see api_views.trip_bundle)"""
+    sections = parse_bundle_sections(request)
+    if sections is None:
+        return JsonResponse(
+            {"error": f"include must list sections from: {', '.join(BUNDLE_SECTIONS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    trip = await _get_trip(request, trip_id)
+    if trip is None:
+        return JsonResponse({"error": "Trip not found or unauthorized."}, status=status.HTTP_404_NOT_FOUND)
+    profile = await Profile.objects.filter(user=request.user).afirst()
+    traveler_type = profile.traveler_type if profile is not None else 'casual'
+
+    async def forecast():
+        if not bundle_needs_forecast(trip, sections):
+            return None
+        return await WeatherService.aget_weather_forecast(
+            latitude=trip.latitude,
+            longitude=trip.longitude,
+            days=forecast_days_for_trip(trip),
+            start_date=trip.travel_start
+        )
+
+    # The forecast is fetched while the database sections are built
+    database_part, weather_data = await asyncio.gather(
+        sync_to_async(bundle_database_sections)(trip, traveler_type, sections),
+        forecast()
+    )
+    forecast_part = bundle_forecast_sections(
+        trip, traveler_type, sections, weather_data, parse_temperature_unit(request)
+    )
+    return JsonResponse(build_trip_bundle(sections, database_part, forecast_part))
+
+
+async def _get_ai_suggestions(trip_data, kind):
+    """Async version of api_views.get_ai_suggestions"""
+    try:
+        activity_suggestions, payload = ai_suggestions_request(trip_data, kind)
+        response = await get_async_client('huggingface').post(
+            AI_INFERENCE_URL, headers=AI_INFERENCE_HEADERS, json=payload
+        )
+        return combine_ai_suggestions(activity_suggestions, response.json())
+    except Exception as e:
+        return fallback_ai_suggestions(trip_data, kind)
+
+
+@async_api_view(['POST'])
+async def ai_trip_recommendations(request):
+    """Get personalized AI-powered trip recommendations"""
+    return JsonResponse(await _get_ai_suggestions(request.data, 'activities'), safe=False)
+
+
+@async_api_view(['POST'])
+async def ai_packing_suggestions(request):
+    """Get personalized AI-powered packing suggestions"""
+    return JsonResponse(await _get_ai_suggestions(request.data, 'packing'), safe=False)
+
+
+@async_api_view(['POST'])
+async def ai_travel_tips(request):
+    """Get personalized AI-powered travel tips"""
+    return JsonResponse(await _get_ai_suggestions(request.data, 'tips'), safe=False)
@@ -0,0 +1,78 @@
+# trips/conditional.py
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from functools import wraps
+import hashlib
+
+
+def make_etag(*parts):
+    """Strong ETag for the values identifying one version of a response"""
+    digest = hashlib.blake2b(':'.join(str(part) for part in parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional(validators):
+    """
+    Conditional GET for a view: answer 304 Not Modified before the view runs
+
+    validators(request, *args, **kwargs) is called with the view's arguments
+    and returns (etag, last_modified) for the current version of the
+    response, either of which may be None, or None if the resource cannot be
+    versioned cheaply. It must not do more work than a small query; the point
+    is to skip loading and serializing the response.
+
+    A response whose validators were unknown before the view ran is sent
+    without ETag or Last-Modified: recomputing them afterwards could describe
+    a newer version than the body, e.g. a forecast refreshed in between.
+
+    Apply it below @api_view (or async_api_view) so requests are authenticated
+    first. Responses are marked private and must be revalidated, so browsers
+    always ask and mostly get an empty 304 back.
+    """
+    def check(request, versions):
+        etag, last_modified = versions or (None, None)
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None
+        )
+
+    def finish(request, response, versions):
+        # A 304 carries the same validators and caching rules as the 200 it stands for
+        if response.status_code not in (200, 304):
+            return response
+        etag, last_modified = versions or (None, None)
+        if etag:
+            response.headers.setdefault('ETag', etag)
+        if last_modified and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view(request, *args, **kwargs)
+                versions = await sync_to_async(validators)(request, *args, **kwargs)
+                response = check(request, versions)
+                if response is not None:
+                    return finish(request, response, versions)
+                response = await view(request, *args, **kwargs)
+                return finish(request, response, versions)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            versions = validators(request, *args, **kwargs)
+            response = check(request, versions)
+            if response is not None:
+                return finish(request, response, versions)
+            response = view(request, *args, **kwargs)
+            return finish(request, response, versions)
+        return wrapper
+    return decorator
@@ -0,0 +1,87 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from trips.models import CulturalInsight, Trip, TravelTip
+import re
+
+# Plan lines showing a query no longer uses its index: a full table scan or an extra sort
+REGRESSIONS = {
+    'sqlite': re.compile(r'\bSCAN\b|USE TEMP B-TREE'),
+    'postgresql': re.compile(r'Seq Scan|\bSort\b'),
+}
+
+def hot_queries():
+    """
+    The lookups behind the trip list and trip pages, built as the views
+    build them, with the index each should use (a tuple when any of several
+    will do, None for primary key lookups); parameter values don't matter
+    for the plan
+    """
+    return [
+        ('trip list', Trip.objects.filter(user_id=1).order_by('id'), 'trip_user_id_idx'),
+        ('trip dashboard', Trip.objects.filter(user_id=1).order_by('travel_start', 'travel_end'), 'trip_user_dates_idx'),
+        ('trip version', Trip.objects.filter(pk=1, user_id=1).values_list('updated_at', flat=True), None),
+        ('upcoming trips', Trip.objects.filter(
+            user_id=1, travel_end__gte=date.today(), latitude__isnull=False, longitude__isnull=False
+        ).only('id', 'latitude', 'longitude'), ('trip_user_dates_idx', 'trip_user_id_idx')),
+        ('cultural insights', CulturalInsight.objects.filter(country_code='FR', traveler_type='casual'),
+         'insight_country_type_idx'),
+        ('cultural insight list', CulturalInsight.objects.filter(destination='Paris, France', traveler_type='casual'),
+         'insight_dest_type_idx'),
+        ('travel tips', TravelTip.objects.filter(country_code='FR', traveler_type='casual'),
+         'tip_country_type_category_idx'),
+        ('travel tip list', TravelTip.objects.filter(
+            destination_normalized=TravelTip.normalize_destination('France'), traveler_type='casual', category='safety'
+        ), 'tip_dest_type_category_idx'),
+    ]
+
+def explain(queryset):
+    """The query plan of queryset, asking PostgreSQL whether an index could be used at all"""
+    if connection.vendor != 'postgresql':
+        return queryset.explain()
+    # Small tables are cheaper to scan, which would hide a missing index
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+def index_names(index):
+    """Acceptable index names of a hot query, see hot_queries()"""
+    if index is None:
+        return ()
+    return (index,) if isinstance(index, str) else index
+
+def uses_index(plan, index):
+    """Whether a plan avoids full scans and sorts and, if given, uses index"""
+    names = index_names(index)
+    return not REGRESSIONS[connection.vendor].search(plan) and (not names or any(name in plan for name in names))
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the hot trip, cultural insight and travel tip queries and fail if any of '
+        'them stops using its index or regresses to a full table scan or a sort, e.g. after '
+        'an index is dropped. '
+        'Supports SQLite and PostgreSQL; run it after migrating.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true',
+                            help='Print the plan of every query, not only of regressed ones')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in REGRESSIONS:
+            raise CommandError(f'Query plans of the {connection.vendor} backend are not supported')
+
+        regressed = []
+        for name, queryset, index in hot_queries():
+            plan = explain(queryset)
+            ok = uses_index(plan, index)
+            if not ok:
+                regressed.append(name)
+            self.stdout.write(f"{'ok  ' if ok else 'SCAN'} {name}")
+            if options['verbose_plans'] or not ok:
+                self.stdout.write('\n'.join(f'     {line}' for line in plan.splitlines()))
+
+        if regressed:
+            raise CommandError(f"{len(regressed)} queries no longer use their indexes: {', '.join(regressed)}")
+        self.stdout.write(self.style.SUCCESS('All hot queries use their indexes.'))
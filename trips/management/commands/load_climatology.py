@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from trips.services.climatology import VARIABLES, write_climatology
+import csv
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('latitude', 'longitude', 'month') + VARIABLES
+
+class Command(BaseCommand):
+    help = 'Build the local climatology table used for trips beyond the forecast horizon'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help=f"CSV (or .parquet) file of monthly normals with columns: {', '.join(COLUMNS)}; "
+                 "temperatures in °C, precipitation in mm per day"
+        )
+        parser.add_argument('--grid-degrees', type=float, default=0.5,
+                            help='Size of the climatology grid cells (default: 0.5)')
+        parser.add_argument('--output', default=None,
+                            help='File to write (default: settings.CLIMATOLOGY_PATH)')
+
+    def handle(self, *args, **options):
+        output = options['output'] or settings.CLIMATOLOGY_PATH
+        if options['grid_degrees'] <= 0:
+            raise CommandError('--grid-degrees must be positive')
+
+        started = time.monotonic()
+        if options['path'].endswith('.parquet'):
+            rows, skipped = self.read_parquet(options['path'])
+        else:
+            rows, skipped = self.read_csv(options['path'])
+
+        if not rows:
+            raise CommandError(f"No climatology rows found in {options['path']}")
+
+        count = write_climatology(rows, output, options['grid_degrees'])
+        elapsed = time.monotonic() - started
+        logger.info(f"Wrote climatology {output} with {count} cells")
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {len(rows)} rows into {count} cells ({skipped} rows skipped) in {output} in {elapsed:.1f}s"
+        ))
+
+    def read_csv(self, path):
+        rows = []
+        skipped = 0
+        try:
+            with open(path, encoding='utf-8', newline='') as f:
+                reader = csv.DictReader(f)
+                self.check_columns(reader.fieldnames or [], path)
+                for record in reader:
+                    row = self.parse_row([record[column] for column in COLUMNS])
+                    if row is None:
+                        skipped += 1
+                        continue
+                    rows.append(row)
+        except OSError as e:
+            raise CommandError(f"Unable to read {path}: {e}")
+        return rows, skipped
+
+    def read_parquet(self, path):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise CommandError('Reading Parquet files requires pyarrow; convert the file to CSV instead')
+        try:
+            table = pq.read_table(path)
+        except OSError as e:
+            raise CommandError(f"Unable to read {path}: {e}")
+        self.check_columns(table.column_names, path)
+
+        columns = [table.column(column).to_pylist() for column in COLUMNS]
+        rows = []
+        skipped = 0
+        for values in zip(*columns):
+            row = self.parse_row(values)
+            if row is None:
+                skipped += 1
+                continue
+            rows.append(row)
+        return rows, skipped
+
+    def check_columns(self, names, path):
+        missing = [column for column in COLUMNS if column not in names]
+        if missing:
+            raise CommandError(f"{path} is missing columns: {', '.join(missing)}")
+
+    def parse_row(self, values):
+        """Parse one row, leaving empty normals as NaN; None if the row is unusable"""
+        try:
+            latitude, longitude, month = float(values[0]), float(values[1]), int(values[2])
+            normals = [float(value) if value not in (None, '') else float('nan') for value in values[3:]]
+        except (TypeError, ValueError):
+            return None
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180 and 1 <= month <= 12):
+            return None
+        return [latitude, longitude, month] + normals
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from trips.services.gazetteer import write_index
+import csv
+import logging
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# Column positions in a GeoNames "cities" dump (e.g. cities15000.txt)
+NAME, ASCII_NAME, LATITUDE, LONGITUDE = 1, 2, 4, 5
+FEATURE_CLASS, COUNTRY_CODE, ADMIN1_CODE, POPULATION = 6, 8, 10, 14
+
+class Command(BaseCommand):
+    help = 'Build the local city search index from a GeoNames-style gazetteer dump'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Tab-separated GeoNames cities file')
+        parser.add_argument('--admin1-codes', help='GeoNames admin1CodesASCII.txt for region names')
+        parser.add_argument('--country-info', help='GeoNames countryInfo.txt for country names')
+        parser.add_argument('--min-population', type=int, default=0,
+                            help='Skip places with a smaller population')
+        parser.add_argument('--output', default=None,
+                            help='Index file to write (default: settings.GAZETTEER_INDEX_PATH)')
+
+    def handle(self, *args, **options):
+        output = options['output'] or settings.GAZETTEER_INDEX_PATH
+        admin1_names = self.read_lookup(options['admin1_codes'], key_column=0, value_column=1)
+        country_names = self.read_lookup(options['country_info'], key_column=0, value_column=4)
+
+        started = time.monotonic()
+        cities = []
+        skipped = 0
+        csv.field_size_limit(sys.maxsize)  # alternatenames can be very long
+        try:
+            with open(options['path'], encoding='utf-8', newline='') as f:
+                for row in csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+                    city = self.parse_row(row, admin1_names, country_names, options['min_population'])
+                    if city is None:
+                        skipped += 1
+                        continue
+                    cities.append(city)
+        except OSError as e:
+            raise CommandError(f"Unable to read {options['path']}: {e}")
+
+        if not cities:
+            raise CommandError(f"No cities found in {options['path']}")
+
+        count = write_index(cities, output)
+        elapsed = time.monotonic() - started
+        logger.info(f"Wrote gazetteer index {output} with {count} cities")
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count} cities ({skipped} rows skipped) into {output} in {elapsed:.1f}s"
+        ))
+
+    def parse_row(self, row, admin1_names, country_names, min_population):
+        if len(row) <= POPULATION or row[FEATURE_CLASS] != 'P':
+            return None
+        try:
+            latitude = float(row[LATITUDE])
+            longitude = float(row[LONGITUDE])
+            population = int(row[POPULATION] or 0)
+        except ValueError:
+            return None
+        if population < min_population:
+            return None
+
+        country_code = row[COUNTRY_CODE]
+        return {
+            'name': row[NAME],
+            'ascii_name': row[ASCII_NAME],
+            'admin1': admin1_names.get(f"{country_code}.{row[ADMIN1_CODE]}", ''),
+            'country': country_names.get(country_code, country_code),
+            'latitude': latitude,
+            'longitude': longitude,
+            'population': population,
+        }
+
+    def read_lookup(self, path, key_column, value_column):
+        """Read a GeoNames code -> name side table, ignoring '#' comment lines"""
+        if not path:
+            return {}
+        lookup = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith('#'):
+                        continue
+                    columns = line.rstrip('\n').split('\t')
+                    if len(columns) > max(key_column, value_column):
+                        lookup[columns[key_column]] = columns[value_column]
+        except OSError as e:
+            raise CommandError(f"Unable to read {path}: {e}")
+        return lookup
@@ -1,36 +1,177 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from django.core.management.base import BaseCommand
-from trips.models import Trip
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from trips.models import CulturalInsight, Trip, TravelTip
+from trips.services.countries import country_code_for_name
+from trips.services.gazetteer import normalize_key
+from trips.services.geocoding_cache import GeocodingCache
 from trips.services.geocoding_service import GeocodingService
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 class Command(BaseCommand):
-    help = 'Update coordinates for trips that are missing them'
+    help = (
+        'Update coordinates and the resolved city, region, country and ISO country code for '
+        'trips that are missing them, then set the country code of cultural insights and '
+        'travel tips. Each distinct destination is geocoded once and results are written in '
+        'batches, so an interrupted run can simply be started again to pick up the remaining trips.'
+    )
 
     def add_arguments(self, parser):
         parser.add_argument('--trip-id', type=int, help='Update coordinates for a specific trip')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Number of destinations geocoded concurrently (default: 4)')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Number of trips written per bulk update (default: 500)')
 
     def handle(self, *args, **options):
         trip_id = options.get('trip_id')
-        
+        workers = max(1, options['workers'])
+        batch_size = max(1, options['batch_size'])
+
         if trip_id:
             trips = Trip.objects.filter(id=trip_id)
         else:
-            trips = Trip.objects.filter(latitude__isnull=True, longitude__isnull=True)
-        
-        for trip in trips:
-            if not trip.destination:
-                logger.warning(f"Trip {trip.id} has no destination set")
+            trips = Trip.objects.filter(Q(latitude__isnull=True, longitude__isnull=True) | Q(country_code=''))
+
+        # Group trips by destination so each name is only geocoded once
+        trips_by_destination = {}
+        for trip_pk, destination, latitude, longitude in trips.order_by('id').values_list(
+            'id', 'destination', 'latitude', 'longitude'
+        ):
+            if not destination:
+                logger.warning(f"Trip {trip_pk} has no destination set")
                 continue
-                
-            logger.info(f"Updating coordinates for trip {trip.id} with destination {trip.destination}")
-            latitude, longitude = GeocodingService.get_coordinates(trip.destination)
-            
-            if latitude is not None and longitude is not None:
-                trip.latitude = latitude
-                trip.longitude = longitude
-                trip.save()
-                logger.info(f"Updated coordinates for trip {trip.id}: {latitude}, {longitude}")
-            else:
-                logger.error(f"Failed to get coordinates for trip {trip.id}") 
\ No newline at end of file
+            key = GeocodingCache.normalize(destination)
+            trips_by_destination.setdefault(key, (destination, []))[1].append((trip_pk, latitude, longitude))
+
+        total_names = len(trips_by_destination)
+        total_trips = sum(len(trip_rows) for _, trip_rows in trips_by_destination.values())
+        if not total_names:
+            self.stdout.write("No trips need coordinates.")
+        else:
+            self.stdout.write(f"Geocoding {total_names} destinations for {total_trips} trips with {workers} workers")
+            if not self.update_trips(trips_by_destination, workers, batch_size):
+                return
+
+        if not trip_id:
+            self.update_content_country_codes()
+
+    def update_trips(self, trips_by_destination, workers, batch_size):
+        """Geocode and write the trips; returns False if interrupted"""
+        total_names = len(trips_by_destination)
+        started = time.monotonic()
+        pending = []
+        done_names = updated = failed = 0
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                executor.submit(self.geocode, destination): trip_rows
+                for destination, trip_rows in trips_by_destination.values()
+            }
+            for future in as_completed(futures):
+                trip_rows = futures[future]
+                destination, place = future.result()
+                done_names += 1
+
+                if place.found:
+                    updated_at = timezone.now()  # bulk_update skips auto_now
+                    pending.extend(
+                        Trip(
+                            id=pk,
+                            # Keep coordinates picked in the city search
+                            latitude=place.latitude if latitude is None else latitude,
+                            longitude=place.longitude if longitude is None else longitude,
+                            city=place.city,
+                            admin1=place.admin1,
+                            country=place.country,
+                            country_code=place.country_code,
+                            updated_at=updated_at
+                        )
+                        for pk, latitude, longitude in trip_rows
+                    )
+                else:
+                    failed += len(trip_rows)
+                    trip_ids = [pk for pk, _, _ in trip_rows]
+                    logger.error(f"Failed to get coordinates for {destination} (trips {trip_ids})")
+
+                if len(pending) >= batch_size:
+                    updated += self.flush(pending, batch_size)
+                    self.report(done_names, total_names, updated, failed, started)
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            updated += self.flush(pending, batch_size)
+            self.stdout.write(self.style.WARNING(
+                f"Interrupted after updating {updated} trips; run the command again to resume."
+            ))
+            return False
+        finally:
+            executor.shutdown(wait=True)
+
+        updated += self.flush(pending, batch_size)
+        self.report(done_names, total_names, updated, failed, started)
+        self.stdout.write(self.style.SUCCESS(f"Updated coordinates for {updated} trips ({failed} failed)"))
+        return True
+
+    def update_content_country_codes(self):
+        """
+        Set the country code of cultural insights and travel tips from their
+        destination: a country name already resolved for some trip, a known
+        alias, or else a geocoder lookup of the whole destination
+        """
+        resolved = Trip.objects.exclude(country_code='').exclude(country='')
+        known = {
+            normalize_key(country): country_code
+            for country, country_code in resolved.values_list('country', 'country_code').distinct()
+        }
+        updated = failed = 0
+        for model in (CulturalInsight, TravelTip):
+            rows_by_destination = {}
+            for pk, destination in model.objects.filter(country_code='').exclude(destination='').values_list('id', 'destination'):
+                rows_by_destination.setdefault(destination, []).append(pk)
+
+            for destination, pks in rows_by_destination.items():
+                country = destination.split(',')[-1]
+                country_code = known.get(normalize_key(country)) or country_code_for_name(country)
+                if not country_code:
+                    country_code = GeocodingService.get_place(destination).country_code
+                if not country_code:
+                    failed += len(pks)
+                    logger.error(f"No country found for {model.__name__} destination {destination} (rows {pks})")
+                    continue
+                # update() skips auto_now, but the rows now match other trips
+                updated += model.objects.filter(id__in=pks).update(country_code=country_code, updated_at=timezone.now())
+
+        if updated or failed:
+            self.stdout.write(self.style.SUCCESS(
+                f"Set the country of {updated} cultural insights and travel tips ({failed} failed)"
+            ))
+
+    def geocode(self, destination):
+        try:
+            return destination, GeocodingService.get_place(destination)
+        finally:
+            # Worker threads get their own connection from the cache lookups
+            connection.close()
+
+    def flush(self, pending, batch_size):
+        if not pending:
+            return 0
+        count = len(pending)
+        Trip.objects.bulk_update(
+            pending, ['latitude', 'longitude', *Trip.PLACE_FIELDS, 'updated_at'], batch_size=batch_size
+        )
+        pending.clear()
+        return count
+
+    def report(self, done_names, total_names, updated, failed, started):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(
+            f"{done_names}/{total_names} destinations geocoded, {updated} trips updated, "
+            f"{failed} failed ({done_names / elapsed:.1f} destinations/s)"
+        )
@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from trips.models import Trip
+from trips.services.weather_service import WeatherService
+from trips.views import forecast_days_for_trip
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DAYS = 7  # Forecast length of the clothing and upcoming-trips endpoints
+
+class Command(BaseCommand):
+    help = (
+        'Prefetch forecasts for trips starting within the next few days, so the first '
+        'view of a trip is served from the cache. Trips are deduplicated by grid cell and '
+        'only missing or stale forecasts are fetched, in rate-limited batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=WeatherService.MAX_FORECAST_DAYS,
+                            help='Warm trips starting within this many days (default: %(default)s)')
+        parser.add_argument('--batch-size', type=int, default=WeatherService.BATCH_SIZE,
+                            help='Grid cells per upstream request (default: %(default)s)')
+        parser.add_argument('--pause', type=float, default=1.0,
+                            help='Seconds to wait between batches (default: %(default)s)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running, warming the cache every --interval seconds')
+        parser.add_argument('--interval', type=int, default=15 * 60,
+                            help='Seconds between runs with --loop (default: %(default)s)')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['batch_size'] < 1 or options['interval'] < 1:
+            raise CommandError('--days must not be negative, --batch-size and --interval must be positive')
+
+        try:
+            while True:
+                close_old_connections()
+                self.run(options['days'], options['batch_size'], options['pause'])
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Stopped."))
+
+    def run(self, days, batch_size, pause):
+        started = time.monotonic()
+        wanted = self.wanted_forecasts(days)
+
+        keys = fresh = fetched = failed = batches = 0
+        upstream_seconds = 0.0
+        for forecast_days, cells in wanted.items():
+            stale = []
+            for cell in sorted(cells):
+                keys += 1
+                fetched_at = WeatherService.cache.fetched_at(
+                    WeatherService.cache.key(*cell, forecast_days)
+                )
+                if fetched_at is not None and not WeatherService.cache.is_stale(fetched_at):
+                    fresh += 1
+                else:
+                    stale.append(cell)
+
+            for start in range(0, len(stale), batch_size):
+                if batches:
+                    time.sleep(pause)  # Rate limit towards Open-Meteo
+                batches += 1
+                batch = stale[start:start + batch_size]
+                request_started = time.monotonic()
+                count = len(WeatherService.refresh_forecasts(batch, forecast_days))
+                upstream_seconds += time.monotonic() - request_started
+                fetched += count
+                failed += len(batch) - count
+
+        elapsed = time.monotonic() - started
+        hit_ratio = fresh / keys if keys else 1.0
+        message = (
+            f"Warmed {keys} forecasts for trips starting within {days} days: {fresh} already fresh, "
+            f"{fetched} fetched, {failed} failed; hit ratio {hit_ratio:.0%}, "
+            f"{upstream_seconds:.1f}s upstream, {elapsed:.1f}s total"
+        )
+        logger.info(message)
+        self.stdout.write(self.style.SUCCESS(message) if not failed else self.style.WARNING(message))
+
+    def wanted_forecasts(self, days):
+        """Grid cells to warm for each forecast length the trip views will ask for"""
+        today = date.today()
+        trips = Trip.objects.filter(
+            travel_start__lte=today + timedelta(days=days),
+            travel_end__gte=today,
+            latitude__isnull=False,
+            longitude__isnull=False
+        ).only('latitude', 'longitude', 'travel_start', 'travel_end')
+
+        wanted = {}
+        for trip in trips.iterator():
+            cell = WeatherService.cache.cell(trip.latitude, trip.longitude)
+            trip_days = min(WeatherService.MAX_FORECAST_DAYS, forecast_days_for_trip(trip))
+            for forecast_days in {trip_days, DEFAULT_DAYS}:
+                wanted.setdefault(forecast_days, set()).add(cell)
+        return wanted
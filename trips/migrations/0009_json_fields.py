@@ -0,0 +1,151 @@
+# Generated by Django 5.2 on 2026-10-18 11:02
+
+import ast
+import json
+
+from django.db import migrations, models
+
+# Columns that held JSON in text fields, with the value to use when a row's text cannot be read
+JSON_COLUMNS = {
+    'trip': {
+        'activities': list,
+        'packing_list': list,
+        'meeting_schedule': list,
+        'recommendations': dict,
+        'cultural_insights': dict,
+        'travel_tips': dict,
+        'calendar_integration': dict,
+    },
+    'profile': {
+        'preferences': dict,
+        'calendar_integration': dict,
+    },
+    'activity': {
+        'packing_requirements': list,
+        'weather_considerations': dict,
+    },
+    'packingitem': {
+        'weather_conditions': list,
+    },
+}
+
+
+def parse_legacy_json(text, kind):
+    """
+    Value stored in a legacy JSON text column, or an empty kind() if it is
+    not a kind at all. Some rows were JSON-encoded twice (activities saved
+    as '"[2,4]"') and some were written with str() (Python dict reprs).
+    """
+    value = text
+    for _ in range(3):
+        if not isinstance(value, str):
+            break
+        try:
+            value = json.loads(value)
+        except ValueError:
+            try:
+                value = ast.literal_eval(value)
+            except (ValueError, SyntaxError, MemoryError, RecursionError):
+                return kind()
+    return value if isinstance(value, kind) else kind()
+
+
+def clean_json_columns(apps, schema_editor):
+    """Rewrite every row as plain JSON so the columns can be cast to JSON"""
+    for model_name, columns in JSON_COLUMNS.items():
+        model = apps.get_model('trips', model_name)
+        rows = model.objects.values_list('pk', *columns).order_by('pk')
+        for pk, *texts in rows.iterator():
+            changes = {}
+            for (column, kind), text in zip(columns.items(), texts):
+                cleaned = json.dumps(parse_legacy_json(text, kind))
+                if cleaned != text:
+                    changes[column] = cleaned
+            if changes:
+                model.objects.filter(pk=pk).update(**changes)
+
+
+def create_activity_index(apps, schema_editor):
+    """GIN index serving the ?activity= containment filter; PostgreSQL only"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS trips_trip_activities_gin '
+            'ON trips_trip USING gin (activities jsonb_path_ops)'
+        )
+
+
+def drop_activity_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS trips_trip_activities_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trips', '0008_trip_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(clean_json_columns, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='activity',
+            name='packing_requirements',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AlterField(
+            model_name='activity',
+            name='weather_considerations',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AlterField(
+            model_name='packingitem',
+            name='weather_conditions',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='calendar_integration',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='preferences',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='activities',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='calendar_integration',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='cultural_insights',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='meeting_schedule',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='packing_list',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='recommendations',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='travel_tips',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(create_activity_index, drop_activity_index),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+def fill_destination_normalized(apps, schema_editor):
+    TravelTip = apps.get_model('trips', 'TravelTip')
+    tips = list(TravelTip.objects.only('destination'))
+    for tip in tips:
+        # Same as TravelTip.normalize_destination(), which historical models lack
+        tip.destination_normalized = tip.destination.strip().lower()
+    TravelTip.objects.bulk_update(tips, ['destination_normalized'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trips', '0009_json_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='traveltip',
+            name='destination_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_destination_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='culturalinsight',
+            index=models.Index(fields=['destination', 'traveler_type'], name='insight_dest_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='traveltip',
+            index=models.Index(fields=['destination_normalized', 'traveler_type', 'category'], name='tip_dest_type_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['user', 'travel_start', 'travel_end'], name='trip_user_dates_idx'),
+        ),
+    ]
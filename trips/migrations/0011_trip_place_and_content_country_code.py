@@ -0,0 +1,93 @@
+# Generated by Django 5.2 on 2026-10-18 13:25
+
+from django.db import migrations, models
+
+from trips.services.countries import country_code_for_name
+
+
+def clear_geocoding_cache(apps, schema_editor):
+    # Cached results have no city or country; drop them so they are looked up again
+    apps.get_model('trips', 'GeocodingCacheEntry').objects.all().delete()
+
+
+def fill_content_country_codes(apps, schema_editor):
+    # Same as CulturalInsight.save() and TravelTip.save(), which historical models lack;
+    # destinations without a known country name are left to update_trip_coordinates
+    for model_name in ('CulturalInsight', 'TravelTip'):
+        model = apps.get_model('trips', model_name)
+        rows = []
+        for row in model.objects.only('destination'):
+            row.country_code = country_code_for_name(row.destination.split(',')[-1])
+            if row.country_code:
+                rows.append(row)
+        model.objects.bulk_update(rows, ['country_code'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trips', '0010_indexes_and_traveltip_destination_normalized'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trip',
+            name='city',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='admin1',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='country',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='country_code',
+            field=models.CharField(blank=True, max_length=2),
+        ),
+        migrations.AddField(
+            model_name='geocodingcacheentry',
+            name='city',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='geocodingcacheentry',
+            name='admin1',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='geocodingcacheentry',
+            name='country',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='geocodingcacheentry',
+            name='country_code',
+            field=models.CharField(blank=True, max_length=2),
+        ),
+        migrations.AddField(
+            model_name='culturalinsight',
+            name='country_code',
+            field=models.CharField(blank=True, max_length=2),
+        ),
+        migrations.AddField(
+            model_name='traveltip',
+            name='country_code',
+            field=models.CharField(blank=True, max_length=2),
+        ),
+        migrations.RunPython(clear_geocoding_cache, migrations.RunPython.noop),
+        migrations.RunPython(fill_content_country_codes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='culturalinsight',
+            index=models.Index(fields=['country_code', 'traveler_type'], name='insight_country_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='traveltip',
+            index=models.Index(fields=['country_code', 'traveler_type', 'category'], name='tip_country_type_category_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trips', '0011_trip_place_and_content_country_code'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['user', 'id'], name='trip_user_id_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 # trips/models.py
 from django.db import models
 from django.contrib.auth.models import User
+from .services.countries import country_code_for_name
+import json
 
 # Existing Trip model...
 class Trip(models.Model):
@@ -8,26 +10,70 @@ class Trip(models.Model):
         ('casual', 'Casual Traveler'),
         ('business', 'Business Traveler'),
     )
+    # Resolved from the geocoder when the destination is saved
+    PLACE_FIELDS = ('city', 'admin1', 'country', 'country_code')
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='trips')
     destination = models.CharField(max_length=255)
     latitude = models.FloatField(null=True, blank=True)  # Added for weather forecasting
     longitude = models.FloatField(null=True, blank=True)  # Added for weather forecasting
+    city = models.CharField(max_length=255, blank=True)
+    admin1 = models.CharField(max_length=255, blank=True)  # State/province
+    country = models.CharField(max_length=255, blank=True)
+    country_code = models.CharField(max_length=2, blank=True)  # ISO 3166-1 alpha-2, keys content lookups
     travel_start = models.DateField()
     travel_end = models.DateField()
     traveler_type = models.CharField(max_length=10, choices=TRAVELER_TYPES, default='casual')
-    activities = models.TextField(blank=True, default='[]')  # Store activities as JSON string
-    packing_list = models.TextField(blank=True, default='[]')  # Store packing list as JSON string
+    activities = models.JSONField(blank=True, default=list)  # Activity names or ids
+    packing_list = models.JSONField(blank=True, default=list)
     created_at = models.DateTimeField(auto_now_add=True)
-    meeting_schedule = models.TextField(blank=True, default='[]')  # Store meeting schedule as JSON string
-    recommendations = models.TextField(blank=True, default='{}')  # Store AI-generated recommendations as JSON string
-    cultural_insights = models.TextField(blank=True, default='{}')  # Store cultural insights as JSON string
-    travel_tips = models.TextField(blank=True, default='{}')  # Store travel tips as JSON string
-    calendar_integration = models.TextField(blank=True, default='{}')  # Store calendar integration data as JSON string
+    updated_at = models.DateTimeField(auto_now=True)  # Version of the trip for conditional requests
+    meeting_schedule = models.JSONField(blank=True, default=list)
+    recommendations = models.JSONField(blank=True, default=dict)  # AI-generated and clothing recommendations
+    cultural_insights = models.JSONField(blank=True, default=dict)
+    travel_tips = models.JSONField(blank=True, default=dict)
+    calendar_integration = models.JSONField(blank=True, default=dict)  # Calendar integration data
+
+    class Meta:
+        indexes = [
+            # Trips are listed per user: in travel date order on the dashboard page
+            models.Index(fields=['user', 'travel_start', 'travel_end'], name='trip_user_dates_idx'),
+            # and in creation order by the cursor-paginated API, whose position must be unique and immutable
+            models.Index(fields=['user', 'id'], name='trip_user_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.destination} ({self.travel_start} - {self.travel_end})"
 
+    def recommendations_data(self):
+        """Stored recommendations as a dict ({} if there are none)"""
+        return self.recommendations if isinstance(self.recommendations, dict) else {}
+
+    def _set_recommendations(self, recommendations):
+        """Store recommendations; returns whether they differ from what was stored"""
+        # Compare as JSON: tuples come back as lists, and jsonb reorders keys
+        if json.dumps(recommendations, sort_keys=True) == json.dumps(self.recommendations, sort_keys=True):
+            return False
+        self.recommendations = recommendations
+        return True
+
+    def save_recommendations(self, recommendations):
+        """
+        Store recommendations computed on a read, writing only the changed
+        column and only when they changed, so repeat views don't write the row
+        """
+        if not self._set_recommendations(recommendations):
+            return False
+        self.save(update_fields=['recommendations', 'updated_at'])
+        return True
+
+    async def asave_recommendations(self, recommendations):
+        """Async version of save_recommendations()"""
+        if not self._set_recommendations(recommendations):
+            return False
+        await self.asave(update_fields=['recommendations', 'updated_at'])
+        return True
+
 # New Models for Key Features and User Stories:
 class KeyFeature(models.Model):
     title = models.CharField(max_length=200)
@@ -67,8 +113,8 @@ class Profile(models.Model):
     
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     traveler_type = models.CharField(max_length=10, choices=TRAVELER_TYPES)
-    preferences = models.TextField(default='{}')  # Store user preferences as JSON string
-    calendar_integration = models.TextField(default='{}')  # Store calendar integration settings as JSON string
+    preferences = models.JSONField(default=dict)  # User preferences
+    calendar_integration = models.JSONField(default=dict)  # Calendar integration settings
 
     def __str__(self):
         return f"{self.user.username} - {self.get_traveler_type_display()}"
@@ -76,8 +122,8 @@ class Profile(models.Model):
 class Activity(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField()
-    packing_requirements = models.TextField(default='[]')  # Items needed for this activity as JSON string
-    weather_considerations = models.TextField(default='{}')  # Weather-related considerations as JSON string
+    packing_requirements = models.JSONField(default=list)  # Items needed for this activity
+    weather_considerations = models.JSONField(default=dict)  # Weather-related considerations
 
     def __str__(self):
         return self.name
@@ -96,7 +142,7 @@ class PackingItem(models.Model):
     category = models.CharField(max_length=20, choices=CATEGORIES)
     description = models.TextField(blank=True)
     is_essential = models.BooleanField(default=False)
-    weather_conditions = models.TextField(default='[]')  # Weather conditions this item is needed for as JSON string
+    weather_conditions = models.JSONField(default=list)  # Weather conditions this item is needed for
     activity_requirements = models.ManyToManyField(Activity, blank=True)
 
     def __str__(self):
@@ -108,10 +154,26 @@ class CulturalInsight(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     traveler_type = models.CharField(max_length=10, choices=Trip.TRAVELER_TYPES)
+    country_code = models.CharField(max_length=2, blank=True)  # ISO 3166-1 alpha-2 of the destination
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['destination', 'traveler_type'], name='insight_dest_type_idx'),
+            models.Index(fields=['country_code', 'traveler_type'], name='insight_country_type_idx'),
+        ]
 
     def __str__(self):
         return f"{self.destination} - {self.title}"
 
+    def save(self, *args, **kwargs):
+        # Known country names win; other destinations keep a code set by hand or by update_trip_coordinates
+        self.country_code = country_code_for_name(self.destination.split(',')[-1]) or self.country_code
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'destination' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'country_code'}
+        super().save(*args, **kwargs)
+
 class TravelTip(models.Model):
     CATEGORIES = (
         ('general', 'General'),
@@ -126,8 +188,44 @@ class TravelTip(models.Model):
     description = models.TextField()
     traveler_type = models.CharField(max_length=10, choices=Trip.TRAVELER_TYPES)
     destination = models.CharField(max_length=255, blank=True)
+    destination_normalized = models.CharField(max_length=255, blank=True, editable=False)  # Kept in sync by save()
+    country_code = models.CharField(max_length=2, blank=True)  # ISO 3166-1 alpha-2 of the destination
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Tips are listed case-insensitively by destination, then traveler type and category
+            models.Index(fields=['destination_normalized', 'traveler_type', 'category'], name='tip_dest_type_category_idx'),
+            # and looked up for trips by country
+            models.Index(fields=['country_code', 'traveler_type', 'category'], name='tip_country_type_category_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_category_display()} - {self.title}"
 
+    @staticmethod
+    def normalize_destination(destination):
+        """Lookup form of a destination, so a case-insensitive match is an index seek"""
+        return destination.strip().lower()
+
+    def save(self, *args, **kwargs):
+        self.destination_normalized = self.normalize_destination(self.destination)
+        # Known country names win; other destinations keep a code set by hand or by update_trip_coordinates
+        self.country_code = country_code_for_name(self.destination.split(',')[-1]) or self.country_code
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'destination' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'destination_normalized', 'country_code'}
+        super().save(*args, **kwargs)
+
+class GeocodingCacheEntry(models.Model):
+    query = models.CharField(max_length=255, unique=True)  # Normalized location name
+    latitude = models.FloatField(null=True, blank=True)  # Null for cached misses
+    longitude = models.FloatField(null=True, blank=True)
+    city = models.CharField(max_length=255, blank=True)
+    admin1 = models.CharField(max_length=255, blank=True)
+    country = models.CharField(max_length=255, blank=True)
+    country_code = models.CharField(max_length=2, blank=True)
+    fetched_at = models.DateTimeField()
 
+    def __str__(self):
+        return f"{self.query} ({self.latitude}, {self.longitude})"
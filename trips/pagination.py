@@ -0,0 +1,28 @@
+# trips/pagination.py
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class ListCursorPagination(CursorPagination):
+    """
+    Cursor pagination for list endpoints that set it as their pagination_class
+
+    Pages are ordered by `ordering`, which must match an index of the listed
+    table so each page is an index range scan however deep the cursor is.
+    CursorPagination positions on the first ordering field only, so that field
+    must be unique and immutable, or edits made while a client is paging
+    make it skip or repeat rows.
+    ?page_size= picks the page size (default settings.API_PAGE_SIZE, capped at
+    settings.MAX_PAGE_SIZE) and ?all=1 returns the whole list unpaginated, as
+    the endpoint did before.
+    """
+
+    ordering = ('id',)
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get('all') in ('1', 'true'):
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -1,6 +1,33 @@
 from rest_framework import serializers
 from .models import Trip, KeyFeature, UserStory, Activity, PackingItem, CulturalInsight, TravelTip, Profile
-import json
+
+def requested_field_names(request, param):
+    return [name.strip() for name in request.query_params.get(param, '').split(',') if name.strip()]
+
+class SparseFieldsMixin:
+    """
+    Lets GET requests choose the fields of the response: ?fields=id,destination
+    keeps only the listed fields and ?omit=packing_list drops the listed ones
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return
+
+        fields, omit = requested_field_names(request, 'fields'), requested_field_names(request, 'omit')
+        unknown = [name for name in fields + omit if name not in self.fields]
+        if unknown:
+            raise serializers.ValidationError({'fields': [f"Unknown field(s): {', '.join(unknown)}"]})
+        for name in list(self.fields):
+            if (fields and name not in fields) or name in omit:
+                self.fields.pop(name)
+
+    def model_fields(self):
+        """Model columns the remaining fields read, for .only()"""
+        concrete = {field.name for field in self.Meta.model._meta.concrete_fields}
+        return [field.source for field in self.fields.values() if field.source in concrete]
 
 class ActivitySerializer(serializers.ModelSerializer):
     class Meta:
@@ -8,17 +35,14 @@ class ActivitySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'packing_requirements', 'weather_considerations']
 
     def to_representation(self, instance):
-        data = super().to_representation(instance)
-        data['packing_requirements'] = json.loads(instance.packing_requirements)
-        data['weather_considerations'] = json.loads(instance.weather_considerations)
-        return data
-
-    def to_internal_value(self, data):
-        if 'packing_requirements' in data:
-            data['packing_requirements'] = json.dumps(data['packing_requirements'])
-        if 'weather_considerations' in data:
-            data['weather_considerations'] = json.dumps(data['weather_considerations'])
-        return super().to_internal_value(data)
+        # Activities are shared by many packing items; views that list them put an
+        # 'activity_representations' dict in the context to serialize each one once
+        representations = self.context.get('activity_representations')
+        if representations is None:
+            return super().to_representation(instance)
+        if instance.pk not in representations:
+            representations[instance.pk] = super().to_representation(instance)
+        return representations[instance.pk]
 
 class PackingItemSerializer(serializers.ModelSerializer):
     activity_requirements = ActivitySerializer(many=True, read_only=True)
@@ -27,45 +51,22 @@ class PackingItemSerializer(serializers.ModelSerializer):
         model = PackingItem
         fields = ['id', 'name', 'category', 'description', 'is_essential', 'weather_conditions', 'activity_requirements']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        data['weather_conditions'] = json.loads(instance.weather_conditions)
-        return data
-
-    def to_internal_value(self, data):
-        if 'weather_conditions' in data:
-            data['weather_conditions'] = json.dumps(data['weather_conditions'])
-        return super().to_internal_value(data)
-
 class CulturalInsightSerializer(serializers.ModelSerializer):
     class Meta:
         model = CulturalInsight
-        fields = ['id', 'destination', 'category', 'title', 'description', 'traveler_type']
+        fields = ['id', 'destination', 'country_code', 'category', 'title', 'description', 'traveler_type']
 
 class TravelTipSerializer(serializers.ModelSerializer):
     class Meta:
         model = TravelTip
-        fields = ['id', 'category', 'title', 'description', 'traveler_type', 'destination']
+        fields = ['id', 'category', 'title', 'description', 'traveler_type', 'destination', 'country_code']
 
 class ProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = Profile
         fields = ['id', 'user', 'traveler_type', 'preferences', 'calendar_integration']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        data['preferences'] = json.loads(instance.preferences)
-        data['calendar_integration'] = json.loads(instance.calendar_integration)
-        return data
-
-    def to_internal_value(self, data):
-        if 'preferences' in data:
-            data['preferences'] = json.dumps(data['preferences'])
-        if 'calendar_integration' in data:
-            data['calendar_integration'] = json.dumps(data['calendar_integration'])
-        return super().to_internal_value(data)
-
-class TripSerializer(serializers.ModelSerializer):
+class TripSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Trip
         fields = [
@@ -73,6 +74,10 @@ class TripSerializer(serializers.ModelSerializer):
             'destination', 
             'latitude', 
             'longitude',
+            'city',
+            'admin1',
+            'country',
+            'country_code',
             'travel_start', 
             'travel_end',
             'traveler_type',
@@ -85,63 +90,19 @@ class TripSerializer(serializers.ModelSerializer):
             'calendar_integration',
             'created_at'
         ]
-        read_only_fields = ['user', 'created_at']
+        read_only_fields = ['user', 'created_at', 'city', 'admin1', 'country', 'country_code']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        try:
-            data['activities'] = json.loads(instance.activities) if instance.activities else []
-        except json.JSONDecodeError:
-            data['activities'] = []
-            
-        try:
-            data['packing_list'] = json.loads(instance.packing_list) if instance.packing_list else []
-        except json.JSONDecodeError:
-            data['packing_list'] = []
-            
-        try:
-            data['meeting_schedule'] = json.loads(instance.meeting_schedule) if instance.meeting_schedule else []
-        except json.JSONDecodeError:
-            data['meeting_schedule'] = []
-            
-        try:
-            data['recommendations'] = json.loads(instance.recommendations) if instance.recommendations else {}
-        except json.JSONDecodeError:
-            data['recommendations'] = {}
-            
-        try:
-            data['cultural_insights'] = json.loads(instance.cultural_insights) if instance.cultural_insights else {}
-        except json.JSONDecodeError:
-            data['cultural_insights'] = {}
-            
-        try:
-            data['travel_tips'] = json.loads(instance.travel_tips) if instance.travel_tips else {}
-        except json.JSONDecodeError:
-            data['travel_tips'] = {}
-            
-        try:
-            data['calendar_integration'] = json.loads(instance.calendar_integration) if instance.calendar_integration else {}
-        except json.JSONDecodeError:
-            data['calendar_integration'] = {}
-            
-        return data
-
-    def to_internal_value(self, data):
-        if 'activities' in data:
-            data['activities'] = json.dumps(data['activities'])
-        if 'packing_list' in data:
-            data['packing_list'] = json.dumps(data['packing_list'])
-        if 'meeting_schedule' in data:
-            data['meeting_schedule'] = json.dumps(data['meeting_schedule'])
-        if 'recommendations' in data:
-            data['recommendations'] = json.dumps(data['recommendations'])
-        if 'cultural_insights' in data:
-            data['cultural_insights'] = json.dumps(data['cultural_insights'])
-        if 'travel_tips' in data:
-            data['travel_tips'] = json.dumps(data['travel_tips'])
-        if 'calendar_integration' in data:
-            data['calendar_integration'] = json.dumps(data['calendar_integration'])
-        return super().to_internal_value(data)
+    def validate_meeting_schedule(self, value):
+        # A JSON-encoded string here would be stored as a string, not as meetings
+        if not isinstance(value, list) or not all(isinstance(meeting, dict) for meeting in value):
+            raise serializers.ValidationError('Expected a list of meetings.')
+        return value
+
+class TripSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    # What trip lists need to show a trip; the JSON columns are not loaded at all
+    class Meta:
+        model = Trip
+        fields = ['id', 'destination', 'travel_start', 'travel_end', 'traveler_type']
 
 class UserStorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,160 @@
+import logging
+import os
+import threading
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Monthly normals stored per cell, in this order
+VARIABLES = (
+    'temperature_max',  # Mean daily maximum, °C
+    'temperature_min',  # Mean daily minimum, °C
+    'precipitation_probability',  # Chance of a wet day, %
+    'precipitation_sum',  # Mean daily precipitation, mm
+)
+VERSION = 1
+LONGITUDE_OFFSET = 1 << 24  # Keeps packed cell keys positive for any grid size
+
+# Approximate day of year (0-based) of the middle of each month
+_MONTH_LENGTHS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+_MID_MONTH = np.cumsum(_MONTH_LENGTHS) - _MONTH_LENGTHS / 2
+
+
+def _cell_keys(latitudes, longitudes, grid_degrees):
+    """Pack grid cell indexes into sortable int64 keys"""
+    latitude_index = np.rint(np.asarray(latitudes, dtype=np.float64) / grid_degrees).astype(np.int64)
+    longitude_index = np.rint(np.asarray(longitudes, dtype=np.float64) / grid_degrees).astype(np.int64)
+    return (latitude_index << 32) + longitude_index + LONGITUDE_OFFSET
+
+
+def write_climatology(rows, path, grid_degrees):
+    """
+    Build a climatology file from monthly normals
+
+    Rows falling into the same grid cell and month are averaged. Months
+    missing for a cell are filled with the mean of the cell's other months.
+
+    Args:
+        rows (array-like): (latitude, longitude, month, *VARIABLES) rows,
+                           with months numbered 1-12
+        path (str): Destination .npz file, replaced atomically
+        grid_degrees (float): Size of the grid cells
+
+    Returns:
+        int: Number of cells written
+    """
+    rows = np.asarray(rows, dtype=np.float64).reshape(-1, 3 + len(VARIABLES))
+    keys = _cell_keys(rows[:, 0], rows[:, 1], grid_degrees)
+    months = rows[:, 2].astype(np.int64) - 1
+    values = rows[:, 3:]
+
+    cell_keys, cells = np.unique(keys, return_inverse=True)
+    sums = np.zeros((len(cell_keys), 12, len(VARIABLES)))
+    counts = np.zeros((len(cell_keys), 12, len(VARIABLES)))
+    present = ~np.isnan(values)
+    np.add.at(sums, (cells, months), np.where(present, values, 0))
+    np.add.at(counts, (cells, months), present)
+
+    with np.errstate(invalid='ignore'):
+        normals = sums / counts
+        cell_means = sums.sum(axis=1) / counts.sum(axis=1)
+    normals = np.where(counts > 0, normals, cell_means[:, None, :])
+
+    directory = os.path.dirname(os.fspath(path))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(
+            f,
+            version=np.int32(VERSION),
+            grid_degrees=np.float64(grid_degrees),
+            keys=cell_keys,
+            normals=normals.astype(np.float32),
+        )
+    os.replace(tmp_path, path)
+    return len(cell_keys)
+
+
+class ClimatologyStore:
+    """Read-only monthly climate normals per grid cell, as sorted NumPy arrays"""
+
+    def __init__(self, path):
+        self.mtime = os.stat(path).st_mtime
+        with np.load(path) as data:
+            if int(data['version']) != VERSION:
+                raise ValueError(f"Unsupported climatology version {int(data['version'])}")
+            self.grid_degrees = float(data['grid_degrees'])
+            self._keys = data['keys']
+            self._normals = data['normals']
+
+    def __len__(self):
+        return len(self._keys)
+
+    def monthly(self, latitude, longitude):
+        """
+        Monthly normals for the cell containing a location
+
+        Returns:
+            numpy.ndarray: (12, len(VARIABLES)) array, or None if the cell has no data
+        """
+        key = _cell_keys(latitude, longitude, self.grid_degrees)
+        position = np.searchsorted(self._keys, key)
+        if position == len(self._keys) or self._keys[position] != key:
+            return None
+        return self._normals[position]
+
+    def daily(self, latitude, longitude, dates):
+        """
+        Normals for each of the given days, interpolated between mid-month values
+
+        Args:
+            dates (numpy.ndarray): datetime64[D] dates
+
+        Returns:
+            numpy.ndarray: (len(VARIABLES), len(dates)) array, or None if the cell has no data
+        """
+        monthly = self.monthly(latitude, longitude)
+        if monthly is None:
+            return None
+        day_of_year = (dates - dates.astype('datetime64[Y]')).astype(np.int64)
+        return np.array([
+            np.interp(day_of_year, _MID_MONTH, monthly[:, column], period=365)
+            for column in range(len(VARIABLES))
+        ])
+
+
+_store = None
+_store_mtime = None
+_store_lock = threading.Lock()
+
+
+def get_climatology():
+    """
+    Return the shared climatology store, or None if none has been loaded
+
+    The store is reloaded when the file on disk changes, so re-running
+    load_climatology takes effect without a restart.
+    """
+    global _store, _store_mtime
+    path = getattr(settings, 'CLIMATOLOGY_PATH', None)
+    if not path:
+        return None
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    if _store is not None and mtime == _store_mtime:
+        return _store
+
+    with _store_lock:
+        if _store is None or mtime != _store_mtime:
+            try:
+                _store = ClimatologyStore(path)
+                _store_mtime = mtime
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Unable to open climatology {path}: {str(e)}")
+                return None
+    return _store
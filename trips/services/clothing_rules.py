@@ -0,0 +1,104 @@
+import sys
+
+import numpy as np
+
+# Daily maximum temperature bands, coldest first. A band applies above the
+# previous band's upper bound, up to and including its own (in °C).
+TEMPERATURE_BANDS = (
+    {
+        'upper': 5,
+        'casual': ("Heavy winter coat with layers", "Hat, scarf, and gloves recommended"),
+        'business': ("Heavier business suit with warm overcoat", "Scarf and gloves may be necessary"),
+    },
+    {
+        'upper': 15,
+        'casual': ("Medium-weight jacket and layers", "Long sleeves and pants recommended"),
+        'business': ("Wool or heavier business suit", "Consider a topcoat or trench coat"),
+    },
+    {
+        'upper': 25,
+        'casual': ("Light jacket or sweater with pants", "Layered clothing recommended"),
+        'business': ("Standard business suit or blouse with skirt/trousers", "Light jacket may be needed for morning/evening"),
+    },
+    {
+        'upper': None,
+        'casual': ("Light clothing like t-shirts and shorts", "Breathable fabrics recommended"),
+        'business': ("Light business suit or dress shirt with light trousers", "Consider a lightweight blazer for meetings"),
+    },
+)
+
+# Precipitation probability bands (%), driest first, in the same layout
+RAIN_BANDS = (
+    {
+        'upper': 30,
+        'casual': (),
+        'business': (),
+    },
+    {
+        'upper': 60,
+        'casual': ("Pack a light rain jacket or umbrella just in case",),
+        'business': ("Consider bringing a compact umbrella",),
+    },
+    {
+        'upper': None,
+        'casual': ("Bring a raincoat, umbrella, and waterproof footwear",),
+        'business': ("Bring a formal umbrella and waterproof footwear",),
+    },
+)
+
+TRAVELER_TYPES = ('casual', 'business')
+
+NO_RECOMMENDATIONS = ()  # For days without a temperature
+
+
+def _bounds(bands):
+    return np.array([band['upper'] for band in bands if band['upper'] is not None], dtype=np.float64)
+
+
+def _compile():
+    """
+    Build one shared tuple of recommendations per (traveler type, temperature
+    band, rain band), as object arrays indexed by temperature band * len(RAIN_BANDS)
+    + rain band; the last row holds NO_RECOMMENDATIONS
+    """
+    table = {}
+    for traveler_type in TRAVELER_TYPES:
+        rows = [
+            tuple(sys.intern(text) for text in temperature[traveler_type] + rain[traveler_type])
+            for temperature in TEMPERATURE_BANDS
+            for rain in RAIN_BANDS
+        ]
+        rows.append(NO_RECOMMENDATIONS)
+        table[traveler_type] = np.empty(len(rows), dtype=object)
+        table[traveler_type][:] = rows
+    return table
+
+
+CELSIUS_BOUNDS = _bounds(TEMPERATURE_BANDS)
+FAHRENHEIT_BOUNDS = CELSIUS_BOUNDS * 9 / 5 + 32
+RAIN_BOUNDS = _bounds(RAIN_BANDS)
+RECOMMENDATIONS = _compile()
+
+
+def classify(max_temps, precip_probs, is_fahrenheit=False, is_business=False):
+    """
+    Look up the recommendations for every day of a forecast at once
+
+    Args:
+        max_temps (list): Daily maximum temperatures; None where missing
+        precip_probs (list): Daily precipitation probabilities (%); None where missing
+        is_fahrenheit (bool): Whether max_temps are in Fahrenheit
+        is_business (bool): Whether recommendations are for business travelers
+
+    Returns:
+        list: One shared tuple of recommendations per day
+    """
+    temperatures = np.array(max_temps, dtype=np.float64)
+    rain = np.fmax(np.array(precip_probs, dtype=np.float64), 0)  # Missing counts as dry
+
+    bounds = FAHRENHEIT_BOUNDS if is_fahrenheit else CELSIUS_BOUNDS
+    # side='left' puts values equal to a bound in the lower band
+    rows = np.searchsorted(bounds, temperatures) * len(RAIN_BANDS) + np.searchsorted(RAIN_BOUNDS, rain)
+    rows[np.isnan(temperatures)] = -1
+
+    return RECOMMENDATIONS['business' if is_business else 'casual'][rows].tolist()
@@ -0,0 +1,25 @@
+from .gazetteer import normalize_key
+
+# Free-text country names seen in destinations, for trips whose place has not
+# been resolved by the geocoder yet (see the update_trip_coordinates command)
+COUNTRY_ALIASES = {
+    'australia': 'AU',
+    'brazil': 'BR', 'brasil': 'BR',
+    'china': 'CN',
+    'france': 'FR',
+    'germany': 'DE', 'deutschland': 'DE',
+    'india': 'IN',
+    'italy': 'IT', 'italia': 'IT',
+    'japan': 'JP',
+    'mexico': 'MX',
+    'spain': 'ES', 'espana': 'ES',
+    'united kingdom': 'GB', 'uk': 'GB', 'great britain': 'GB', 'britain': 'GB',
+    'england': 'GB', 'scotland': 'GB', 'wales': 'GB', 'northern ireland': 'GB',
+    'united states': 'US', 'united states of america': 'US', 'usa': 'US', 'america': 'US',
+}
+
+
+def country_code_for_name(name):
+    """ISO 3166-1 alpha-2 code for a country name, or '' if it is not known"""
+    # Two-letter suffixes are not trusted: "Denver, CO" is not in Colombia
+    return COUNTRY_ALIASES.get(normalize_key(name or ''), '')
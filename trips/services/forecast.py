@@ -0,0 +1,172 @@
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+EPOCH = date(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+# Daily variables reported as whole numbers
+INTEGER_VARIABLES = frozenset(['precipitation_probability_max', 'weathercode'])
+JSON_DECIMALS = 2  # Enough for every Open-Meteo daily variable; hides float32 noise
+
+# Forecasts are fetched and cached in one unit and converted for display
+CANONICAL_UNIT = 'celsius'
+TEMPERATURE_SYMBOLS = {'celsius': '°C', 'fahrenheit': '°F'}
+
+# Top-level response fields handled explicitly by Forecast
+_STRUCTURED_FIELDS = frozenset(['latitude', 'longitude', 'daily', 'daily_units', 'current_weather'])
+
+
+def epoch_day(day):
+    """Days since 1970-01-01 for a date"""
+    return day.toordinal() - EPOCH_ORDINAL
+
+
+def convert_temperatures(values, temperature_unit):
+    """Convert temperatures from the other unit to temperature_unit, to one decimal like the API"""
+    if temperature_unit == 'fahrenheit':
+        return np.round(np.multiply(values, 9 / 5) + 32, 1)
+    return np.round(np.subtract(values, 32) * 5 / 9, 1)
+
+
+@lru_cache(maxsize=256)
+def _date_range_strings(first_day, count):
+    """ISO dates of consecutive days; forecasts keep asking for the same few ranges"""
+    return tuple(date.fromordinal(day + EPOCH_ORDINAL).isoformat() for day in range(first_day, first_day + count))
+
+
+class Forecast:
+    """
+    Daily forecast for one location, stored as typed columns
+
+    Days are int32 days since 1970-01-01 and the daily variables are rows of a
+    single float32 array (NaN where the API returned null). Slicing to a date
+    range returns views of the same arrays, so forecasts should be treated as
+    immutable; only `meta` (top-level fields such as "stale" or "source") may
+    be changed on a forecast that is not shared.
+    """
+
+    __slots__ = ('latitude', 'longitude', 'days', 'variables', 'values', 'units', 'current_weather', 'meta')
+
+    def __init__(self, latitude, longitude, days, variables, values, units=None, current_weather=None, meta=None):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.days = days
+        self.variables = tuple(variables)
+        self.values = values
+        self.units = units or {}
+        self.current_weather = current_weather
+        self.meta = meta or {}
+
+    @classmethod
+    def from_api(cls, data):
+        """Build a forecast from an Open-Meteo forecast response"""
+        daily = data.get('daily') or {'time': []}
+        variables = tuple(name for name in daily if name != 'time')
+        values = np.array([daily[name] for name in variables], dtype=np.float32).reshape(len(variables), len(daily['time']))
+        return cls(
+            latitude=data.get('latitude'),
+            longitude=data.get('longitude'),
+            days=np.array(daily['time'], dtype='datetime64[D]').astype(np.int32),
+            variables=variables,
+            values=values,
+            units=data.get('daily_units'),
+            current_weather=data.get('current_weather'),
+            meta={key: value for key, value in data.items() if key not in _STRUCTURED_FIELDS},
+        )
+
+    def __len__(self):
+        return len(self.days)
+
+    def __getstate__(self):
+        # Raw buffers pickle far smaller than numpy arrays do
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['days'] = self.days.tobytes()
+        state['values'] = self.values.tobytes()
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.days = np.frombuffer(self.days, dtype=np.int32)
+        self.values = np.frombuffer(self.values, dtype=np.float32).reshape(len(self.variables), len(self.days))
+
+    def column(self, name):
+        """Values of a daily variable (a float32 view)"""
+        return self.values[self.variables.index(name)]
+
+    @property
+    def is_fahrenheit(self):
+        return self.units.get('temperature_2m_max', '').lower() == '°f'
+
+    @property
+    def temperature_unit(self):
+        return 'fahrenheit' if self.is_fahrenheit else 'celsius'
+
+    def in_unit(self, temperature_unit):
+        """
+        Forecast with its temperatures in temperature_unit ('celsius' or
+        'fahrenheit'); this forecast itself if they already are
+        """
+        if temperature_unit == self.temperature_unit:
+            return self
+
+        symbol = TEMPERATURE_SYMBOLS[self.temperature_unit]
+        rows = [index for index, name in enumerate(self.variables) if self.units.get(name) == symbol]
+        values = self.values.copy()
+        values[rows] = convert_temperatures(values[rows].astype(np.float64), temperature_unit)
+        units = {
+            name: TEMPERATURE_SYMBOLS[temperature_unit] if unit == symbol else unit
+            for name, unit in self.units.items()
+        }
+        current_weather = self.current_weather
+        if current_weather and current_weather.get('temperature') is not None:
+            current_weather = {**current_weather, 'temperature': float(convert_temperatures(current_weather['temperature'], temperature_unit))}
+        return Forecast(
+            self.latitude, self.longitude, self.days, self.variables,
+            values, units, current_weather, dict(self.meta),
+        )
+
+    def date_strings(self):
+        """ISO dates of the forecast days"""
+        if not len(self.days):
+            return []
+        first_day, last_day = int(self.days[0]), int(self.days[-1])
+        if last_day - first_day + 1 == len(self.days):
+            return list(_date_range_strings(first_day, len(self.days)))
+        return np.datetime_as_string(self.days.astype('datetime64[D]')).tolist()
+
+    def between(self, start_date, end_date):
+        """Boolean mask of the days from start_date to end_date inclusive"""
+        return (self.days >= epoch_day(start_date)) & (self.days <= epoch_day(end_date))
+
+    def slice(self, start_date, end_date):
+        """Forecast restricted to the days from start_date to end_date inclusive, sharing this forecast's arrays"""
+        start = int(np.searchsorted(self.days, epoch_day(start_date), side='left'))
+        end = int(np.searchsorted(self.days, epoch_day(end_date), side='right'))
+        return Forecast(
+            self.latitude, self.longitude, self.days[start:end], self.variables,
+            self.values[:, start:end], self.units, self.current_weather, dict(self.meta),
+        )
+
+    def to_json(self):
+        """Open-Meteo-shaped dict for API responses"""
+        daily = {'time': self.date_strings()}
+        for name, column in zip(self.variables, self.values):
+            missing = np.isnan(column)
+            if name in INTEGER_VARIABLES:
+                values = np.rint(np.where(missing, 0, column)).astype(np.int64).tolist()
+            else:
+                values = np.round(column.astype(np.float64), JSON_DECIMALS).tolist()
+            if missing.any():
+                values = [None if is_missing else value for value, is_missing in zip(values, missing.tolist())]
+            daily[name] = values
+
+        data = {'latitude': self.latitude, 'longitude': self.longitude, **self.meta}
+        if self.current_weather is not None:
+            data['current_weather'] = self.current_weather
+        if self.units:
+            data['daily_units'] = self.units
+        data['daily'] = daily
+        return data
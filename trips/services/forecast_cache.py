@@ -0,0 +1,161 @@
+import logging
+import pickle
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FORECAST_CACHE = {
+    'ALIAS': 'forecasts',  # Entry in settings.CACHES holding the forecasts
+    'GRID_DEGREES': 0.1,  # Roughly 11 km, about the resolution of the forecast models
+    'TTL': 60 * 60,  # Open-Meteo refreshes its model runs hourly; older entries are stale
+    'HARD_TTL': 6 * 60 * 60,  # Stale entries are still served (and refreshed) until this age
+}
+
+# Bumped whenever the cached representation changes, so file and database
+# caches never hand old entries to new code (v2: Forecast objects, v3: one
+# entry per location in Celsius)
+KEY_VERSION = 'v3'
+
+
+class ForecastCache:
+    """
+    Cache of Forecasts keyed on a rounded lat/lon grid cell
+
+    Entries live in a Django cache (settings.CACHES[ALIAS]), so the backend can
+    be switched between local memory, files and the database without code
+    changes. Nearby trips round to the same cell and share one upstream fetch.
+
+    Entries are fresh for TTL seconds and then stale, but kept until HARD_TTL
+    so they can be served while a refresh is in progress.
+    """
+
+    def __init__(self, alias=None, grid_degrees=None, ttl=None, hard_ttl=None):
+        config = {**DEFAULT_FORECAST_CACHE, **getattr(settings, 'FORECAST_CACHE', {})}
+        self.alias = alias or config['ALIAS']
+        self.grid_degrees = grid_degrees if grid_degrees is not None else config['GRID_DEGREES']
+        self.ttl = ttl if ttl is not None else config['TTL']
+        self.hard_ttl = max(hard_ttl if hard_ttl is not None else config['HARD_TTL'], self.ttl)
+
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'sets': 0}
+        self._sizes = {}  # key -> (payload bytes, expires_at) for entries written by this process
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def cell(self, latitude, longitude):
+        """Snap coordinates to the center of their grid cell"""
+        grid = self.grid_degrees
+        return round(round(latitude / grid) * grid, 4), round(round(longitude / grid) * grid, 4)
+
+    def key(self, latitude, longitude, days):
+        """Cache key for a forecast; coordinates are snapped to their grid cell"""
+        cell_latitude, cell_longitude = self.cell(latitude, longitude)
+        return f"forecast:{KEY_VERSION}:{cell_latitude:.4f}:{cell_longitude:.4f}:{days}"
+
+    def get(self, key):
+        """
+        Look up a cached forecast
+
+        Returns:
+            tuple: (Forecast, fetched_at timestamp), or None on a miss.
+                   Every call returns a fresh copy of the forecast, which
+                   may be stale (see is_stale).
+        """
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Error reading forecast cache for {key}: {str(e)}")
+            entry = None
+        return self._unpack(entry)
+
+    async def aget(self, key):
+        """Async version of get()"""
+        try:
+            entry = await self.backend.aget(key)
+        except Exception as e:
+            logger.error(f"Error reading forecast cache for {key}: {str(e)}")
+            entry = None
+        return self._unpack(entry)
+
+    def fetched_at(self, key):
+        """
+        Fetch time of a cached forecast, without loading the forecast
+
+        Reads a small entry stored next to the forecast, for conditional
+        requests and freshness checks; it is not counted as a lookup in stats().
+
+        Returns:
+            float: fetched_at timestamp, or None if the forecast is not cached
+        """
+        try:
+            return self.backend.get(self._fetched_at_key(key))
+        except Exception as e:
+            logger.error(f"Error reading forecast cache for {key}: {str(e)}")
+            return None
+
+    def set(self, key, data, fetched_at=None):
+        """Store a Forecast for the cache TTL"""
+        entry = {'data': data, 'fetched_at': fetched_at if fetched_at is not None else time.time()}
+        try:
+            self.backend.set_many({key: entry, self._fetched_at_key(key): entry['fetched_at']}, self.hard_ttl)
+        except Exception as e:
+            logger.error(f"Error writing forecast cache for {key}: {str(e)}")
+            return
+        self._record_size(key, entry)
+
+    async def aset(self, key, data, fetched_at=None):
+        """Async version of set()"""
+        entry = {'data': data, 'fetched_at': fetched_at if fetched_at is not None else time.time()}
+        try:
+            await self.backend.aset_many({key: entry, self._fetched_at_key(key): entry['fetched_at']}, self.hard_ttl)
+        except Exception as e:
+            logger.error(f"Error writing forecast cache for {key}: {str(e)}")
+            return
+        self._record_size(key, entry)
+
+    def age(self, fetched_at):
+        """Seconds since a forecast was fetched"""
+        return max(time.time() - fetched_at, 0)
+
+    def is_stale(self, fetched_at):
+        """Whether a forecast fetched at fetched_at is past the soft TTL and should be refreshed"""
+        return self.age(fetched_at) > self.ttl
+
+    def _fetched_at_key(self, key):
+        return f"{key}:fetched_at"
+
+    def _unpack(self, entry):
+        with self._lock:
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            self._counters['hits'] += 1
+            if self.is_stale(entry['fetched_at']):
+                self._counters['stale_hits'] += 1
+        return entry['data'], entry['fetched_at']
+
+    def _record_size(self, key, entry):
+        size = len(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._counters['sets'] += 1
+            self._sizes[key] = (size, time.monotonic() + self.hard_ttl)
+
+    def stats(self):
+        """Return hit/miss counters and the approximate size of live entries set by this process"""
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, (_, expires_at) in self._sizes.items() if expires_at <= now]:
+                del self._sizes[key]
+            stats = dict(self._counters)
+            stats['entries'] = len(self._sizes)
+            stats['bytes'] = sum(size for size, _ in self._sizes.values())
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        stats['backend'] = self.backend.__class__.__name__
+        return stats
@@ -0,0 +1,286 @@
+import heapq
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import unicodedata
+from array import array
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'TMGZ'
+VERSION = 1
+HEADER = struct.Struct('<4sIIIII')  # magic, version, records, strings, keys, prefixes
+PREFIX_DEPTH = 3  # Prefixes up to this length get a precomputed ranking
+PREFIX_TOP = 50  # Matches kept per precomputed prefix (the search endpoint's max limit)
+
+
+def normalize_key(text):
+    """Lowercase, strip accents and collapse whitespace so 'São Paulo' matches 'sao p'"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.lower().split())
+
+
+def _to_bytes(values):
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pack_strings(strings):
+    offsets = array('I', [0])
+    blob = bytearray()
+    for value in strings:
+        blob += value.encode('utf-8')
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def write_index(cities, path):
+    """
+    Build a gazetteer index file from city records
+
+    Args:
+        cities (iterable): Dicts with name, ascii_name, admin1, country,
+                           latitude, longitude and population
+        path (str): Destination file, replaced atomically
+
+    Returns:
+        int: Number of cities written
+    """
+    # Record ids are population ranks, so "best match" is simply "lowest id"
+    cities = sorted(cities, key=lambda city: (-city['population'], city['name']))
+
+    strings = {}
+
+    def intern(value):
+        return strings.setdefault(value, len(strings))
+
+    latitudes, longitudes, populations = array('f'), array('f'), array('I')
+    names, admin1s, countries = array('I'), array('I'), array('I')
+    keys = set()
+    for record_id, city in enumerate(cities):
+        latitudes.append(city['latitude'])
+        longitudes.append(city['longitude'])
+        populations.append(min(city['population'], 0xFFFFFFFF))
+        names.append(intern(city['name']))
+        admin1s.append(intern(city.get('admin1') or ''))
+        countries.append(intern(city.get('country') or ''))
+        for variant in (city['name'], city.get('ascii_name') or ''):
+            key = normalize_key(variant)
+            if key:
+                keys.add((key.encode('utf-8'), record_id))
+
+    keys = sorted(keys)
+
+    # Precompute rankings for short prefixes, whose ranges are too wide to scan per keystroke
+    prefixes = {}
+    for key, record_id in keys:
+        text = key.decode('utf-8')
+        for length in range(1, min(PREFIX_DEPTH, len(text)) + 1):
+            prefixes.setdefault(text[:length].encode('utf-8'), set()).add(record_id)
+    prefix_keys = sorted(prefixes)
+    prefix_offsets = array('I', [0])
+    prefix_records = array('I')
+    for prefix in prefix_keys:
+        prefix_records.extend(heapq.nsmallest(PREFIX_TOP, prefixes[prefix]))
+        prefix_offsets.append(len(prefix_records))
+
+    string_offsets, string_blob = _pack_strings(list(strings))
+    key_offsets = array('I', [0])
+    key_blob = bytearray()
+    key_records = array('I')
+    for key, record_id in keys:
+        key_blob += key
+        key_offsets.append(len(key_blob))
+        key_records.append(record_id)
+    prefix_key_offsets = array('I', [0])
+    prefix_key_blob = bytearray()
+    for prefix in prefix_keys:
+        prefix_key_blob += prefix
+        prefix_key_offsets.append(len(prefix_key_blob))
+
+    sections = [
+        _to_bytes(latitudes), _to_bytes(longitudes), _to_bytes(populations),
+        _to_bytes(names), _to_bytes(admin1s), _to_bytes(countries),
+        _to_bytes(string_offsets), _to_bytes(key_offsets), _to_bytes(key_records),
+        _to_bytes(prefix_key_offsets), _to_bytes(prefix_offsets), _to_bytes(prefix_records),
+        string_blob, bytes(key_blob), bytes(prefix_key_blob),
+    ]
+
+    directory = os.path.dirname(os.fspath(path))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(cities), len(strings), len(keys), len(prefix_keys)))
+        f.write(struct.pack(f'<{len(sections)}I', *(len(section) for section in sections)))
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, path)
+    return len(cities)
+
+
+class GazetteerIndex:
+    """Read-only, memory-mapped prefix index over a gazetteer, ranked by population"""
+
+    SECTION_COUNT = 15
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, version, self.size, _, _, _ = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} gazetteer index")
+        sizes = struct.unpack_from(f'<{self.SECTION_COUNT}I', view, HEADER.size)
+
+        sections = []
+        position = HEADER.size + 4 * self.SECTION_COUNT
+        for size in sizes:
+            sections.append(view[position:position + size])
+            position += size
+        if position != len(view):
+            raise ValueError(f"{path} is truncated or corrupt ({len(view)} bytes, expected {position})")
+
+        (latitudes, longitudes, populations, names, admin1s, countries,
+         string_offsets, key_offsets, key_records,
+         prefix_key_offsets, prefix_offsets, prefix_records,
+         self._string_blob, self._key_blob, self._prefix_key_blob) = sections
+
+        self._latitudes = latitudes.cast('f')
+        self._longitudes = longitudes.cast('f')
+        self._populations = populations.cast('I')
+        self._names = names.cast('I')
+        self._admin1s = admin1s.cast('I')
+        self._countries = countries.cast('I')
+        self._string_offsets = string_offsets.cast('I')
+        self._key_offsets = key_offsets.cast('I')
+        self._key_records = key_records.cast('I')
+        self._prefix_key_offsets = prefix_key_offsets.cast('I')
+        self._prefix_offsets = prefix_offsets.cast('I')
+        self._prefix_records = prefix_records.cast('I')
+
+    def search(self, query, limit=10):
+        """
+        Find cities whose name starts with the query
+
+        A query such as "Paris, France" matches on "Paris" and keeps only
+        cities whose region or country starts with the remaining parts.
+
+        Args:
+            query (str): Search term for city name
+            limit (int): Maximum number of results to return
+
+        Returns:
+            list: City dictionaries shaped like GeocodingService.search_cities results
+        """
+        parts = [normalize_key(part) for part in query.split(',')]
+        prefix, qualifiers = parts[0], [part for part in parts[1:] if part]
+        if not prefix:
+            return []
+
+        candidate_limit = PREFIX_TOP if qualifiers else limit
+        cities = []
+        for record_id in self._matching_records(prefix.encode('utf-8'), candidate_limit):
+            city = self._city(record_id)
+            if qualifiers and not all(self._qualifies(city, part) for part in qualifiers):
+                continue
+            cities.append(city)
+            if len(cities) >= limit:
+                break
+        return cities
+
+    def _matching_records(self, prefix, limit):
+        if len(prefix.decode('utf-8')) <= PREFIX_DEPTH:
+            position = self._lower_bound(self._prefix_key_blob, self._prefix_key_offsets, prefix)
+            if position < len(self._prefix_key_offsets) - 1 and \
+                    self._key_at(self._prefix_key_blob, self._prefix_key_offsets, position) == prefix:
+                start, end = self._prefix_offsets[position], self._prefix_offsets[position + 1]
+                return self._prefix_records[start:min(end, start + limit)].tolist()
+            return []
+
+        lo = self._lower_bound(self._key_blob, self._key_offsets, prefix)
+        hi = self._lower_bound(self._key_blob, self._key_offsets, prefix + b'\xff')
+        return heapq.nsmallest(limit, set(self._key_records[lo:hi].tolist()))
+
+    @staticmethod
+    def _key_at(blob, offsets, position):
+        return bytes(blob[offsets[position]:offsets[position + 1]])
+
+    def _lower_bound(self, blob, offsets, target):
+        lo, hi = 0, len(offsets) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(blob, offsets, mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _string(self, string_id):
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return bytes(self._string_blob[start:end]).decode('utf-8')
+
+    @staticmethod
+    def _qualifies(city, qualifier):
+        return any(normalize_key(city[field]).startswith(qualifier) for field in ('admin1', 'country'))
+
+    def _city(self, record_id):
+        city = {
+            'name': self._string(self._names[record_id]),
+            'country': self._string(self._countries[record_id]),
+            'admin1': self._string(self._admin1s[record_id]),
+            'latitude': round(self._latitudes[record_id], 4),
+            'longitude': round(self._longitudes[record_id], 4),
+        }
+        display_parts = [city['name']]
+        if city['admin1']:
+            display_parts.append(city['admin1'])
+        if city['country']:
+            display_parts.append(city['country'])
+        city['display_name'] = ', '.join(display_parts)
+        return city
+
+
+_index = None
+_index_mtime = None
+_index_lock = threading.Lock()
+
+
+def get_gazetteer():
+    """
+    Return the shared gazetteer index, or None if no index has been loaded
+
+    The index is reopened when the file on disk changes, so re-running
+    load_gazetteer takes effect without a restart.
+    """
+    global _index, _index_mtime
+    path = getattr(settings, 'GAZETTEER_INDEX_PATH', None)
+    if not path:
+        return None
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    if _index is not None and mtime == _index_mtime:
+        return _index
+
+    with _index_lock:
+        if _index is None or mtime != _index_mtime:
+            try:
+                _index = GazetteerIndex(path)
+                _index_mtime = mtime
+            except (OSError, ValueError, TypeError, struct.error) as e:
+                # City search falls back to the geocoding API
+                logger.error(f"Unable to open gazetteer index {path}: {str(e)}")
+                return None
+    return _index
@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GEOCODING_CACHE = {
+    'MAX_ENTRIES': 1024,
+    'TTL': 60 * 60 * 24 * 30,  # 30 days for locations that were found
+    'NEGATIVE_TTL': 60 * 60 * 24,  # 1 day for locations that were not found
+}
+
+
+class Place(namedtuple('Place', ['latitude', 'longitude', 'city', 'admin1', 'country', 'country_code'])):
+    """A geocoded location; coordinates are None and names empty for a location that was not found"""
+    __slots__ = ()
+
+    @property
+    def found(self):
+        return self.latitude is not None and self.longitude is not None
+
+
+NOT_FOUND = Place(None, None, '', '', '', '')
+
+# Length of GeocodingCacheEntry.query; longer names only use the in-process tier
+DB_KEY_MAX_LENGTH = 255
+
+
+class GeocodingCache:
+    """
+    Two-tier cache for geocoding results: an in-process LRU in front of the
+    GeocodingCacheEntry table, so repeat destinations never hit the network.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, negative_ttl=None):
+        config = {**DEFAULT_GEOCODING_CACHE, **getattr(settings, 'GEOCODING_CACHE', {})}
+        self.max_entries = max_entries if max_entries is not None else config['MAX_ENTRIES']
+        self.ttl = ttl if ttl is not None else config['TTL']
+        self.negative_ttl = negative_ttl if negative_ttl is not None else config['NEGATIVE_TTL']
+
+        self._entries = OrderedDict()  # key -> (place, expires_at)
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'db_hits': 0, 'negative_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def normalize(location_name):
+        """Normalize a location name so that trivial variants share one entry"""
+        parts = [' '.join(part.split()) for part in location_name.lower().split(',')]
+        return ', '.join(part for part in parts if part)
+
+    def get(self, location_name):
+        """
+        Look up a location in the cache
+
+        Args:
+            location_name (str): Name of the location to look up
+
+        Returns:
+            Place: The cached place (NOT_FOUND for a cached miss), or None
+                   if the location is not cached
+        """
+        key = self.normalize(location_name)
+        cached = self._memory_get(key)
+        if cached is not None:
+            return cached
+
+        if len(key) > DB_KEY_MAX_LENGTH:
+            return self._accept_row(key, None)
+        try:
+            from trips.models import GeocodingCacheEntry
+            row = GeocodingCacheEntry.objects.filter(query=key).first()
+        except DatabaseError as e:
+            logger.error(f"Error reading geocoding cache for {key}: {str(e)}")
+            row = None
+        return self._accept_row(key, row)
+
+    async def aget(self, location_name):
+        """Async version of get() using the async ORM"""
+        key = self.normalize(location_name)
+        cached = self._memory_get(key)
+        if cached is not None:
+            return cached
+
+        if len(key) > DB_KEY_MAX_LENGTH:
+            return self._accept_row(key, None)
+        try:
+            from trips.models import GeocodingCacheEntry
+            row = await GeocodingCacheEntry.objects.filter(query=key).afirst()
+        except DatabaseError as e:
+            logger.error(f"Error reading geocoding cache for {key}: {str(e)}")
+            row = None
+        return self._accept_row(key, row)
+
+    def set(self, location_name, place):
+        """Store a geocoding result; pass NOT_FOUND to cache a miss"""
+        key = self._remember_result(location_name, place)
+        if len(key) > DB_KEY_MAX_LENGTH:
+            return
+        try:
+            from trips.models import GeocodingCacheEntry
+            # A single upsert statement keeps concurrent writers from deadlocking on SQLite
+            GeocodingCacheEntry.objects.bulk_create(**self._upsert(GeocodingCacheEntry, key, place))
+        except DatabaseError as e:
+            logger.error(f"Error writing geocoding cache for {key}: {str(e)}")
+
+    async def aset(self, location_name, place):
+        """Async version of set() using the async ORM"""
+        key = self._remember_result(location_name, place)
+        if len(key) > DB_KEY_MAX_LENGTH:
+            return
+        try:
+            from trips.models import GeocodingCacheEntry
+            await GeocodingCacheEntry.objects.abulk_create(**self._upsert(GeocodingCacheEntry, key, place))
+        except DatabaseError as e:
+            logger.error(f"Error writing geocoding cache for {key}: {str(e)}")
+
+    def clear(self):
+        """Drop the in-process tier and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current size of the in-process tier"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters['memory_entries'] = len(self._entries)
+        lookups = counters['memory_hits'] + counters['db_hits'] + counters['misses']
+        counters['hit_ratio'] = (lookups - counters['misses']) / lookups if lookups else 0.0
+        return counters
+
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            place, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._record_hit('memory_hits', place)
+            return place
+
+    def _accept_row(self, key, row):
+        """Promote a fresh database row to the in-process tier, or count a miss"""
+        if row is not None:
+            place = Place(row.latitude, row.longitude, row.city, row.admin1, row.country, row.country_code)
+            ttl = self.ttl if place.found else self.negative_ttl
+            remaining = (row.fetched_at + timedelta(seconds=ttl) - timezone.now()).total_seconds()
+            if remaining > 0:
+                with self._lock:
+                    self._remember(key, place, remaining)
+                    self._record_hit('db_hits', place)
+                return place
+
+        with self._lock:
+            self._counters['misses'] += 1
+        return None
+
+    def _remember_result(self, location_name, place):
+        key = self.normalize(location_name)
+        ttl = self.ttl if place.found else self.negative_ttl
+        with self._lock:
+            self._remember(key, place, ttl)
+        return key
+
+    @staticmethod
+    def _upsert(model, key, place):
+        return {
+            'objs': [model(
+                query=key,
+                fetched_at=timezone.now(),
+                **place._asdict(),
+            )],
+            'update_conflicts': True,
+            'unique_fields': ['query'],
+            'update_fields': [*Place._fields, 'fetched_at'],
+        }
+
+    def _remember(self, key, place, ttl):
+        # Caller must hold self._lock
+        self._entries[key] = (place, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _record_hit(self, counter, place):
+        # Caller must hold self._lock
+        self._counters[counter] += 1
+        if not place.found:
+            self._counters['negative_hits'] += 1
@@ -1,5 +1,10 @@
+import httpx
 import requests
 import logging
+from .geocoding_cache import NOT_FOUND, GeocodingCache, Place
+from .http_client import get_async_client, get_client
+from .gazetteer import get_gazetteer
+from .singleflight import upstream_flight
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +13,8 @@ class GeocodingService:
     
     BASE_URL = "https://geocoding-api.open-meteo.com/v1/search"
     
+    cache = GeocodingCache()
+    
     @staticmethod
     def get_coordinates(location_name):
         """
@@ -15,101 +22,244 @@ class GeocodingService:
         
         Args:
             location_name (str): Name of the location to geocode
-            
+        
         Returns:
             tuple: (latitude, longitude) or (None, None) if not found
         """
+        place = GeocodingService.get_place(location_name)
+        return place.latitude, place.longitude
+    
+    @staticmethod
+    async def aget_coordinates(location_name):
+        """Async version of get_coordinates for async views"""
+        place = await GeocodingService.aget_place(location_name)
+        return place.latitude, place.longitude
+    
+    @staticmethod
+    def get_place(location_name):
+        """
+        Resolve a location name to coordinates, city, region, country and ISO country code
+        
+        Results (including misses) are served from GeocodingService.cache when
+        possible; network errors are never cached.
+        
+        Args:
+            location_name (str): Name of the location to geocode
+        
+        Returns:
+            Place: The geocoded place, or NOT_FOUND if it could not be resolved
+        """
+        if not location_name:
+            return NOT_FOUND
+        
+        cached = GeocodingService.cache.get(location_name)
+        if cached is not None:
+            return cached
+        
+        # Concurrent lookups of the same name share one upstream request
+        key = ('geocode', GeocodingCache.normalize(location_name))
+        
         try:
-            # First try with the full location name
-            params = {
-                'name': location_name,
-                'count': 1,
-                'language': 'en',
-                'format': 'json'
-            }
-            
-            response = requests.get(GeocodingService.BASE_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data and 'results' in data and len(data['results']) > 0:
-                result = data['results'][0]
-                logger.info(f"Found coordinates for {location_name}: {result['latitude']}, {result['longitude']}")
-                return result['latitude'], result['longitude']
-            
-            # If no results found, try with just the city name
-            city_name = location_name.split(',')[0].strip()
-            if city_name != location_name:
-                params['name'] = city_name
-                response = requests.get(GeocodingService.BASE_URL, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                if data and 'results' in data and len(data['results']) > 0:
-                    result = data['results'][0]
-                    logger.info(f"Found coordinates for {city_name}: {result['latitude']}, {result['longitude']}")
-                    return result['latitude'], result['longitude']
-            
-            logger.warning(f"No coordinates found for location: {location_name}")
-            return None, None
-            
+            place, _ = upstream_flight.do(
+                key, GeocodingService._fetch_and_cache_place, location_name
+            )
         except requests.exceptions.RequestException as e:
             logger.error(f"Error during geocoding for {location_name}: {str(e)}")
-            return None, None
+            return NOT_FOUND
+        except Exception as e:
+            logger.error(f"Unexpected error during geocoding for {location_name}: {str(e)}")
+            return NOT_FOUND
+        
+        return place
+    
+    @staticmethod
+    async def aget_place(location_name):
+        """Async version of get_place for async views"""
+        if not location_name:
+            return NOT_FOUND
+        
+        cached = await GeocodingService.cache.aget(location_name)
+        if cached is not None:
+            return cached
+        
+        key = ('geocode', GeocodingCache.normalize(location_name))
+        
+        try:
+            place, _ = await upstream_flight.ado(
+                key, GeocodingService._afetch_and_cache_place, location_name
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"Error during geocoding for {location_name}: {str(e)}")
+            return NOT_FOUND
         except Exception as e:
             logger.error(f"Unexpected error during geocoding for {location_name}: {str(e)}")
-            return None, None
+            return NOT_FOUND
+        
+        return place
+    
+    @staticmethod
+    def _fetch_and_cache_place(location_name):
+        """Geocode a location and store the result (found or not) in the cache"""
+        place = GeocodingService._fetch_place(location_name)
+        GeocodingService.cache.set(location_name, place)
+        return place
+    
+    @staticmethod
+    async def _afetch_and_cache_place(location_name):
+        place = await GeocodingService._afetch_place(location_name)
+        await GeocodingService.cache.aset(location_name, place)
+        return place
+    
+    @staticmethod
+    def _fetch_place(location_name):
+        """Query the geocoding API, falling back to just the city name"""
+        for name in GeocodingService._candidate_names(location_name):
+            response = get_client('geocoding').get(
+                GeocodingService.BASE_URL, params=GeocodingService._coordinates_params(name)
+            )
+            response.raise_for_status()
+            place = GeocodingService._parse_place(name, response.json())
+            if place is not None:
+                return place
+        
+        logger.warning(f"No coordinates found for location: {location_name}")
+        return NOT_FOUND
+    
+    @staticmethod
+    async def _afetch_place(location_name):
+        for name in GeocodingService._candidate_names(location_name):
+            response = await get_async_client('geocoding').get(
+                GeocodingService.BASE_URL, params=GeocodingService._coordinates_params(name)
+            )
+            response.raise_for_status()
+            place = GeocodingService._parse_place(name, response.json())
+            if place is not None:
+                return place
+        
+        logger.warning(f"No coordinates found for location: {location_name}")
+        return NOT_FOUND
+    
+    @staticmethod
+    def _candidate_names(location_name):
+        # First try with the full location name, then with just the city name
+        names = [location_name]
+        city_name = location_name.split(',')[0].strip()
+        if city_name != location_name:
+            names.append(city_name)
+        return names
+    
+    @staticmethod
+    def _coordinates_params(name):
+        return {
+            'name': name,
+            'count': 1,
+            'language': 'en',
+            'format': 'json'
+        }
+    
+    @staticmethod
+    def _parse_place(name, data):
+        if data and 'results' in data and len(data['results']) > 0:
+            result = data['results'][0]
+            logger.info(f"Found coordinates for {name}: {result['latitude']}, {result['longitude']}")
+            return Place(
+                latitude=result['latitude'],
+                longitude=result['longitude'],
+                city=result.get('name') or '',
+                admin1=result.get('admin1') or '',
+                country=result.get('country') or '',
+                country_code=(result.get('country_code') or '').upper()
+            )
+        return None
     
     @staticmethod
     def search_cities(query, limit=10):
         """
         Search for cities matching the query
         
+        Answers from the local gazetteer index when one has been built with
+        the load_gazetteer command, and only asks the geocoding API on a miss.
+        
         Args:
             query (str): Search term for city name
             limit (int): Maximum number of results to return
-            
+        
         Returns:
             list: List of city dictionaries with name, country, latitude, longitude
         """
+        gazetteer = get_gazetteer()
+        if gazetteer is not None:
+            cities = gazetteer.search(query, limit)
+            if cities:
+                return cities
+        
         try:
-            params = {
-                'name': query,
-                'count': limit,
-                'language': 'en',
-                'format': 'json'
-            }
-            
-            response = requests.get(GeocodingService.BASE_URL, params=params)
+            response = get_client('geocoding').get(
+                GeocodingService.BASE_URL, params=GeocodingService._search_params(query, limit)
+            )
             response.raise_for_status()
-            data = response.json()
-            
-            cities = []
-            if data and 'results' in data:
-                for result in data['results']:
-                    city = {
-                        'name': result.get('name', ''),
-                        'country': result.get('country', ''),
-                        'admin1': result.get('admin1', ''),  # State/province
-                        'latitude': result.get('latitude'),
-                        'longitude': result.get('longitude')
-                    }
-                    
-                    # Create a formatted display name with country and admin1 if available
-                    display_parts = [city['name']]
-                    if city['admin1']:
-                        display_parts.append(city['admin1'])
-                    if city['country']:
-                        display_parts.append(city['country'])
-                    
-                    city['display_name'] = ', '.join(display_parts)
-                    cities.append(city)
-            
-            return cities
-            
+            return GeocodingService._parse_cities(response.json())
+        
         except requests.exceptions.RequestException as e:
             logger.error(f"Error searching cities for {query}: {str(e)}")
             return []
         except Exception as e:
             logger.error(f"Unexpected error searching cities for {query}: {str(e)}")
-            return [] 
\ No newline at end of file
+            return []
+    
+    @staticmethod
+    async def asearch_cities(query, limit=10):
+        """Async version of search_cities for async views"""
+        gazetteer = get_gazetteer()
+        if gazetteer is not None:
+            cities = gazetteer.search(query, limit)
+            if cities:
+                return cities
+        
+        try:
+            response = await get_async_client('geocoding').get(
+                GeocodingService.BASE_URL, params=GeocodingService._search_params(query, limit)
+            )
+            response.raise_for_status()
+            return GeocodingService._parse_cities(response.json())
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Error searching cities for {query}: {str(e)}")
+            return []
+        except Exception as e:
+            logger.error(f"Unexpected error searching cities for {query}: {str(e)}")
+            return []
+    
+    @staticmethod
+    def _search_params(query, limit):
+        return {
+            'name': query,
+            'count': limit,
+            'language': 'en',
+            'format': 'json'
+        }
+    
+    @staticmethod
+    def _parse_cities(data):
+        cities = []
+        if data and 'results' in data:
+            for result in data['results']:
+                city = {
+                    'name': result.get('name', ''),
+                    'country': result.get('country', ''),
+                    'admin1': result.get('admin1', ''),  # State/province
+                    'latitude': result.get('latitude'),
+                    'longitude': result.get('longitude')
+                }
+                
+                # Create a formatted display name with country and admin1 if available
+                display_parts = [city['name']]
+                if city['admin1']:
+                    display_parts.append(city['admin1'])
+                if city['country']:
+                    display_parts.append(city['country'])
+                
+                city['display_name'] = ', '.join(display_parts)
+                cities.append(city)
+        
+        return cities
@@ -0,0 +1,211 @@
+import asyncio
+import bisect
+import logging
+import random
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTBOUND_HTTP = {
+    'CONNECT_TIMEOUT': 3.05,  # Seconds to establish a connection
+    'READ_TIMEOUT': 10,  # Seconds to wait between bytes of the response
+    'RETRIES': 2,  # Retries for connection errors and 429/5xx responses
+    'BACKOFF': 0.5,  # Backoff factor; the sleep is jittered between 0 and the exponential backoff
+    'POOL_SIZE': 10,  # Keep-alive connections per host
+    'MAX_CONNECTIONS': 200,  # Concurrent connections per async client
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class JitteredRetry(Retry):
+    """Retry policy with "full jitter" so synchronized clients do not retry in lockstep"""
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+
+class LatencyHistogram:
+    """Bucketed response latencies for one upstream host"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.errors = 0
+
+    def record(self, elapsed_ms, is_error=False):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.total_ms += elapsed_ms
+        if is_error:
+            self.errors += 1
+
+    def snapshot(self):
+        requests_count = sum(self.counts)
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            'requests': requests_count,
+            'errors': self.errors,
+            'mean_ms': round(self.total_ms / requests_count, 1) if requests_count else None,
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+def record_latency(host, elapsed_ms, status_code):
+    with _histograms_lock:
+        histogram = _histograms.setdefault(host, LatencyHistogram())
+        histogram.record(elapsed_ms, is_error=status_code >= 500)
+
+
+def _record_latency(response, *args, **kwargs):
+    record_latency(urlsplit(response.url).netloc, response.elapsed.total_seconds() * 1000, response.status_code)
+
+
+def latency_stats():
+    """Return the latency histogram of every upstream host contacted by this process"""
+    with _histograms_lock:
+        return {host: histogram.snapshot() for host, histogram in _histograms.items()}
+
+
+class HttpClient:
+    """
+    Pooled, keep-alive HTTP session for one upstream service
+
+    Every request gets the service's connect/read timeouts unless the caller
+    passes its own, and idempotent requests are retried with jittered
+    exponential backoff on connection errors and 429/5xx responses.
+    """
+
+    def __init__(self, service, config):
+        self.service = service
+        self.timeout = (config['CONNECT_TIMEOUT'], config['READ_TIMEOUT'])
+
+        retry = JitteredRetry(
+            total=config['RETRIES'],
+            backoff_factor=config['BACKOFF'],
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=config['POOL_SIZE'],
+            pool_maxsize=config['POOL_SIZE'],
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.hooks['response'].append(_record_latency)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+def _load_config(service):
+    configured = getattr(settings, 'OUTBOUND_HTTP', {})
+    return {
+        **DEFAULT_OUTBOUND_HTTP,
+        **configured.get('default', {}),
+        **configured.get(service, {}),
+    }
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(service):
+    """
+    Return the shared HttpClient for a service
+
+    Timeouts, retries and pool sizes come from settings.OUTBOUND_HTTP[service],
+    falling back to settings.OUTBOUND_HTTP['default'].
+    """
+    client = _clients.get(service)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        if service not in _clients:
+            _clients[service] = HttpClient(service, _load_config(service))
+        return _clients[service]
+
+
+class AsyncHttpClient:
+    """
+    httpx.AsyncClient counterpart of HttpClient for async views
+
+    Shares the service configuration and latency histograms with the
+    synchronous clients. Raises httpx.HTTPError subclasses on failure.
+    """
+
+    def __init__(self, service, config):
+        self.service = service
+        self.retries = config['RETRIES']
+        self.backoff = config['BACKOFF']
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(config['READ_TIMEOUT'], connect=config['CONNECT_TIMEOUT']),
+            limits=httpx.Limits(
+                max_connections=config['MAX_CONNECTIONS'],
+                max_keepalive_connections=config['POOL_SIZE'],
+            ),
+        )
+
+    async def request(self, method, url, **kwargs):
+        attempts = self.retries + 1 if method in IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            is_last = attempt == attempts - 1
+            started = time.monotonic()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if is_last:
+                    raise
+            else:
+                record_latency(response.url.netloc.decode('ascii'),
+                               (time.monotonic() - started) * 1000, response.status_code)
+                if is_last or response.status_code not in RETRY_STATUSES:
+                    return response
+            # Same full-jitter exponential backoff as JitteredRetry
+            await asyncio.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+
+# httpx clients are bound to the event loop that created them
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client(service):
+    """Return the AsyncHttpClient for a service on the running event loop"""
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    if service not in clients:
+        clients[service] = AsyncHttpClient(service, _load_config(service))
+    return clients[service]
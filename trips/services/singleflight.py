@@ -0,0 +1,131 @@
+import asyncio
+import threading
+
+
+class _Call:
+    """An in-flight call that other callers with the same key can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+        self.future = None  # Set for calls made through ado()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution
+
+    The first caller for a key runs the function; callers that arrive while
+    it is still running wait for it and receive the same result (or error).
+    Keys are tuples whose first element names the kind of call, which is used
+    to break down the counters reported by stats().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self._counters = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless an identical call is already in flight
+
+        Args:
+            key (tuple): Identifies the call, e.g. ('forecast', lat, lon, days, unit)
+            fn (callable): Function performing the upstream request
+
+        Returns:
+            tuple: (result, shared) where shared is True if the result is also
+                   being returned to other callers and must not be mutated
+        """
+        with self._lock:
+            counters = self._counters.setdefault(key[0], {'calls': 0, 'executions': 0, 'coalesced': 0})
+            counters['calls'] += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                counters['executions'] += 1
+                leader = True
+            else:
+                counters['coalesced'] += 1
+                call.followers += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.followers > 0
+            call.done.set()
+        return call.result, shared
+
+    async def ado(self, key, fn, *args, **kwargs):
+        """
+        Coroutine counterpart of do() for async callers
+
+        Coalesces calls made from the same event loop; fn must be a coroutine
+        function. Counters are shared with do().
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            counters = self._counters.setdefault(key[0], {'calls': 0, 'executions': 0, 'coalesced': 0})
+            counters['calls'] += 1
+            call = self._async_calls.get(flight_key)
+            if call is None:
+                call = self._async_calls[flight_key] = _Call()
+                call.future = loop.create_future()
+                counters['executions'] += 1
+                leader = True
+            else:
+                counters['coalesced'] += 1
+                call.followers += 1
+                leader = False
+
+        if not leader:
+            # Shielded so a cancelled follower does not cancel the shared fetch
+            return await asyncio.shield(call.future), True
+
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                del self._async_calls[flight_key]
+                shared = call.followers > 0
+            if shared:
+                if isinstance(e, asyncio.CancelledError):
+                    call.future.cancel()
+                else:
+                    call.future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._async_calls[flight_key]
+            shared = call.followers > 0
+        if shared:
+            call.future.set_result(result)
+        return result, shared
+
+    def stats(self):
+        """Return call, execution and coalesced counts per kind of call"""
+        with self._lock:
+            stats = {kind: dict(counters) for kind, counters in self._counters.items()}
+            stats['in_flight'] = len(self._calls) + len(self._async_calls)
+        return stats
+
+
+# Shared by GeocodingService and WeatherService
+upstream_flight = SingleFlight()
@@ -1,121 +1,505 @@
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import httpx
+import numpy as np
 import requests
-from datetime import datetime, timedelta
-import random
-import statistics
+from django.db import connection
+from . import clothing_rules
+from .climatology import get_climatology
+from .forecast import CANONICAL_UNIT, Forecast
+from .forecast_cache import ForecastCache
+from .http_client import get_async_client, get_client
+from .singleflight import upstream_flight
+
+# Daily series filled in by extend_forecast beyond the API's 16-day horizon
+EXTENDED_VARIABLES = ('temperature_2m_max', 'temperature_2m_min', 'precipitation_probability_max', 'precipitation_sum')
+EXTENSION_TREND_DAYS = 7  # Trailing forecast days used to estimate the trend
+EXTENSION_DECAY_DAYS = 5.0  # e-folding time, in days, of the trend towards the baseline
+
+# Raised by Forecast.from_api (or the JSON decoder) on a malformed or partial upstream payload
+PAYLOAD_ERRORS = (AttributeError, KeyError, TypeError, ValueError)
+
+# Background refreshes of stale cached forecasts, at most one per cache key
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='forecast-refresh')
+_refreshing = set()
+_refreshing_lock = threading.Lock()
 
 class WeatherService:
     """Service to interact with Open-Meteo API for weather forecasts"""
     
     BASE_URL = "https://api.open-meteo.com/v1/forecast"
     
+    BATCH_SIZE = 50  # Locations per request when fetching several forecasts at once
+    
+    MAX_FORECAST_DAYS = 16  # Open-Meteo's forecast horizon
+    
+    cache = ForecastCache()
+    
     @staticmethod
-    def get_weather_forecast(latitude, longitude, days=7, temperature_unit="fahrenheit"):
+    def get_weather_forecast(latitude, longitude, days=7, start_date=None):
         """
         Get weather forecast for a specific location
         
+        Forecasts are cached per grid cell (see ForecastCache), so the returned
+        coordinates are those of the cell center rather than the exact input.
+        A cached forecast past its soft TTL is returned immediately, marked
+        with "stale": true and its "age" in seconds, and refreshed in the
+        background; only a miss waits for the API.
+        
+        Forecasts are fetched and cached in CANONICAL_UNIT only, so every
+        consumer shares one entry per location; convert them for display with
+        Forecast.in_unit.
+        
         Args:
             latitude (float): Location latitude
             longitude (float): Location longitude
             days (int): Number of forecast days (default: 7)
-            temperature_unit (str): Unit for temperature ('celsius' or 'fahrenheit')
+            start_date (date): First day wanted; when it lies beyond the forecast
+                               horizon the forecast comes from the local
+                               climatology if one has been loaded (default: today)
             
         Returns:
-            dict: Weather forecast data
+            Forecast: Weather forecast data in Celsius, or None if it could not be fetched
         """
+        if latitude is None or longitude is None:
+            return None
+            
+        if WeatherService.is_beyond_horizon(start_date):
+            forecast = WeatherService.get_climatology_forecast(
+                latitude, longitude, start_date, days
+            )
+            if forecast is not None:
+                return forecast
+            
         # Calculate how many days we need from the API (max 16 days)
-        api_days = min(16, days)
+        api_days = min(WeatherService.MAX_FORECAST_DAYS, days)
+        
+        # Nearby locations snap to the same grid cell and share a cached forecast
+        latitude, longitude = WeatherService.cache.cell(latitude, longitude)
+        cache_key = WeatherService.cache.key(latitude, longitude, api_days)
+        params = WeatherService._forecast_params(latitude, longitude, api_days)
+        
+        cached = WeatherService.cache.get(cache_key)
+        if cached is not None:
+            forecast = WeatherService._serve_cached(cache_key, params, *cached)
+        else:
+            try:
+                # Identical requests already in flight are shared rather than repeated
+                forecast, _ = upstream_flight.do(
+                    ('forecast', cache_key), WeatherService._fetch_and_cache_forecast, cache_key, params
+                )
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching weather data: {e}")
+                return None
+            except PAYLOAD_ERRORS as e:
+                print(f"Error parsing weather data: {e!r}")
+                return None
+                
+        # If requested days exceed API limits, extend the forecast
+        if days > api_days:
+            forecast = WeatherService.extend_forecast(forecast, days)
+            
+        return forecast
+    
+    @staticmethod
+    async def aget_weather_forecast(latitude, longitude, days=7, start_date=None):
+        """Async version of get_weather_forecast for async views"""
+        if latitude is None or longitude is None:
+            return None
+            
+        if WeatherService.is_beyond_horizon(start_date):
+            # Answered locally, without any network calls
+            forecast = WeatherService.get_climatology_forecast(
+                latitude, longitude, start_date, days
+            )
+            if forecast is not None:
+                return forecast
+            
+        api_days = min(WeatherService.MAX_FORECAST_DAYS, days)
+        latitude, longitude = WeatherService.cache.cell(latitude, longitude)
+        cache_key = WeatherService.cache.key(latitude, longitude, api_days)
+        params = WeatherService._forecast_params(latitude, longitude, api_days)
+        
+        cached = await WeatherService.cache.aget(cache_key)
+        if cached is not None:
+            forecast = WeatherService._serve_cached(cache_key, params, *cached)
+        else:
+            try:
+                forecast, _ = await upstream_flight.ado(
+                    ('forecast', cache_key), WeatherService._afetch_and_cache_forecast, cache_key, params
+                )
+            except httpx.HTTPError as e:
+                print(f"Error fetching weather data: {e}")
+                return None
+            except PAYLOAD_ERRORS as e:
+                print(f"Error parsing weather data: {e!r}")
+                return None
+            
+        if days > api_days:
+            forecast = WeatherService.extend_forecast(forecast, days)
+            
+        return forecast
+    
+    @staticmethod
+    def get_weather_forecasts(locations, days=7):
+        """
+        Get weather forecasts for many locations with as few API requests as possible
+        
+        Locations are snapped to grid cells, cached cells are served from the
+        cache and the remaining cells are fetched BATCH_SIZE at a time using
+        Open-Meteo's comma-separated coordinate lists.
+        
+        Args:
+            locations (list): (latitude, longitude) pairs
+            days (int): Number of forecast days (default: 7)
+            
+        Returns:
+            list: Forecasts (in Celsius) in the same order as locations, None where unavailable;
+                  locations in the same grid cell share one Forecast
+        """
+        api_days = min(WeatherService.MAX_FORECAST_DAYS, days)
+        forecasts = [None] * len(locations)
+        
+        # Group uncached locations by cell so each cell is fetched once
+        missing = {}
+        for index, (latitude, longitude) in enumerate(locations):
+            if latitude is None or longitude is None:
+                continue
+            cell = WeatherService.cache.cell(latitude, longitude)
+            cache_key = WeatherService.cache.key(*cell, api_days)
+            if cache_key in missing:
+                missing[cache_key][1].append(index)
+                continue
+            cached = WeatherService.cache.get(cache_key)
+            if cached is not None:
+                params = WeatherService._forecast_params(*cell, api_days)
+                forecasts[index] = WeatherService._serve_cached(cache_key, params, *cached)
+            else:
+                missing[cache_key] = (cell, [index])
+        
+        fetched = WeatherService.refresh_forecasts(
+            [cell for cell, _ in missing.values()], api_days
+        )
+        for cache_key, (_, indexes) in missing.items():
+            forecast = fetched.get(cache_key)
+            if forecast is None:
+                continue
+            for index in indexes:
+                forecasts[index] = forecast
+        
+        # If requested days exceed API limits, extend the forecasts
+        if days > api_days:
+            forecasts = [
+                WeatherService.extend_forecast(forecast, days) if forecast else forecast
+                for forecast in forecasts
+            ]
+            
+        return forecasts
+    
+    @staticmethod
+    def refresh_forecasts(cells, days=7):
+        """
+        Fetch forecasts for grid cells from the API, whatever is cached, and cache them
+        
+        Cells are requested BATCH_SIZE at a time; a failed batch, or a cell
+        whose forecast cannot be parsed, is logged and skipped.
+        
+        Args:
+            cells (list): (latitude, longitude) grid cell centers (see ForecastCache.cell)
+            days (int): Number of forecast days, at most MAX_FORECAST_DAYS
+            
+        Returns:
+            dict: Cache key -> forecast for every cell that was fetched
+        """
+        api_days = min(WeatherService.MAX_FORECAST_DAYS, days)
+        fetched = {}
+        for start in range(0, len(cells), WeatherService.BATCH_SIZE):
+            batch = cells[start:start + WeatherService.BATCH_SIZE]
+            params = WeatherService._forecast_params(
+                ','.join(str(cell[0]) for cell in batch),
+                ','.join(str(cell[1]) for cell in batch),
+                api_days
+            )
+            try:
+                responses = WeatherService._fetch_forecast(params)
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching weather data: {e}")
+                continue
+                
+            # A single location comes back as an object rather than a list
+            if isinstance(responses, dict):
+                responses = [responses]
+            for cell, api_data in zip(batch, responses):
+                cache_key = WeatherService.cache.key(*cell, api_days)
+                try:
+                    forecast = Forecast.from_api(api_data)
+                except PAYLOAD_ERRORS as e:
+                    # A malformed or partial payload only loses this cell
+                    print(f"Error parsing weather data for {cell}: {e!r}")
+                    continue
+                WeatherService.cache.set(cache_key, forecast)
+                fetched[cache_key] = forecast
+        return fetched
+    
+    @staticmethod
+    def is_beyond_horizon(start_date):
+        """Whether a forecast starting on start_date lies entirely past the live forecast"""
+        return start_date is not None and (start_date - date.today()).days >= WeatherService.MAX_FORECAST_DAYS
+    
+    @staticmethod
+    def forecast_fetched_at(latitude, longitude, days=7, start_date=None):
+        """
+        When the forecast get_weather_forecast would return was produced, without fetching it
+        
+        This is the fetch time of the cached forecast, or the modification
+        time of the climatology it comes from (or is extended with). A stale
+        forecast counts as not cached: callers then go through
+        get_weather_forecast, which schedules its refresh.
+        
+        Returns:
+            float: Unix timestamp, or None if the forecast is not cached or stale
+        """
+        if latitude is None or longitude is None:
+            return None
+        
+        store = get_climatology()
+        if WeatherService.is_beyond_horizon(start_date) and store is not None \
+                and store.monthly(*WeatherService.cache.cell(latitude, longitude)) is not None:
+            return store.mtime
+        
+        api_days = min(WeatherService.MAX_FORECAST_DAYS, days)
+        fetched_at = WeatherService.cache.fetched_at(WeatherService.cache.key(latitude, longitude, api_days))
+        if fetched_at is None or WeatherService.cache.is_stale(fetched_at):
+            return None
+        if days > api_days and store is not None:
+            fetched_at = max(fetched_at, store.mtime)
+        return fetched_at
+    
+    @staticmethod
+    def get_climatology_forecast(latitude, longitude, start_date, days=7):
+        """
+        Build a forecast from the local climatology table (see load_climatology)
+        
+        The forecast has no current weather and is marked with
+        "source": "climatology".
+        
+        Returns:
+            Forecast: Forecast data, or None if no climatology covers the location
+        """
+        store = get_climatology()
+        if store is None:
+            return None
         
-        params = {
+        latitude, longitude = WeatherService.cache.cell(latitude, longitude)
+        dates = np.datetime64(start_date, 'D') + np.arange(days)
+        normals = store.daily(latitude, longitude, dates)
+        if normals is None or np.isnan(normals).any():
+            return None
+        
+        temp_max, temp_min, precip_prob, precip_sum = normals
+        
+        return Forecast(
+            latitude=latitude,
+            longitude=longitude,
+            days=dates.astype(np.int32),
+            variables=('temperature_2m_max', 'temperature_2m_min', 'precipitation_sum', 'precipitation_probability_max'),
+            values=np.array([
+                np.round(temp_max, 1), np.round(temp_min, 1), np.round(precip_sum, 1), np.rint(precip_prob)
+            ], dtype=np.float32),
+            units={
+                'time': 'iso8601',
+                'temperature_2m_max': '°C',
+                'temperature_2m_min': '°C',
+                'precipitation_sum': 'mm',
+                'precipitation_probability_max': '%',
+            },
+            meta={'source': 'climatology'},
+        )
+    
+    @staticmethod
+    def _forecast_params(latitude, longitude, api_days):
+        """Query parameters for the forecast endpoint; coordinates may be comma-separated lists"""
+        return {
             'latitude': latitude,
             'longitude': longitude,
             'daily': 'temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max',
             'current_weather': 'true',
             'timezone': 'auto',
             'forecast_days': api_days,
-            'temperature_unit': temperature_unit  # Request Fahrenheit directly from API
+            'temperature_unit': CANONICAL_UNIT
         }
-        
+    
+    @staticmethod
+    def _serve_cached(cache_key, params, forecast, fetched_at):
+        """Return a cached forecast, marking it and scheduling a refresh if it is stale"""
+        if WeatherService.cache.is_stale(fetched_at):
+            WeatherService._schedule_refresh(cache_key, params)
+            forecast.meta['stale'] = True
+            forecast.meta['age'] = int(WeatherService.cache.age(fetched_at))
+        return forecast
+    
+    @staticmethod
+    def _schedule_refresh(cache_key, params):
+        """Refetch a forecast in the background unless a refresh is already pending"""
+        with _refreshing_lock:
+            if cache_key in _refreshing:
+                return
+            _refreshing.add(cache_key)
+        _refresh_executor.submit(WeatherService._refresh_forecast, cache_key, params)
+    
+    @staticmethod
+    def _refresh_forecast(cache_key, params):
         try:
-            response = requests.get(WeatherService.BASE_URL, params=params)
-            response.raise_for_status()
-            api_data = response.json()
-            
-            # If requested days exceed API limits, extend the forecast
-            if days > api_days:
-                api_data = WeatherService.extend_forecast(api_data, days)
-                
-            return api_data
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching weather data: {e}")
-            return None
+            upstream_flight.do(
+                ('forecast', cache_key), WeatherService._fetch_and_cache_forecast, cache_key, params
+            )
+        except Exception as e:
+            # The stale entry keeps being served until it reaches the hard TTL
+            print(f"Error refreshing weather data: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(cache_key)
+            # The forecast cache may be database-backed
+            connection.close()
+    
+    @staticmethod
+    def _fetch_and_cache_forecast(cache_key, params):
+        """Request a forecast from the Open-Meteo API and store it in the cache"""
+        forecast = Forecast.from_api(WeatherService._fetch_forecast(params))
+        WeatherService.cache.set(cache_key, forecast)
+        return forecast
+    
+    @staticmethod
+    async def _afetch_and_cache_forecast(cache_key, params):
+        forecast = Forecast.from_api(await WeatherService._afetch_forecast(params))
+        await WeatherService.cache.aset(cache_key, forecast)
+        return forecast
+    
+    @staticmethod
+    def _fetch_forecast(params):
+        """Request a forecast from the Open-Meteo API"""
+        response = get_client('weather').get(WeatherService.BASE_URL, params=params)
+        response.raise_for_status()
+        return response.json()
+    
+    @staticmethod
+    async def _afetch_forecast(params):
+        response = await get_async_client('weather').get(WeatherService.BASE_URL, params=params)
+        response.raise_for_status()
+        return response.json()
     
     @staticmethod
-    def extend_forecast(api_data, total_days):
+    def extend_forecast(forecast, total_days):
         """
         Extend weather forecast beyond API limit using pattern-based prediction
         
+        The extra days continue the trend of the last EXTENSION_TREND_DAYS of
+        the forecast and relax towards a baseline over EXTENSION_DECAY_DAYS:
+        the climatology for those dates when one covers the location, and the
+        mean of the forecast window otherwise. Day-to-day variation is
+        derived from the grid cell and the date rather than a random source,
+        so the same forecast always extends to exactly the same values.
+        
         Args:
-            api_data (dict): Original weather data from API
+            forecast (Forecast): Original weather data from API
             total_days (int): Total number of days to extend forecast to
             
         Returns:
-            dict: Extended weather forecast data
+            Forecast: Extended weather forecast data (a new Forecast)
         """
-        if not api_data or 'daily' not in api_data:
-            return api_data
+        if forecast is None:
+            return forecast
             
-        daily = api_data['daily']
-        available_days = len(daily['time'])
+        available_days = len(forecast)
         
         # Calculate how many additional days we need
         days_to_add = total_days - available_days
         
-        if days_to_add <= 0:
-            return api_data
-            
-        # Get the last date from the available forecast
-        last_date = datetime.strptime(daily['time'][-1], "%Y-%m-%d")
-        
-        # Analyze patterns from available data to make predictions
-        temp_max_values = daily['temperature_2m_max']
-        temp_min_values = daily['temperature_2m_min']
-        precip_prob_values = daily['precipitation_probability_max']
-        precip_sum_values = daily['precipitation_sum']
-        
-        # Calculate statistics for making predictions
-        avg_temp_max = statistics.mean(temp_max_values)
-        avg_temp_min = statistics.mean(temp_min_values)
-        std_temp_max = statistics.stdev(temp_max_values) if len(temp_max_values) > 1 else 2.0
-        std_temp_min = statistics.stdev(temp_min_values) if len(temp_min_values) > 1 else 2.0
-        avg_precip_prob = statistics.mean(precip_prob_values)
-        avg_precip_sum = statistics.mean(precip_sum_values)
-        
-        # Extend the data arrays
-        for i in range(days_to_add):
-            # Calculate the next date
-            next_date = (last_date + timedelta(days=i+1)).strftime("%Y-%m-%d")
-            daily['time'].append(next_date)
-            
-            # Generate predicted values with some randomness based on history
-            # For temperatures, use the moving average with some variance
-            predicted_max = avg_temp_max + random.uniform(-1, 1) * std_temp_max
-            predicted_min = avg_temp_min + random.uniform(-1, 1) * std_temp_min
-            
-            # Ensure min temperature is always less than max
-            if predicted_min > predicted_max:
-                predicted_min, predicted_max = predicted_max, predicted_min
-                
-            # For precipitation, use average with randomness
-            predicted_precip_prob = min(100, max(0, avg_precip_prob + random.uniform(-15, 15)))
-            predicted_precip_sum = max(0, avg_precip_sum * random.uniform(0.5, 1.5))
-            
-            # Add predicted values to the arrays
-            daily['temperature_2m_max'].append(round(predicted_max, 1))
-            daily['temperature_2m_min'].append(round(predicted_min, 1))
-            daily['precipitation_probability_max'].append(round(predicted_precip_prob))
-            daily['precipitation_sum'].append(round(predicted_precip_sum, 1))
+        if days_to_add <= 0 or available_days == 0:
+            return forecast
+        if not all(name in forecast.variables for name in EXTENDED_VARIABLES):
+            return forecast
             
-        return api_data
+        # One row per variable; missing values are filled with the variable's mean
+        window = np.array([forecast.column(name) for name in EXTENDED_VARIABLES], dtype=np.float64)
+        present = ~np.isnan(window)
+        means = np.where(present, window, 0).sum(axis=1) / np.maximum(present.sum(axis=1), 1)
+        window = np.where(present, window, means[:, None])
+        spread = window.std(axis=1)
+        
+        # Least-squares trend over the tail of the forecast, anchored on its last day
+        tail = window[:, -EXTENSION_TREND_DAYS:]
+        x = np.arange(tail.shape[1]) - (tail.shape[1] - 1) / 2
+        slope = (tail - tail.mean(axis=1)[:, None]) @ x / max((x * x).sum(), 1)
+        anchor = tail.mean(axis=1) + slope * x[-1]
+        
+        steps = np.arange(1, days_to_add + 1)
+        days = forecast.days[-1] + steps.astype(np.int32)
+        baseline = WeatherService._extension_baseline(forecast, days)
+        if baseline is None:
+            baseline = means[:, None]
+        
+        weight = np.exp(-steps / EXTENSION_DECAY_DAYS)
+        expected = weight * (anchor[:, None] + slope[:, None] * steps) + (1 - weight) * baseline
+        
+        # Variation fades in as the trend fades out
+        noise = WeatherService._deterministic_noise(forecast, days, len(EXTENDED_VARIABLES)) * (1 - weight)
+        
+        temp_max = np.round(expected[0] + noise[0] * spread[0], 1)
+        temp_min = np.round(expected[1] + noise[1] * spread[1], 1)
+        precip_prob = np.rint(np.clip(expected[2] + noise[2] * 15, 0, 100))
+        precip_sum = np.round(np.maximum(expected[3] * (1 + noise[3] * 0.5), 0), 1)
+        
+        # Ensure min temperature is always less than max
+        temp_min, temp_max = np.minimum(temp_min, temp_max), np.maximum(temp_min, temp_max)
+        
+        # Variables that are not modelled are left missing on the extra days
+        extension = np.full((len(forecast.variables), days_to_add), np.nan, dtype=np.float32)
+        for name, values in zip(EXTENDED_VARIABLES, (temp_max, temp_min, precip_prob, precip_sum)):
+            extension[forecast.variables.index(name)] = values
+        
+        return Forecast(
+            forecast.latitude, forecast.longitude,
+            np.concatenate([forecast.days, days]), forecast.variables,
+            np.concatenate([forecast.values, extension], axis=1),
+            forecast.units, forecast.current_weather, dict(forecast.meta),
+        )
+    
+    @staticmethod
+    def _extension_baseline(forecast, days):
+        """Climatology for the extension days, in the forecast's units, or None"""
+        store = get_climatology()
+        if store is None or forecast.latitude is None or forecast.longitude is None:
+            return None
+        normals = store.daily(forecast.latitude, forecast.longitude, days.astype('datetime64[D]'))
+        if normals is None or np.isnan(normals).any():
+            return None
+        
+        # Climatology is stored in Celsius, like cached forecasts; rows follow EXTENDED_VARIABLES
+        if forecast.is_fahrenheit:
+            normals[:2] = WeatherService.celsius_to_fahrenheit(normals[:2])
+        return normals
+    
+    @staticmethod
+    def _deterministic_noise(forecast, days, rows):
+        """
+        Pseudo-random values in [-1, 1), one row per variable and one column per
+        day, derived from the forecast's grid cell and the days (SplitMix64)
+        """
+        cell = WeatherService.cache.cell(forecast.latitude or 0, forecast.longitude or 0)
+        seed = int.from_bytes(hashlib.blake2b(f"{cell[0]:.4f}:{cell[1]:.4f}".encode(), digest_size=8).digest(), 'little')
+        
+        with np.errstate(over='ignore'):
+            x = (np.uint64(seed)
+                 + days.astype(np.int64).astype(np.uint64)[None, :] * np.uint64(0x9E3779B97F4A7C15)
+                 + np.arange(1, rows + 1, dtype=np.uint64)[:, None] * np.uint64(0xD1B54A32D192ED03))
+            x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            x = x ^ (x >> np.uint64(31))
+        return (x >> np.uint64(11)).astype(np.float64) / 2.0 ** 52 - 1
     
     @staticmethod
     def celsius_to_fahrenheit(celsius):
@@ -128,85 +512,21 @@ class WeatherService:
         Generate clothing recommendations based on weather data
         
         Args:
-            weather_data (dict): Weather forecast data
+            weather_data (Forecast): Weather forecast data
             is_business (bool): Whether recommendations are for business travelers
             
         Returns:
-            dict: Clothing recommendations for each day
+            dict: Clothing recommendations for each day, as shared tuples
+                  that must not be modified
         """
-        if not weather_data or 'daily' not in weather_data:
+        if not weather_data or not {'temperature_2m_max', 'precipitation_probability_max'} <= set(weather_data.variables):
             return {}
         
-        recommendations = {}
-        daily = weather_data['daily']
-        dates = daily['time']
-        max_temps = daily['temperature_2m_max']
-        min_temps = daily['temperature_2m_min']
-        precip_probs = daily['precipitation_probability_max']
-        
-        # Check if temperatures are already in Fahrenheit
-        is_fahrenheit = weather_data.get('daily_units', {}).get('temperature_2m_max', '').lower() == '°f'
-        
-        for i, date in enumerate(dates):
-            day_recommendations = []
-            max_temp = max_temps[i]
-            min_temp = min_temps[i]
-            rain_probability = precip_probs[i]
-            
-            # Temperature thresholds adjusted for Fahrenheit
-            if is_fahrenheit:
-                # Fahrenheit thresholds
-                hot_threshold = 77  # 25°C in °F
-                mild_threshold = 59  # 15°C in °F
-                cool_threshold = 41  # 5°C in °F
-            else:
-                # Celsius thresholds
-                hot_threshold = 25
-                mild_threshold = 15
-                cool_threshold = 5
-            
-            # Temperature-based recommendations
-            if max_temp > hot_threshold:
-                if is_business:
-                    day_recommendations.append("Light business suit or dress shirt with light trousers")
-                    day_recommendations.append("Consider a lightweight blazer for meetings")
-                else:
-                    day_recommendations.append("Light clothing like t-shirts and shorts")
-                    day_recommendations.append("Breathable fabrics recommended")
-            elif max_temp > mild_threshold:
-                if is_business:
-                    day_recommendations.append("Standard business suit or blouse with skirt/trousers")
-                    day_recommendations.append("Light jacket may be needed for morning/evening")
-                else:
-                    day_recommendations.append("Light jacket or sweater with pants")
-                    day_recommendations.append("Layered clothing recommended")
-            elif max_temp > cool_threshold:
-                if is_business:
-                    day_recommendations.append("Wool or heavier business suit")
-                    day_recommendations.append("Consider a topcoat or trench coat")
-                else:
-                    day_recommendations.append("Medium-weight jacket and layers")
-                    day_recommendations.append("Long sleeves and pants recommended")
-            else:
-                if is_business:
-                    day_recommendations.append("Heavier business suit with warm overcoat")
-                    day_recommendations.append("Scarf and gloves may be necessary")
-                else:
-                    day_recommendations.append("Heavy winter coat with layers")
-                    day_recommendations.append("Hat, scarf, and gloves recommended")
-            
-            # Rain recommendations
-            if rain_probability > 60:
-                if is_business:
-                    day_recommendations.append("Bring a formal umbrella and waterproof footwear")
-                else:
-                    day_recommendations.append("Bring a raincoat, umbrella, and waterproof footwear")
-            elif rain_probability > 30:
-                if is_business:
-                    day_recommendations.append("Consider bringing a compact umbrella")
-                else:
-                    day_recommendations.append("Pack a light rain jacket or umbrella just in case")
-            
-            recommendations[date] = day_recommendations
-            
-        return recommendations 
\ No newline at end of file
+        # The whole forecast is classified in one pass against clothing_rules
+        day_recommendations = clothing_rules.classify(
+            weather_data.column('temperature_2m_max'),
+            weather_data.column('precipitation_probability_max'),
+            is_fahrenheit=weather_data.is_fahrenheit,
+            is_business=is_business
+        )
+        return dict(zip(weather_data.date_strings(), day_recommendations))
\ No newline at end of file
@@ -0,0 +1,300 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .management.commands.explain_queries import REGRESSIONS, explain, hot_queries, index_names
+from .models import Activity, PackingItem, Trip
+from .services.forecast import Forecast
+from .services.geocoding_cache import Place
+from .services.geocoding_service import GeocodingService
+from .services.weather_service import WeatherService
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'forecasts': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-forecasts'},
+}
+
+
+def fake_forecast(params, temperature_max=24.0):
+    """Open-Meteo response for the requested number of days, without the network"""
+    days = int(params['forecast_days'])
+    return {
+        'latitude': params['latitude'],
+        'longitude': params['longitude'],
+        'daily_units': {'temperature_2m_max': '°C', 'temperature_2m_min': '°C'},
+        'daily': {
+            'time': [(date.today() + timedelta(days=i)).isoformat() for i in range(days)],
+            'temperature_2m_max': [temperature_max] * days,
+            'temperature_2m_min': [12.0] * days,
+            'precipitation_probability_max': [60] * days,
+            'precipitation_sum': [2.5] * days,
+        },
+    }
+
+
+def update_statements(queries):
+    return [query['sql'] for query in queries if query['sql'].lstrip().upper().startswith('UPDATE')]
+
+
+@override_settings(CACHES=TEST_CACHES)
+class RecommendationWritesTests(TestCase):
+    """Recommendations computed on a read are only written when they change"""
+
+    def setUp(self):
+        WeatherService.cache.backend.clear()
+        patcher = mock.patch.object(WeatherService, '_fetch_forecast', side_effect=fake_forecast)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user('traveler', 'traveler@example.com', 'password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_trip(self, start_in_days):
+        travel_start = date.today() + timedelta(days=start_in_days)
+        return Trip.objects.create(
+            user=self.user, destination='Paris, France', latitude=48.85, longitude=2.35,
+            travel_start=travel_start, travel_end=travel_start + timedelta(days=3)
+        )
+
+    def assert_repeat_get_does_not_write(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(update_statements(queries), [])
+
+    def test_repeat_recommendations_get_does_not_write(self):
+        trip = self.create_trip(start_in_days=2)
+        self.assert_repeat_get_does_not_write(f'/api/trips/{trip.pk}/recommendations/')
+
+    def test_repeat_clothing_recommendations_get_does_not_write(self):
+        trip = self.create_trip(start_in_days=2)
+        self.assert_repeat_get_does_not_write(f'/api/trips/{trip.pk}/clothing-recommendations/')
+
+    def test_recommendation_endpoints_agree_beyond_forecast_horizon(self):
+        # Both endpoints must build the same forecast, or each rewrites the other's result
+        trip = self.create_trip(start_in_days=WeatherService.MAX_FORECAST_DAYS + 10)
+        climatology = lambda latitude, longitude, start_date, days=7: Forecast.from_api(
+            fake_forecast({'latitude': latitude, 'longitude': longitude, 'forecast_days': days}, temperature_max=3.0)
+        )
+        self.enterContext(mock.patch.object(WeatherService, 'get_climatology_forecast', side_effect=climatology))
+        self.client.get(f'/api/trips/{trip.pk}/recommendations/')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f'/api/trips/{trip.pk}/clothing-recommendations/')
+            self.client.get(f'/api/trips/{trip.pk}/recommendations/')
+        self.assertEqual(update_statements(queries), [])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ConditionalForecastTests(TestCase):
+    """Conditional GETs of forecast responses never validate a body they did not serve"""
+
+    def setUp(self):
+        WeatherService.cache.backend.clear()
+        self.enterContext(mock.patch.object(WeatherService, '_fetch_forecast', side_effect=fake_forecast))
+        self.user = User.objects.create_user('traveler', 'traveler@example.com', 'password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.trip = Trip.objects.create(
+            user=self.user, destination='Paris, France', latitude=48.85, longitude=2.35,
+            travel_start=date.today() + timedelta(days=2), travel_end=date.today() + timedelta(days=5)
+        )
+
+    def test_stale_forecast_is_served_without_validators(self):
+        url = f'/api/trips/{self.trip.pk}/weather/'
+        self.client.get(url)
+        fresh_ttl = WeatherService.cache.ttl
+
+        def refresh_now(cache_key, params):
+            # The background refresh finishes while the view still builds the stale body
+            WeatherService.cache.set(cache_key, Forecast.from_api(fake_forecast(params)))
+            WeatherService.cache.ttl = fresh_ttl
+
+        self.enterContext(mock.patch.object(WeatherService.cache, 'ttl', -1))
+        self.enterContext(mock.patch.object(WeatherService, '_schedule_refresh', side_effect=refresh_now))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['stale'])
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+        # The refreshed forecast gets validators of its own on the next request
+        self.assertIn('ETag', self.client.get(url))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class MalformedForecastTests(TestCase):
+    """A malformed upstream forecast is treated like an unavailable one"""
+
+    PAYLOAD = {'latitude': 48.85, 'longitude': 2.35, 'daily': {'time': ['2026-01-01'], 'temperature_2m_max': ['n/a']}}
+
+    def setUp(self):
+        WeatherService.cache.backend.clear()
+
+    def test_weather_endpoint_answers_503(self):
+        self.enterContext(mock.patch.object(WeatherService, '_fetch_forecast', return_value=self.PAYLOAD))
+        user = User.objects.create_user('traveler', 'traveler@example.com', 'password')
+        trip = Trip.objects.create(
+            user=user, destination='Paris, France', latitude=48.85, longitude=2.35,
+            travel_start=date.today() + timedelta(days=2), travel_end=date.today() + timedelta(days=5)
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        self.assertEqual(client.get(f'/api/trips/{trip.pk}/weather/').status_code, 503)
+
+    def test_async_forecast_is_none(self):
+        self.enterContext(mock.patch.object(WeatherService, '_afetch_forecast', return_value=self.PAYLOAD))
+        self.assertIsNone(async_to_sync(WeatherService.aget_weather_forecast)(48.85, 2.35))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class TripCreateForecastTests(TestCase):
+    """A new trip's packing list comes from the forecast for its own dates"""
+
+    def test_trip_beyond_horizon_uses_climatology(self):
+        paris = Place(48.85, 2.35, 'Paris', 'Île-de-France', 'France', 'FR')
+        self.enterContext(mock.patch.object(GeocodingService, 'get_place', return_value=paris))
+        self.enterContext(mock.patch.object(WeatherService, '_fetch_forecast', side_effect=fake_forecast))
+        climatology = self.enterContext(mock.patch.object(
+            WeatherService, 'get_climatology_forecast',
+            side_effect=lambda latitude, longitude, start_date, days=7: Forecast.from_api(
+                fake_forecast({'latitude': latitude, 'longitude': longitude, 'forecast_days': days})
+            )
+        ))
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('traveler', 'traveler@example.com', 'password'))
+
+        travel_start = date.today() + timedelta(days=WeatherService.MAX_FORECAST_DAYS + 30)
+        response = client.post('/api/trips/', {
+            'destination': 'Paris, France', 'activities': ['hiking'],
+            'travel_start': travel_start.isoformat(), 'travel_end': (travel_start + timedelta(days=3)).isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        climatology.assert_called_once_with(48.85, 2.35, travel_start, 7)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class TripWeatherPageTests(TestCase):
+    """The trip weather page always shows a forecast, from its fragment cache or freshly rendered"""
+
+    def setUp(self):
+        WeatherService.cache.backend.clear()
+        cache.clear()
+        self.enterContext(mock.patch.object(WeatherService, '_fetch_forecast', side_effect=fake_forecast))
+        user = User.objects.create_user('traveler', 'traveler@example.com', 'password')
+        self.client = Client()
+        self.client.force_login(user)
+        trip = Trip.objects.create(
+            user=user, destination='Paris, France', latitude=48.85, longitude=2.35,
+            travel_start=date.today() + timedelta(days=2), travel_end=date.today() + timedelta(days=5)
+        )
+        self.url = f'/trips/{trip.pk}/weather/'
+
+    def evict_fragments_once_read(self, method):
+        read = getattr(cache, method)
+
+        def read_and_evict(key, *args, **kwargs):
+            value = read(key, *args, **kwargs)
+            if key.startswith('template.cache.'):
+                cache.delete(key)
+            return value
+        return mock.patch.object(cache, method, side_effect=read_and_evict)
+
+    def test_fragment_evicted_after_lookup_still_shows_forecast(self):
+        first = self.client.get(self.url)
+        self.assertContains(first, 'card-header bg-primary text-white', count=7)
+
+        # The fragment expires right after the view looks it up
+        with self.evict_fragments_once_read('get'), self.evict_fragments_once_read('has_key'):
+            second = self.client.get(self.url)
+        self.assertContains(second, 'card-header bg-primary text-white', count=7)
+
+        # and with it gone, the forecast is rendered again
+        self.assertContains(self.client.get(self.url), 'card-header bg-primary text-white', count=7)
+
+
+class TripListPaginationTests(TestCase):
+    """Paging through the trip list sees every trip once, even while trips change"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('traveler', 'traveler@example.com', 'password')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_trip(self, destination, travel_start):
+        return Trip.objects.create(
+            user=self.user, destination=destination,
+            travel_start=travel_start, travel_end=travel_start + timedelta(days=3)
+        )
+
+    def test_pages_are_stable_with_shared_start_dates_and_edits(self):
+        start = date.today() + timedelta(days=30)
+        trips = [self.create_trip(f'City {i}', start) for i in range(7)]
+
+        page = self.client.get('/api/trips/', {'page_size': 3}).json()
+        seen = [trip['id'] for trip in page['results']]
+
+        # While the client pages: a trip it has not reached yet moves to an
+        # earlier date, and another trip starting the same day is added
+        Trip.objects.filter(pk=trips[5].pk).update(travel_start=start - timedelta(days=10))
+        added = self.create_trip('City 7', start)
+
+        while page['next']:
+            page = self.client.get(page['next']).json()
+            seen += [trip['id'] for trip in page['results']]
+        self.assertEqual(seen, [trip.pk for trip in trips] + [added.pk])
+
+
+class HotQueryIndexTests(TestCase):
+    """The hot trip, cultural insight and travel tip lookups keep using their indexes"""
+
+    def test_hot_queries_use_their_indexes(self):
+        if connection.vendor not in REGRESSIONS:
+            self.skipTest(f'Query plans of the {connection.vendor} backend are not checked')
+        for name, queryset, index in hot_queries():
+            with self.subTest(name):
+                plan = explain(queryset)
+                self.assertNotRegex(plan, REGRESSIONS[connection.vendor])
+                if index is not None:
+                    self.assertTrue(any(name in plan for name in index_names(index)), f'{index} not used:\n{plan}')
+
+
+class PackingItemListQueriesTests(TestCase):
+    """Listing packing items takes the same number of queries however many there are"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('packer', 'packer@example.com', 'password'))
+        self.activities = Activity.objects.bulk_create(
+            Activity(name=f'Activity {i}', description='Outdoors', packing_requirements=['water'],
+                     weather_considerations={'rain': ['jacket']})
+            for i in range(5)
+        )
+
+    def add_items(self, count):
+        for i in range(count):
+            item = PackingItem.objects.create(name=f'Item {i}', category='other', weather_conditions=['sunny'])
+            item.activity_requirements.set(self.activities[i % 5:i % 5 + 3])
+
+    def test_constant_query_count(self):
+        # The items and their prefetched activities; force_authenticate needs no query
+        for count in (1, 10, 50):
+            with self.subTest(items=count):
+                PackingItem.objects.all().delete()
+                self.add_items(count)
+                with self.assertNumQueries(2):
+                    response = self.client.get('/api/packing-items/')
+                self.assertEqual(len(response.json()), count)
+                self.assertTrue(all(item['activity_requirements'] for item in response.json()))
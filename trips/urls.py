@@ -1,10 +1,17 @@
 # trips/urls.py
 from django.urls import path, include
+from django.conf import settings
 from . import views
 from django.contrib import admin
 from . import api_views
+from . import async_views
 from django.contrib.auth import views as auth_views
 from .views import password_reset_request, password_reset_confirm
+
+def upstream_view(sync_view, async_view):
+    """Pick the async version of an upstream-bound view when ASYNC_UPSTREAM_VIEWS is on"""
+    return async_view if settings.ASYNC_UPSTREAM_VIEWS else sync_view
+
 urlpatterns = [
     path('', views.home, name='home'),
     path('key-features/', views.key_features, name='key_features'),
@@ -15,12 +22,14 @@ urlpatterns = [
     path('trips/<int:trip_id>/weather/', views.trip_weather_view, name='trip_weather'),
     # API endpoints
     path('api/trips/', api_views.TripListCreateView.as_view(), name='api_trip_list'),
+    path('api/trips/weather/', views.upcoming_trips_weather, name='upcoming_trips_weather'),
     path('api/trips/<int:pk>/', api_views.TripDetailView.as_view(), name='api_trip_detail'),
-    path('api/trips/<int:trip_id>/weather/', views.trip_weather_forecast, name='trip_weather_forecast'),
+    path('api/trips/<int:trip_id>/weather/', upstream_view(views.trip_weather_forecast, async_views.trip_weather_forecast), name='trip_weather_forecast'),
     path('api/trips/<int:trip_id>/recommendations/', api_views.trip_recommendations, name='trip_recommendations'),
     path('api/trips/<int:trip_id>/cultural-insights/', api_views.trip_cultural_insights, name='trip_cultural_insights'),
     path('api/trips/<int:trip_id>/travel-tips/', api_views.trip_travel_tips, name='trip_travel_tips'),
     path('api/trips/<int:trip_id>/packing-list/', api_views.trip_packing_list, name='trip_packing_list'),
+    path('api/trips/<int:trip_id>/bundle/', upstream_view(api_views.trip_bundle, async_views.trip_bundle), name='trip_bundle'),
     
     # Activities and packing items
     path('api/activities/', api_views.ActivityListCreateView.as_view(), name='api_activities'),
@@ -33,19 +42,22 @@ urlpatterns = [
     # User profile
     path('api/profile/', api_views.ProfileRetrieveUpdateView.as_view(), name='api_profile'),
     
+    # Upstream API metrics (staff only)
+    path('api/metrics/upstream/', api_views.upstream_metrics, name='upstream_metrics'),
+    
     # Authentication endpoints
     path('api/signup/', views.signup, name='api_signup'),
     path('admin/', admin.site.urls),
     ##path('', include('trips.urls')),
     # Weather API endpoints:
-    path('api/trips/<int:trip_id>/clothing-recommendations/', views.trip_clothing_recommendations, name='trip_clothing_recommendations'),
+    path('api/trips/<int:trip_id>/clothing-recommendations/', upstream_view(views.trip_clothing_recommendations, async_views.trip_clothing_recommendations), name='trip_clothing_recommendations'),
     # City search API endpoint:
-    path('api/cities/search/', views.search_cities, name='search_cities'),
+    path('api/cities/search/', upstream_view(views.search_cities, async_views.search_cities), name='search_cities'),
     
     # AI endpoints
-    path('api/trips/ai-recommendations/', api_views.ai_trip_recommendations, name='ai_trip_recommendations'),
-    path('api/trips/ai-packing-suggestions/', api_views.ai_packing_suggestions, name='ai_packing_suggestions'),
-    path('api/trips/ai-travel-tips/', api_views.ai_travel_tips, name='ai_travel_tips'),
+    path('api/trips/ai-recommendations/', upstream_view(api_views.ai_trip_recommendations, async_views.ai_trip_recommendations), name='ai_trip_recommendations'),
+    path('api/trips/ai-packing-suggestions/', upstream_view(api_views.ai_packing_suggestions, async_views.ai_packing_suggestions), name='ai_packing_suggestions'),
+    path('api/trips/ai-travel-tips/', upstream_view(api_views.ai_travel_tips, async_views.ai_travel_tips), name='ai_travel_tips'),
     path(
         "password-reset/",
         views.password_reset_request,
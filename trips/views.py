@@ -1,6 +1,9 @@
 # trips/views.py
 from django.shortcuts import render
 from django.http import HttpResponse
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.utils.safestring import mark_safe
 from rest_framework import generics
 from .models import Trip, KeyFeature, UserStory, Profile
 from .serializers import TripSerializer, KeyFeatureSerializer, UserStorySerializer
@@ -14,7 +17,9 @@ from rest_framework.response import Response
 from rest_framework import status
 from .services.weather_service import WeatherService
 from .services.geocoding_service import GeocodingService
-from datetime import datetime
+from .services.forecast import TEMPERATURE_SYMBOLS
+from .conditional import conditional, make_etag
+from datetime import date, datetime, timezone as dt_timezone
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
@@ -104,7 +109,7 @@ def user_stories(request):
 
 def trip_dashboard(request):
     from .models import Trip
-    trips = Trip.objects.filler(user = request.user)
+    trips = Trip.objects.filter(user=request.user).order_by('travel_start', 'travel_end')
     return render(request, 'trips/trip_dashboard.html', {'trips': trips})
 
 
@@ -159,8 +164,44 @@ def signup(request):
     else:
         return JsonResponse({'error': 'Only POST method is allowed.'}, status=405)
 
+def forecast_days_for_trip(trip):
+    """Number of days to forecast: at least 7, but cover the entire trip if longer"""
+    trip_days = (trip.travel_end - trip.travel_start).days + 1
+    return max(7, trip_days)
+
+def parse_temperature_unit(request, default="fahrenheit"):
+    """Temperature unit requested with ?unit=celsius or ?unit=fahrenheit"""
+    unit = request.GET.get('unit', default).lower()
+    if unit not in TEMPERATURE_SYMBOLS:
+        unit = default  # Reset to default if not a known unit
+    return unit
+
+def trip_forecast_json(weather_data, trip):
+    """Forecast response for a trip, flagging which forecast days fall within it"""
+    data = weather_data.to_json()
+    data['trip_days'] = weather_data.between(trip.travel_start, trip.travel_end).tolist()
+    data['trip_start_date'] = trip.travel_start.strftime("%Y-%m-%d")
+    data['trip_end_date'] = trip.travel_end.strftime("%Y-%m-%d")
+    return data
+
+def trip_weather_versions(request, trip_id):
+    """ETag and Last-Modified of a trip's forecast, from the trip's version and the forecast's fetch time"""
+    trip = Trip.objects.filter(pk=trip_id, user=request.user).only(
+        'updated_at', 'latitude', 'longitude', 'travel_start', 'travel_end'
+    ).first()
+    if trip is None:
+        return None
+    fetched_at = WeatherService.forecast_fetched_at(
+        trip.latitude, trip.longitude, forecast_days_for_trip(trip), trip.travel_start
+    )
+    if fetched_at is None:
+        return None
+    etag = make_etag('weather', trip.pk, trip.updated_at.timestamp(), fetched_at, parse_temperature_unit(request))
+    return etag, max(trip.updated_at, datetime.fromtimestamp(fetched_at, dt_timezone.utc))
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional(trip_weather_versions)
 def trip_weather_forecast(request, trip_id):
     """Get weather forecast for a specific trip"""
     try:
@@ -173,20 +214,12 @@ def trip_weather_forecast(request, trip_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Calculate number of days to forecast (from travel start to end)
-        travel_start = trip.travel_start
-        travel_end = trip.travel_end
-        trip_days = (travel_end - travel_start).days + 1
-        
-        # Ensure we get at least 7 days, but cover the entire trip if longer
-        forecast_days = max(7, trip_days)
-            
-        # Get weather data from Open-Meteo (in Fahrenheit)
+        # Get weather data from Open-Meteo
         weather_data = WeatherService.get_weather_forecast(
             latitude=trip.latitude,
             longitude=trip.longitude,
-            days=forecast_days,
-            temperature_unit="fahrenheit"
+            days=forecast_days_for_trip(trip),
+            start_date=trip.travel_start
         )
         
         if not weather_data:
@@ -195,22 +228,10 @@ def trip_weather_forecast(request, trip_id):
                 status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
             
-        # Highlight which days are part of the trip
-        if 'daily' in weather_data:
-            # Add a flag for whether each date is during the trip
-            is_trip_day = []
-            for date_str in weather_data['daily']['time']:
-                date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                is_during_trip = travel_start <= date <= travel_end
-                is_trip_day.append(is_during_trip)
-            
-            # Add to the response
-            weather_data['trip_days'] = is_trip_day
-            weather_data['trip_start_date'] = travel_start.strftime("%Y-%m-%d")
-            weather_data['trip_end_date'] = travel_end.strftime("%Y-%m-%d")
-            
-        # Return the weather data
-        return Response(weather_data)
+        # Return the weather data in the requested unit (Fahrenheit by default),
+        # highlighting which days are part of the trip
+        weather_data = weather_data.in_unit(parse_temperature_unit(request))
+        return Response(trip_forecast_json(weather_data, trip))
     
     except Trip.DoesNotExist:
         return Response(
@@ -218,6 +239,37 @@ def trip_weather_forecast(request, trip_id):
             status=status.HTTP_404_NOT_FOUND
         )
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def upcoming_trips_weather(request):
+    """Get weather forecasts for all of the user's upcoming trips in one batch"""
+    days = request.GET.get('days', 7)
+    try:
+        days = min(max(int(days), 1), 16)
+    except ValueError:
+        days = 7
+        
+    trips = list(
+        Trip.objects.filter(
+            user=request.user,
+            travel_end__gte=date.today(),
+            latitude__isnull=False,
+            longitude__isnull=False
+        ).only('id', 'latitude', 'longitude')
+    )
+    
+    # Trips sharing a grid cell share a forecast, and the rest are fetched in batches
+    forecasts = WeatherService.get_weather_forecasts(
+        [(trip.latitude, trip.longitude) for trip in trips],
+        days=days
+    )
+    
+    unit = parse_temperature_unit(request)
+    return Response({
+        str(trip.id): forecast.in_unit(unit).to_json() if forecast else None
+        for trip, forecast in zip(trips, forecasts)
+    })
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def trip_clothing_recommendations(request, trip_id):
@@ -243,7 +295,8 @@ def trip_clothing_recommendations(request, trip_id):
         # Get weather data
         weather_data = WeatherService.get_weather_forecast(
             latitude=trip.latitude,
-            longitude=trip.longitude
+            longitude=trip.longitude,
+            start_date=trip.travel_start
         )
         
         if not weather_data:
@@ -258,9 +311,8 @@ def trip_clothing_recommendations(request, trip_id):
             is_business=is_business
         )
         
-        # Update trip with recommendations
-        trip.recommendations = recommendations
-        trip.save()
+        # Update the trip's stored clothing recommendations if they changed
+        trip.save_recommendations({**trip.recommendations_data(), 'clothing': recommendations})
         
         return Response({
             "traveler_type": "business" if is_business else "casual",
@@ -273,6 +325,13 @@ def trip_clothing_recommendations(request, trip_id):
             status=status.HTTP_404_NOT_FOUND
         )
 
+TRIP_WEATHER_FRAGMENT = 'trip_weather_forecast'  # {% cache %} fragment of trips/trip_weather.html
+
+def trip_weather_fragment_version(trip, fetched_at, is_business, unit):
+    """What the rendered forecast of trip_weather_view depends on; part of its fragment cache key"""
+    traveler_type = 'business' if is_business else 'casual'
+    return f"{trip.updated_at.timestamp()}:{fetched_at}:{traveler_type}:{unit}"
+
 def trip_weather_view(request, trip_id):
     """
     View to render the weather forecast template for a trip
@@ -287,20 +346,38 @@ def trip_weather_view(request, trip_id):
                 'error': 'No location coordinates available for this destination.'
             })
         
-        # Calculate number of days to forecast (from travel start to end)
-        travel_start = trip.travel_start
-        travel_end = trip.travel_end
-        trip_days = (travel_end - travel_start).days + 1
+        # Get user's traveler type for recommendations
+        try:
+            profile = request.user.profile
+            is_business = profile.traveler_type == 'business'
+        except Profile.DoesNotExist:
+            is_business = False
+        unit = parse_temperature_unit(request)
+        days = forecast_days_for_trip(trip)
+        context = {
+            'trip': trip,
+            'temperature_unit': TEMPERATURE_SYMBOLS[unit],
+            'fragment_timeout': WeatherService.cache.ttl,
+        }
+        
+        # A fresh forecast that was already rendered for this version of the
+        # trip is served from the fragment cache without being loaded. The
+        # fragment is read once and passed in, since it may expire before
+        # {% cache %} would read it again
+        fetched_at = WeatherService.forecast_fetched_at(trip.latitude, trip.longitude, days, trip.travel_start)
+        if fetched_at is not None:
+            context['forecast_version'] = trip_weather_fragment_version(trip, fetched_at, is_business, unit)
+            fragment = cache.get(make_template_fragment_key(TRIP_WEATHER_FRAGMENT, [trip.pk, context['forecast_version']]))
+            if fragment is not None:
+                # Markup rendered by the template itself
+                return render(request, 'trips/trip_weather.html', {**context, 'cached_forecast': mark_safe(fragment)})
         
-        # Ensure we get at least 7 days, but cover the entire trip if longer
-        forecast_days = max(7, trip_days)
-            
         # Get weather data
         weather_data = WeatherService.get_weather_forecast(
             latitude=trip.latitude,
             longitude=trip.longitude,
-            days=forecast_days,
-            temperature_unit="fahrenheit"
+            days=days,
+            start_date=trip.travel_start
         )
         
         if not weather_data:
@@ -309,13 +386,6 @@ def trip_weather_view(request, trip_id):
                 'error': 'Unable to fetch weather data at this time.'
             })
             
-        # Get user's traveler type for recommendations
-        try:
-            profile = request.user.profile
-            is_business = profile.traveler_type == 'business'
-        except Profile.DoesNotExist:
-            is_business = False
-            
         # Generate clothing recommendations
         recommendations = WeatherService.get_clothing_recommendations(
             weather_data=weather_data,
@@ -323,9 +393,10 @@ def trip_weather_view(request, trip_id):
         )
         
         # Extract and format the data for the template
+        weather_data = weather_data.in_unit(unit)
         current = {}
-        if 'current_weather' in weather_data:
-            current_data = weather_data['current_weather']
+        if weather_data.current_weather:
+            current_data = weather_data.current_weather
             current = {
                 'temperature': current_data.get('temperature'),
                 'windspeed': current_data.get('windspeed'),
@@ -334,37 +405,50 @@ def trip_weather_view(request, trip_id):
             
         # Format daily forecast
         forecast = []
-        if 'daily' in weather_data:
-            daily = weather_data['daily']
-            for i, date in enumerate(daily['time']):
-                date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-                is_during_trip = trip.travel_start <= date_obj <= trip.travel_end
-                
-                day_data = {
-                    'date': date,
-                    'temp_max': daily['temperature_2m_max'][i],
-                    'temp_min': daily['temperature_2m_min'][i],
-                    'precipitation': daily['precipitation_probability_max'][i],
-                    'recommendations': recommendations.get(date, []),
-                    'is_trip_day': is_during_trip
-                }
-                forecast.append(day_data)
-                
+        daily = weather_data.to_json()['daily']
+        is_trip_day = weather_data.between(trip.travel_start, trip.travel_end).tolist()
+        for i, date in enumerate(daily['time']):
+            day_data = {
+                'date': date,
+                'temp_max': daily['temperature_2m_max'][i],
+                'temp_min': daily['temperature_2m_min'][i],
+                'precipitation': daily['precipitation_probability_max'][i],
+                'recommendations': recommendations.get(date, []),
+                'is_trip_day': is_trip_day[i]
+            }
+            forecast.append(day_data)
+            
+        fetched_at = WeatherService.forecast_fetched_at(trip.latitude, trip.longitude, days, trip.travel_start)
         return render(request, 'trips/trip_weather.html', {
-            'trip': trip,
+            **context,
             'current': current,
             'forecast': forecast,
-            'temperature_unit': 'F'  # Indicate Fahrenheit
+            'forecast_version': trip_weather_fragment_version(trip, fetched_at, is_business, unit) if fetched_at else None,
+            'fragment_timeout': WeatherService.cache.ttl if fetched_at else 0,  # 0: not cacheable
+            'stale': weather_data.meta.get('stale', False),  # Served from cache while it is refreshed
+            'forecast_age_minutes': weather_data.meta.get('age', 0) // 60
         })
         
     except Trip.DoesNotExist:
         return HttpResponse("Trip not found or unauthorized.", status=404)
 
+def parse_search_limit(request):
+    """Number of search results to return (default: 10)"""
+    limit = request.GET.get('limit', 10)
+    try:
+        limit = int(limit)
+        if limit < 1 or limit > 50:
+            limit = 10  # Reset to default if outside range
+    except ValueError:
+        limit = 10
+    return limit
+
 @api_view(['GET'])
 @permission_classes([AllowAny])  # Allow any user to search cities
 def search_cities(request):
     """
-    Search for cities using the Open-Meteo geocoding API
+    Search for cities using the local gazetteer index, falling back to the
+    Open-Meteo geocoding API
     """
     query = request.GET.get('q', '')
     if not query or len(query) < 2:
@@ -373,17 +457,8 @@ def search_cities(request):
             status=status.HTTP_400_BAD_REQUEST
         )
         
-    # Get the number of results to return (default: 10)
-    limit = request.GET.get('limit', 10)
-    try:
-        limit = int(limit)
-        if limit < 1 or limit > 50:
-            limit = 10  # Reset to default if outside range
-    except ValueError:
-        limit = 10
-    
     # Search for cities
-    cities = GeocodingService.search_cities(query, limit)
+    cities = GeocodingService.search_cities(query, parse_search_limit(request))
     
     return Response({
         "query": query,